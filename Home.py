@@ -1,4 +1,4 @@
-import streamlit as st, base64, pathlib
+import streamlit as st
 
 
 st.title("Minimum Wage and Wage Growth Trends in Europe")
@@ -0,0 +1 @@
+"""Offline benchmarks for the loaders, transforms and map build."""
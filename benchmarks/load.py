@@ -0,0 +1,491 @@
+# benchmarks/load.py
+# ───────────────────────────────────────────────────────────────
+# Multi-user load test: many concurrent sessions against a running
+# Streamlit server, each clicking through one page.
+#
+#   python -m benchmarks.load                          # spawns a server
+#   python -m benchmarks.load --sessions 50 --ramp 20 --steps 20
+#   python -m benchmarks.load --url ws://host:8501 --pid 1234 --pages page3 page4
+#   python -m benchmarks.load --pages page4 --max-kb 20   # payload budget
+#
+# Each session speaks the browser's websocket protocol (BackMsg /
+# ForwardMsg): it opens Home, navigates to its page (round-robin over
+# --pages), then takes --steps scripted actions with a random think
+# time of mean --think seconds between them.  An action sets one of the
+# page's widgets (SCENARIOS: slider drags, country multiselects,
+# palette / colour-scheme changes, map year …) to a random value drawn
+# from the options the server sent, exactly as the frontend would
+# report it, and waits for the rerun to finish.
+#
+# Reported:
+#   latency   p50 / p95 / p99 / max from sending the rerun to the
+#             server's "script finished", per page and action
+#   payload   ForwardMsg bytes per rerun; with --max-kb, actions whose
+#             mean payload exceeds the budget are listed and the exit
+#             status is 1
+#   cpu       server CPU seconds during the run, per rerun and session
+#   memory    server RSS before / at peak / after, RSS growth per
+#             session, and Streamlit's own session-state and cache
+#             accounting (/_stcore/metrics) at peak
+# CPU and RSS come from /proc (psutil if installed) and need the server
+# pid: known when spawned, --pid otherwise.  Results go to --out as JSON.
+#
+# Needs the `websockets` client on top of the app's requirements:
+#   pip install -r benchmarks/requirements.txt
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+
+from benchmarks.run import _meta
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# page → labels of the widgets its sessions play with (Home: open only)
+SCENARIOS = {
+    "home": (),
+    "page1": ("Path to Excel file",),
+    "page2": ("Choose colour scale", "Sort countries by …", "Show top N countries (after sorting)",
+              "Countries", "Colour palette"),
+    "page3": ("Highlight a country (optional)", "Window (years)",
+              "GDP growth leads wages by (years)", "Sub-regions", "Sub-region(s)",
+              "Country selection", "Show data table"),
+    "page4": ("Border detail", "Map view", "Year", "Avg. annual wage-growth range (%)"),
+}
+PAGES = tuple(SCENARIOS)             # in the app's navigation order
+WIDGETS = {"slider", "select_slider", "multiselect", "selectbox", "radio", "text_input"}
+MAX_PICKS = 6                        # multiselect: at most this many options
+
+
+class Run(NamedTuple):
+    """One script run as seen by a session."""
+    session: int
+    page: str
+    action: str
+    seconds: float
+    bytes: int
+    status: str       # ok / error (exception shown) / early (superseded)
+
+
+# -------------------------------------------------------
+# Websocket session
+# -------------------------------------------------------
+def _walk(node):
+    yield node
+    for child in getattr(node, "children", {}).values():
+        yield from _walk(child)
+
+
+def _find(tree, label: str):
+    """The widget or stateful expander labelled *label* (first match)."""
+    for node in _walk(tree):
+        if getattr(node, "label", None) != label:
+            continue
+        if getattr(node, "type", None) in WIDGETS:
+            return node
+        if getattr(node, "type", None) == "expander" and node.proto.id:
+            return node
+    return None
+
+
+def _random_state(node, rng: random.Random):
+    """WidgetState holding a random value for *node*, in the wire format
+    the frontend uses for that widget type."""
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    ws = WidgetState()
+    proto, kind = node.proto, node.type
+    if kind == "expander":
+        ws.id = proto.id
+        ws.bool_value = rng.random() < 0.5
+        return ws
+    ws.id = node.id
+    if kind in ("selectbox", "radio"):
+        ws.string_value = rng.choice(list(proto.options))
+    elif kind == "text_input":
+        ws.string_value = proto.default if proto.HasField("default") else ""
+    elif kind == "multiselect":
+        options = list(proto.options)
+        most = min(len(options), proto.max_selections or MAX_PICKS, MAX_PICKS)
+        ws.string_array_value.data[:] = rng.sample(options, rng.randint(1, most)) if most else []
+    elif kind == "select_slider":
+        options = list(proto.options)
+        picks = sorted(rng.sample(range(len(options)), len(proto.default)))
+        ws.string_array_value.data[:] = [options[i] for i in picks]
+    else:                                            # numeric slider
+        steps = int(round((proto.max - proto.min) / proto.step))
+        values = sorted(proto.min + rng.randint(0, steps) * proto.step
+                        for _ in range(len(proto.default)))
+        ws.double_array_value.data[:] = [round(v, 10) for v in values]
+    return ws
+
+
+class Session:
+    def __init__(self, url: str, sid: int, page: str, rng: random.Random):
+        self.url, self.sid, self.page, self.rng = url, sid, page, rng
+        self.pages: dict = {}          # page key → page_script_hash
+        self.states: dict = {}         # widget id → WidgetState we last sent
+        self.page_hash = ""            # page shown ("" = Home)
+        self.tree = None
+        self.runs: list = []
+
+    async def rerun(self, action: str) -> None:
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ClientState_pb2 import ClientState
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.testing.v1.element_tree import parse_tree_from_messages
+
+        msg = BackMsg()
+        msg.rerun_script.CopyFrom(ClientState(page_script_hash=self.page_hash))
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        t0 = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        received, size = [], 0
+        while True:
+            raw = await self.ws.recv()
+            size += len(raw)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            received.append(fwd)
+            kind = fwd.WhichOneof("type")
+            if kind == "navigation" and not self.pages:
+                self.pages = dict(zip(PAGES, (p.page_script_hash for p in fwd.navigation.app_pages)))
+            if kind == "script_finished":
+                break
+        seconds = time.perf_counter() - t0
+
+        early = fwd.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN
+        self.tree = parse_tree_from_messages(received)
+        nodes = list(_walk(self.tree))
+        failed = any(getattr(n, "type", None) == "exception" for n in nodes)
+        status = "early" if early else "error" if failed else "ok"
+        self.runs.append(Run(self.sid, self.page, action, seconds, size, status))
+        # widgets that left the page (or changed identity) are not reported
+        live = {getattr(n, "id", None) for n in nodes} | {
+            n.proto.id for n in nodes if getattr(n, "type", None) == "expander"}
+        self.states = {k: v for k, v in self.states.items() if k in live}
+
+    async def play(self, steps: int, think: float) -> None:
+        import websockets       # checked in main()
+
+        async with websockets.connect(f"{self.url}/_stcore/stream", subprotocols=["streamlit"],
+                                      max_size=None, open_timeout=60,
+                                      ping_interval=None) as self.ws:
+            await self.rerun("open" if self.page == "home" else "open via Home")
+            if self.page != "home":
+                self.page_hash = self.pages[self.page]
+                await self.rerun("open")
+            labels = SCENARIOS[self.page]
+            for _ in range(steps if labels else 0):
+                await asyncio.sleep(self.rng.expovariate(1 / think) if think else 0)
+                label = self.rng.choice(labels)
+                node = _find(self.tree, label)
+                if node is None:                    # not shown in this state (e.g. "Year")
+                    continue
+                state = _random_state(node, self.rng)
+                self.states[state.id] = state
+                await self.rerun(label)
+
+
+async def _session(url, sid, page, steps, think, delay, seed, errors):
+    await asyncio.sleep(delay)
+    session = Session(url, sid, page, random.Random(seed * 100_003 + sid))
+    try:
+        await session.play(steps, think)
+    except Exception as e:                          # a dropped socket ends one session only
+        errors.append(f"session {sid} ({page}): {type(e).__name__}: {e}")
+    return session.runs
+
+
+# -------------------------------------------------------
+# Server process: CPU, RSS and Streamlit's memory metrics
+# -------------------------------------------------------
+class Process:
+    """CPU seconds and RSS bytes of process *pid* (None if unknown)."""
+
+    def __init__(self, pid: int | None):
+        self.pid = pid
+        try:
+            import psutil
+            self._ps = psutil.Process(pid) if pid else None
+        except ImportError:
+            self._ps = None
+        self.available = bool(pid) and (self._ps is not None or Path(f"/proc/{pid}").exists())
+
+    def cpu(self) -> float | None:
+        if not self.available:
+            return None
+        if self._ps is not None:
+            t = self._ps.cpu_times()
+            return t.user + t.system
+        fields = Path(f"/proc/{self.pid}/stat").read_text().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    def rss(self) -> int | None:
+        if not self.available:
+            return None
+        if self._ps is not None:
+            return self._ps.memory_info().rss
+        status = Path(f"/proc/{self.pid}/status").read_text()
+        return int(re.search(r"VmRSS:\s+(\d+) kB", status).group(1)) * 1024
+
+
+def streamlit_memory(http: str) -> dict:
+    """Bytes per cache type from /_stcore/metrics, plus session count."""
+    try:
+        text = urllib.request.urlopen(f"{http}/_stcore/metrics", timeout=30).read().decode()
+    except OSError:
+        return {}
+    out: dict = {}
+    for m in re.finditer(r'cache_memory_bytes\{cache_type="([^"]*)",cache="[^"]*"\} (\d+)', text):
+        out[m.group(1)] = out.get(m.group(1), 0) + int(m.group(2))
+    active = re.search(r"^active_sessions (\d+)", text, re.M)
+    if active:
+        out["active_sessions"] = int(active.group(1))
+    return out
+
+
+async def _sample(proc: Process, peak: dict, stop: asyncio.Event, every: float = 0.25):
+    while not stop.is_set():
+        rss = proc.rss()
+        if rss is not None and rss > peak.get("rss", 0):
+            peak["rss"] = rss
+        try:
+            await asyncio.wait_for(stop.wait(), every)
+        except asyncio.TimeoutError:
+            pass
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn(port: int, warm: bool = False) -> subprocess.Popen:
+    # warm: through core.warmup, which serves only once every cache is loaded
+    launcher = ["core.warmup", "--serve"] if warm else ["streamlit", "run", "Home.py"]
+    return subprocess.Popen(
+        [sys.executable, "-m", *launcher, "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false",
+         "--server.fileWatcherType", "none",
+         # byte sizes, not entry counts, in /_stcore/metrics
+         "--server.enableExpensiveMemoryStats", "true"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_healthy(http: str, timeout: float = 120) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if urllib.request.urlopen(f"{http}/_stcore/health", timeout=5).status == 200:
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"server at {http} did not come up in {timeout:.0f}s")
+        time.sleep(0.5)
+
+
+# -------------------------------------------------------
+# Driver and report
+# -------------------------------------------------------
+async def load(args, url: str, http: str, proc: Process) -> dict:
+    errors: list = []
+    if args.warmup:        # one visit per page, so cold caches are not counted
+        for page in args.pages:
+            await _session(url, -1, page, 0, 0, 0, args.seed, errors)
+
+    rss_before, cpu_before = proc.rss(), proc.cpu()
+    peak: dict = {"rss": rss_before or 0}
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample(proc, peak, stop))
+    t0 = time.perf_counter()
+    client0 = time.process_time()
+    sessions = [
+        _session(url, i, args.pages[i % len(args.pages)], args.steps, args.think,
+                 args.ramp * i / max(args.sessions, 1), args.seed, errors)
+        for i in range(args.sessions)
+    ]
+    # Streamlit's accounting is read while every session is still open
+    held = asyncio.Event()
+    metrics: dict = {}
+
+    async def snapshot():
+        await asyncio.sleep(args.ramp)
+        metrics.update(await asyncio.to_thread(streamlit_memory, http))
+        held.set()
+
+    snap = asyncio.create_task(snapshot())
+    runs = [r for rs in await asyncio.gather(*sessions) for r in rs]
+    elapsed = time.perf_counter() - t0
+    client_cpu = time.process_time() - client0
+    cpu_after = proc.cpu()
+    if not held.is_set():
+        snap.cancel()
+    stop.set()
+    await sampler
+    await asyncio.sleep(args.settle)
+    rss_after = proc.rss()
+
+    return {
+        "runs": [r._asdict() for r in runs], "errors": errors, "elapsed": elapsed,
+        "client_cpu": client_cpu, "streamlit_memory": metrics,
+        "server": {
+            "cpu_s": None if cpu_before is None else cpu_after - cpu_before,
+            "rss_before": rss_before, "rss_peak": peak["rss"] or None, "rss_after": rss_after,
+        },
+    }
+
+
+def _ms(s: pd.Series) -> dict:
+    q = s.quantile([0.5, 0.95, 0.99]) * 1e3
+    return {"n": int(len(s)), "p50_ms": q[0.5], "p95_ms": q[0.95], "p99_ms": q[0.99],
+            "max_ms": s.max() * 1e3}
+
+
+def summarise(result: dict, sessions: int) -> dict:
+    runs = pd.DataFrame(result["runs"], columns=Run._fields)
+    done = runs[runs["status"] != "early"]
+    latency = [
+        {"page": page, "action": action, **_ms(g["seconds"]), "kb": g["bytes"].mean() / 1024}
+        for (page, action), g in done.groupby(["page", "action"], sort=False)
+    ]
+    server = result["server"]
+    mib = 1 << 20
+    per_session = {
+        "reruns": len(runs) / max(sessions, 1),
+        "cpu_ms": None if server["cpu_s"] is None else server["cpu_s"] * 1e3 / max(sessions, 1),
+        "rss_mib": (None if server["rss_before"] is None
+                    else (server["rss_peak"] - server["rss_before"]) / mib / max(sessions, 1)),
+        "session_state_kib": result["streamlit_memory"].get("st_session_state", 0) / 1024
+                             / max(result["streamlit_memory"].get("active_sessions", 0), 1),
+    }
+    return {
+        "overall": _ms(done["seconds"]) if len(done) else {},
+        "latency": latency,
+        "reruns_per_s": len(runs) / result["elapsed"] if result["elapsed"] else 0.0,
+        "cpu_ms_per_rerun": (None if server["cpu_s"] is None or not len(runs)
+                             else server["cpu_s"] * 1e3 / len(runs)),
+        "per_session": per_session,
+        "status": runs["status"].value_counts().to_dict(),
+    }
+
+
+def over_budget(summary: dict, max_kb: float | None) -> list:
+    """(page, action, KB) of every action whose mean payload exceeds *max_kb*."""
+    if max_kb is None:
+        return []
+    return [(r["page"], r["action"], r["kb"]) for r in summary["latency"] if r["kb"] > max_kb]
+
+
+def _fmt(v, spec=".0f") -> str:
+    return "n/a" if v is None else format(v, spec)
+
+
+def report(summary: dict, result: dict, args) -> None:
+    print(f"\n{'page':<7} {'action':<38} {'n':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'KB':>8}")
+    rows = summary["latency"] + [{"page": "all", "action": "", **summary["overall"], "kb": None}]
+    for r in rows:
+        if not r.get("n"):
+            continue
+        print(f"{r['page']:<7} {r['action'][:38]:<38} {r['n']:>5} {r['p50_ms']:>6.0f}ms "
+              f"{r['p95_ms']:>6.0f}ms {r['p99_ms']:>6.0f}ms {r['max_ms']:>6.0f}ms "
+              f"{_fmt(r['kb'], '.0f'):>8}")
+
+    server, per = result["server"], summary["per_session"]
+    mib = 1 << 20
+    print(f"\n{args.sessions} sessions, {sum(summary['status'].values())} runs in "
+          f"{result['elapsed']:.1f}s ({summary['reruns_per_s']:.1f}/s); status {summary['status']}")
+    print(f"server cpu   {_fmt(server['cpu_s'], '.1f')}s total, "
+          f"{_fmt(summary['cpu_ms_per_rerun'])} ms/rerun, {_fmt(per['cpu_ms'])} ms/session")
+    if server["rss_before"] is not None:
+        print(f"server rss   {server['rss_before'] / mib:.0f} MiB before, "
+              f"{server['rss_peak'] / mib:.0f} peak, {server['rss_after'] / mib:.0f} after; "
+              f"+{per['rss_mib']:.2f} MiB/session at peak")
+    else:
+        print("server rss   n/a (pass --pid of the server process)")
+    mem = result["streamlit_memory"]
+    if mem:
+        caches = ", ".join(f"{k} {v / 1024:.0f} KiB" for k, v in sorted(mem.items())
+                           if k != "active_sessions")
+        print(f"streamlit    {mem.get('active_sessions', '?')} sessions open; "
+              f"{per['session_state_kib']:.1f} KiB session state/session; {caches}")
+    if result["client_cpu"] > 0.8 * result["elapsed"]:
+        print("warning: the load generator was CPU-bound; latencies include client time "
+              "(fewer sessions, or more --think)")
+    for page, action, kb in summary["over_budget"]:
+        print(f"payload      {page} {action!r}: {kb:.0f} KB per rerun > --max-kb {args.max_kb:g}")
+    for e in result["errors"][:10]:
+        print("error:", e)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Concurrent-session load test against a Streamlit server")
+    ap.add_argument("--url", help="ws://host:port of a running server (default: spawn one)")
+    ap.add_argument("--pid", type=int, help="server pid for CPU / RSS (spawned: known)")
+    ap.add_argument("--sessions", type=int, default=20)
+    ap.add_argument("--ramp", type=float, default=10.0, help="seconds over which sessions start")
+    ap.add_argument("--steps", type=int, default=10, help="widget actions per session")
+    ap.add_argument("--think", type=float, default=1.0, help="mean seconds between actions")
+    ap.add_argument("--pages", nargs="+", default=list(PAGES), choices=PAGES)
+    ap.add_argument("--no-warmup", dest="warmup", action="store_false",
+                    help="count the first (cold-cache) visit of each page too")
+    ap.add_argument("--warm-start", action="store_true",
+                    help="spawn the server through `python -m core.warmup --serve`")
+    ap.add_argument("--settle", type=float, default=2.0,
+                    help="seconds to wait after the last session before reading RSS")
+    ap.add_argument("--max-kb", type=float,
+                    help="fail if any action's mean payload per rerun exceeds this many KB")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", type=Path, default=Path("loadtest_results.json"))
+    args = ap.parse_args(argv)
+    if importlib.util.find_spec("websockets") is None:
+        ap.error("the load test needs the websockets package: "
+                 "pip install -r benchmarks/requirements.txt")
+
+    server = None
+    if args.url:
+        url = args.url.rstrip("/")
+        pid = args.pid
+    else:
+        port = _free_port()
+        server = spawn(port, args.warm_start)
+        url, pid = f"ws://127.0.0.1:{port}", server.pid
+    http = re.sub(r"^ws", "http", url)
+    try:
+        wait_healthy(http)
+        result = asyncio.run(load(args, url, http, Process(pid)))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    summary = summarise(result, args.sessions)
+    summary["over_budget"] = over_budget(summary, args.max_kb)
+    report(summary, result, args)
+    config = {k: v for k, v in vars(args).items() if k != "out"}
+    args.out.write_text(json.dumps({"meta": _meta(), "config": config, "summary": summary,
+                                    **result}, indent=2, default=str))
+    print(f"\nwrote {args.out}")
+    if summary["over_budget"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# benchmarks/run.py
+# ───────────────────────────────────────────────────────────────
+# Benchmark the data hot paths outside Streamlit.
+#
+#   python -m benchmarks.run                       # scales 1,10,100
+#   python -m benchmarks.run --scales 1 10 100 1000 --only transform
+#   python -m benchmarks.run --out new.json --compare old.json
+#
+# Per case and scale it reports
+#   wall      best / median of --repeat timed calls (no tracing)
+#   peak      tracemalloc peak of one extra traced call
+#   blocks    memory blocks allocated by that call and still live when
+#             it returns (tracemalloc) – a proxy for allocation churn
+# Results go to --out as JSON; --compare flags cases that got slower.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks import synthetic
+from core import cube, data, geo, maps, shared, store, transforms
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# folium nags about CartoDB API keys on every Map(); not our concern here.
+warnings.filterwarnings("ignore", category=UserWarning, module="folium")
+
+
+# -------------------------------------------------------
+# Cases: name -> build(ctx) returning a zero-argument callable
+# -------------------------------------------------------
+def _map_build(c):
+    growth = transforms.avg_annual_growth(c)
+    merged = geo.load_geometry().merge(
+        growth, left_on="iso_a3", right_on="iso3", how="left")
+    rates = merged[maps.GROWTH_FIELD]
+    colormap = maps.growth_colormap(rates.min(), rates.max())
+    m = maps.growth_map(maps.feature_collection(merged, ["name", maps.GROWTH_FIELD]), colormap)
+    maps.growth_styles(merged, colormap, (rates.min(), rates.max()))
+    return m.get_root().render()
+
+
+def _revision(c):
+    # a handful of revised values in two sources, as a typical refresh
+    codes = c.dims.index[:5]
+    cells = pd.DataFrame({"iso3": codes, "year": c.years[-3], "value": 1.0})
+    patches = {m: cube.Patch(cells, {}) for m in ("real_growth", "gdp")}
+    return lambda: c.patched(patches)
+
+
+def _attach(c):
+    # a worker mapping the cube another process published (core.shared)
+    key = shared.content_key(id(c))
+    shared.publish("cube", key, shared.cube_segment(c))
+    return lambda: shared.cube_from(shared.attach("cube", key))
+
+
+def _select_all(series):
+    # page 3's widest selection: every sub-region, every country
+    return lambda: series.select(series.countries(series.subregions))
+
+
+CASES = {
+    # loaders (raw parse and the Arrow cache that replaces it)
+    "load.xlsx_parse":     lambda c: lambda: data._parse_workbook(c["paths"]["xlsx"]),
+    "load.min_csv_parse":  lambda c: lambda: data._parse_min_wage(c["paths"]["min_csv"]),
+    "load.gdp_csv_parse":  lambda c: lambda: data._parse_gdp(c["paths"]["gdp_csv"]),
+    "load.arrow_cache":    lambda c: lambda: store.load("ilo", c["paths"]["xlsx"], data._parse_workbook),
+    # cube build and the per-page transforms on top of it
+    "cube.build":          lambda c: lambda: cube.build(c["t"]["real"], c["t"]["nominal"], c["t"]["min_to_avg"], c["t"]["gdp"]),
+    "cube.patch":          lambda c: _revision(c["cube"]),
+    "cube.attach":         lambda c: _attach(c["cube"]),
+    "transform.evolution_summary": lambda c: lambda: transforms.evolution_summary(c["cube"]),
+    "transform.gdp_vs_real_wage":  lambda c: lambda: transforms.gdp_vs_real_wage(c["cube"]),
+    "transform.real_wage_series":  lambda c: lambda: transforms.RealWageSeries(c["cube"]),
+    "query.real_wage_select":      lambda c: _select_all(transforms.RealWageSeries(c["cube"])),
+    "transform.gdp_wage_correlations": lambda c: lambda: transforms.gdp_wage_correlations(c["cube"]),
+    "transform.ratio_base":        lambda c: lambda: transforms.ratio_base(c["t"]["min_to_avg"]),
+    "transform.avg_annual_growth": lambda c: lambda: transforms.avg_annual_growth(c["cube"]),
+    # maps: geometry merge + GeoJSON + folium HTML; plotly animation JSON
+    "map.build":           lambda c: lambda: _map_build(c["cube"]),
+    "map.ratio_animation": lambda c: lambda: maps.ratio_animation(
+        transforms.ratio_by_code(transforms.ratio_base(c["t"]["min_to_avg"]).wide)).to_json(),
+}
+
+
+def measure(fn, repeat: int) -> dict:
+    fn()                                    # warm-up (imports, caches)
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = len(tracemalloc.take_snapshot().traces)
+    tracemalloc.stop()
+    del result
+    return {
+        "wall_min_s": min(times),
+        "wall_median_s": statistics.median(times),
+        "peak_mb": peak / 2**20,
+        "blocks": blocks,
+    }
+
+
+def _rows(t) -> int:
+    return sum(len(df) for df in t.values())
+
+
+def run(scales, repeat, only, extra_years) -> list:
+    results = []
+    with tempfile.TemporaryDirectory(prefix="wage-bench-") as tmp:
+        store.CACHE_DIR = Path(tmp) / "cache"
+        shared.SHARED_DIR = Path(tmp) / "shared"
+        for scale in scales:
+            t = synthetic.tables(scale, extra_years=extra_years)
+            ctx = {"t": t, "paths": synthetic.write_sources(t, Path(tmp) / f"x{scale}"),
+                   "cube": cube.build(t["real"], t["nominal"], t["min_to_avg"], t["gdp"])}
+            for name, build in CASES.items():
+                if only and not any(o in name for o in only):
+                    continue
+                stats = measure(build(ctx), repeat)
+                results.append({"case": name, "scale": scale, "rows": _rows(t), **stats})
+                print(f"{name:<30} x{scale:<5} {stats['wall_min_s'] * 1e3:>10.2f} ms"
+                      f" {stats['wall_median_s'] * 1e3:>10.2f} ms"
+                      f" {stats['peak_mb']:>9.2f} MB {stats['blocks']:>9d} blk", flush=True)
+    return results
+
+
+def compare(results: list, baseline_path: Path, threshold: float) -> int:
+    old = {(r["case"], r["scale"]): r for r in json.loads(baseline_path.read_text())["results"]}
+    slower = 0
+    print(f"\nvs {baseline_path} (flagging > {threshold:.2f}x)")
+    for r in results:
+        base = old.get((r["case"], r["scale"]))
+        if not base:
+            continue
+        ratio = r["wall_min_s"] / base["wall_min_s"]
+        flag = "  SLOWER" if ratio > threshold else ""
+        slower += bool(flag)
+        print(f"{r['case']:<30} x{r['scale']:<5} {ratio:>6.2f}x{flag}")
+    return slower
+
+
+def _meta() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {"python": platform.python_version(), "pandas": pd.__version__,
+            "platform": platform.platform(), "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark loaders, transforms and the map build")
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    ap.add_argument("--extra-years", type=int, default=0,
+                    help="prepend this many year columns to the synthetic tables")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--only", nargs="*", help="run cases whose name contains any of these")
+    ap.add_argument("--out", type=Path, default=Path("bench_results.json"))
+    ap.add_argument("--compare", type=Path, help="earlier --out file to compare against")
+    ap.add_argument("--threshold", type=float, default=1.25)
+    args = ap.parse_args(argv)
+
+    print(f"{'case':<30} {'scale':<6} {'best':>10}    {'median':>10}    {'peak':>9}    {'blocks':>9}")
+    results = run(args.scales, args.repeat, args.only, args.extra_years)
+    args.out.write_text(json.dumps({"meta": _meta(), "results": results}, indent=2))
+    print(f"\nwrote {args.out}")
+    if args.compare:
+        sys.exit(1 if compare(results, args.compare, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
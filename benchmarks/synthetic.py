@@ -0,0 +1,82 @@
+# benchmarks/synthetic.py
+# ───────────────────────────────────────────────────────────────
+# Scaled copies of the bundled sources.  Every country is cloned
+# `scale` times (clone 0 keeps its real name and codes, clone k gets
+# " #k" on both), and values get ±1 % noise so groupbys and sorts do
+# real work.
+# `extra_years` prepends that many earlier year columns.
+# Clones keep their Region / Subregion / Income group, so the same
+# filters and joins as on real data apply — just on more rows.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core import data
+from core.countries import ISO3
+
+GDP_PREAMBLE = (
+    '"Data Source","World Development Indicators",\n\n'
+    '"Last Updated Date","synthetic",\n\n'
+)
+
+
+def _scale(df: pd.DataFrame, name_cols: list, scale: int,
+           extra_years: int, rng: np.random.Generator) -> pd.DataFrame:
+    years = [c for c in df.columns if str(c).isdigit()]
+    as_int = isinstance(years[0], int)
+    first = int(years[0])
+    new_years = [first - k for k in range(extra_years, 0, -1)]
+    if not as_int:
+        new_years = [str(y) for y in new_years]
+
+    clones = []
+    for k in range(scale):
+        c = df.copy()
+        if k:
+            for col in name_cols:
+                c[col] = c[col] + f" #{k}"
+        noise = rng.normal(1.0, 0.01, size=(len(c), len(years)))
+        c[years] = c[years].to_numpy() * noise
+        clones.append(c)
+    out = pd.concat(clones, ignore_index=True)
+    if new_years:
+        filler = out[years[:1] * len(new_years)].to_numpy()
+        out = pd.concat([out.drop(columns=years),
+                         pd.DataFrame(filler, columns=new_years, index=out.index),
+                         out[years]], axis=1)
+    return out
+
+
+def tables(scale: int = 1, extra_years: int = 0, seed: int = 0) -> dict:
+    """Scaled in-memory versions of every source table."""
+    rng = np.random.default_rng(seed)
+    wb = data.load_workbook()
+    return {
+        "real": _scale(wb.real, [ISO3, "country_name", "ISO"], scale, extra_years, rng),
+        "nominal": _scale(wb.nominal, [ISO3, "countryname", "ccode"], scale, 0, rng),
+        "min_to_avg": _scale(data.min_to_avg_ratio(), [ISO3, "country"], scale, extra_years, rng),
+        "gdp": _scale(data.gdp(), [ISO3, "Country Name", "Country Code"], scale, extra_years, rng),
+    }
+
+
+def write_sources(t: dict, directory: Path) -> dict:
+    """Write *t* in the raw source formats; returns the three paths."""
+    directory.mkdir(parents=True, exist_ok=True)
+    t = {name: df.drop(columns=ISO3) for name, df in t.items()}   # added at load time
+    paths = {
+        "xlsx": directory / "wages.xlsx",
+        "min_csv": directory / "min_to_avg.csv",
+        "gdp_csv": directory / "gdp.csv",
+    }
+    with pd.ExcelWriter(paths["xlsx"], engine="openpyxl") as xw:
+        t["real"].to_excel(xw, sheet_name="Real wage growth", index=False)
+        t["nominal"].to_excel(xw, sheet_name="Nominal wage", index=False)
+    t["min_to_avg"].to_csv(paths["min_csv"], index=False)
+    with open(paths["gdp_csv"], "w", encoding="utf-8", newline="") as fh:
+        fh.write(GDP_PREAMBLE)
+        t["gdp"].to_csv(fh, index=False)
+    return paths
@@ -0,0 +1,212 @@
+# core/charts.py
+# ───────────────────────────────────────────────────────────────
+# Chart builders shared by the pages and scripts/export_charts.py.
+#
+# Each function draws one chart from already-prepared data and returns
+# the figure (matplotlib or plotly); no Streamlit calls.  The pages
+# wrap the matplotlib ones in core.figures.cached_figure, the exporter
+# renders them straight to PNG / SVG / HTML.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import matplotlib.colors as mcolors
+import matplotlib.pyplot as plt
+
+from core import correlation
+
+
+# -------------------------------------------------------
+# Page 1 – evolution of minimum wages
+# -------------------------------------------------------
+def nominal_growth(nom_sub_avg, nom_years):
+    fig1, ax1 = plt.subplots(figsize=(8, 6))
+    for sub in nom_sub_avg.index:
+        ax1.plot(nom_years[1:], nom_sub_avg.loc[sub], label=sub)
+    ax1.set_title("Average nominal minimum-wage growth (2018-2023)")
+    ax1.set_xlabel("Year"); ax1.set_ylabel("Growth rate (%)")
+    ax1.legend()
+    return fig1
+
+
+def real_growth(real_sub_avg, real_years):
+    fig2, ax2 = plt.subplots(figsize=(8, 6))
+    for sub in real_sub_avg.index.sort_values():
+        ax2.plot(real_years, real_sub_avg.loc[sub], label=sub)
+    ax2.set_title("Average real minimum-wage growth (2017-2023)")
+    ax2.set_xlabel("Year"); ax2.set_ylabel("Growth rate (%)")
+    ax2.legend()
+    return fig2
+
+
+def income_group(nom_income, real_income):
+    inc_groups = nom_income.index
+    x = range(len(inc_groups))
+
+    fig3, ax3 = plt.subplots(figsize=(7, 5))
+    ax3.bar(x,                         nom_income.values,
+            width=0.4, label="Nominal", align="center")
+    ax3.bar([i+0.4 for i in x],        real_income.reindex(inc_groups).values,
+            width=0.4, label="Real",    align="center")
+    ax3.set_xticks([i+0.2 for i in x]); ax3.set_xticklabels(inc_groups)
+    ax3.set_ylabel("Average growth rate (%)")
+    ax3.set_title("Nominal vs real minimum-wage growth by income group")
+    ax3.legend()
+    return fig3
+
+
+# -------------------------------------------------------
+# Page 2 – minimum vs. actual wage levels
+# -------------------------------------------------------
+HEATMAP_SCHEMES = ("Sequential (YlGnBu)", "Diverging (RdBu_r, centred at 50)")
+
+
+def heatmap(df, scheme):
+    fig, ax = plt.subplots(figsize=(10, 7))
+    if scheme.startswith("Sequential"):
+        im = ax.imshow(df.values, aspect="auto", cmap="YlGnBu")
+    else:
+        norm = mcolors.TwoSlopeNorm(
+            vmin=df.values.min(), vcenter=50, vmax=df.values.max()
+        )
+        im = ax.imshow(df.values, aspect="auto", cmap="RdBu_r", norm=norm)
+
+    ax.set_xticks(range(len(df.columns)), df.columns)
+    ax.set_yticks(range(len(df.index)), df.index)
+    ax.set_title("Minimum-to-average wage ratio (%) • 2017-2023")
+
+    cbar = fig.colorbar(im, ax=ax)
+    cbar.set_label("ratio %")
+
+    plt.tight_layout()
+    return fig
+
+
+def slopegraph(df_plot, top_n):
+    fig, ax = plt.subplots(figsize=(8, 10))
+
+    x0, x1 = 0, 1
+    for country, row in df_plot.iterrows():
+        ax.plot([x0, x1], [row["2017"], row["2023"]],
+                linewidth=1.2,
+                color="tab:blue" if row["Δ"] >= 0 else "tab:red")
+        ax.text(x0 - 0.03, row["2017"], country,
+                ha="right", va="center", fontsize=8)
+
+
+    ax.set_xticks([x0, x1], ["2017", "2023"])
+    ax.set_ylabel("Minimum-to-average wage ratio (%)")
+    ax.set_title(f"Change in minimum-/average-wage ratio, 2017 → 2023\n(top {top_n} countries)")
+    for spine in ("top", "right", "bottom"):
+        ax.spines[spine].set_visible(False)
+    ax.tick_params(left=False)
+    plt.tight_layout()
+    return fig
+
+
+def trajectories(df_plot):
+    fig, ax = plt.subplots(figsize=(7, 5))
+
+    for country in df_plot.columns:
+        ax.plot(df_plot.index, df_plot[country],
+                marker="o", label=country)
+
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Minimum-to-average wage ratio (%)")
+    ax.set_title("Trajectory of wage-floor ratio (2017-2023)")
+    ax.legend()
+    plt.tight_layout()
+    return fig
+
+
+# -------------------------------------------------------
+# Page 3 – economic growth connection
+# -------------------------------------------------------
+def gdp_vs_wage(data, highlight_country="None", band=None):
+    """Scatter with the OLS line and its bootstrap band; *band* from
+    core.correlation.fit_band (computed here if not given)."""
+    if band is None:
+        band = correlation.fit_band(data["gdp_growth_avg"], data["real_wage_growth_avg"])
+
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.scatter(data["gdp_growth_avg"], data["real_wage_growth_avg"], s=60, alpha=0.8)
+    ax.plot(band["x"], band["fit"], color="red", linewidth=1.5)
+    ax.fill_between(band["x"], band["lo"], band["hi"], color="red", alpha=0.15, linewidth=0)
+
+    # optional annotation
+    if highlight_country != "None":
+        row = data[data["country_name"] == highlight_country].iloc[0]
+        ax.scatter(
+            row["gdp_growth_avg"],
+            row["real_wage_growth_avg"],
+            s=120,
+            edgecolor="black",
+            facecolor="yellow",
+            zorder=5
+        )
+        ax.text(
+            row["gdp_growth_avg"],
+            row["real_wage_growth_avg"],
+            f"  {highlight_country}",
+            va="center"
+        )
+
+    ax.set_title("Relationship between GDP Growth and Real Wage Growth\nEurope, 2017-2023")
+    ax.set_xlabel("Average GDP Growth Rate (%, 2017-2023)")
+    ax.set_ylabel("Average Real Wage Growth Rate (%, 2017-2023)")
+    ax.grid(True)
+    plt.tight_layout()
+    return fig
+
+
+def real_wage_lines(table):
+    """One line per country of a Year × country table
+    (core.transforms.RealWageSeries.select)."""
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    colors = px.colors.qualitative.Safe
+    fig = go.Figure([
+        go.Scatter(x=table.index, y=table[country], mode="lines", name=country,
+                   line={"color": colors[i % len(colors)]}, connectgaps=True,
+                   hovertemplate="%{y:.2f}")
+        for i, country in enumerate(table.columns)
+    ])
+    fig.update_layout(
+        title="Real Wage Growth in Europe (2017 – 2023)",
+        xaxis_title="Year", yaxis_title="Real Wage Growth (%)",
+        hovermode="x unified", legend_title_text="Country", height=600,
+    )
+    return fig
+
+
+def rolling_correlation(view):
+    """r by window end year, one line per group with its bootstrap
+    interval as a band; *view* is a slice of
+    core.transforms.gdp_wage_correlations."""
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    colors = px.colors.qualitative.Safe
+    for i, (group, g) in enumerate(view.groupby("group", sort=False, observed=True)):
+        color = colors[i % len(colors)]
+        fig.add_trace(go.Scatter(
+            x=list(g["end"]) + list(g["end"])[::-1],
+            y=list(g["r_hi"]) + list(g["r_lo"])[::-1],
+            fill="toself", fillcolor=color, opacity=0.2, line={"width": 0},
+            hoverinfo="skip", showlegend=False, legendgroup=group,
+        ))
+        fig.add_trace(go.Scatter(
+            x=g["end"], y=g["r"], mode="lines+markers", name=group,
+            line={"color": color}, legendgroup=group,
+            customdata=g[["n", "r_lo", "r_hi"]],
+            hovertemplate="%{x}: r = %{y:.2f} (CI %{customdata[1]:.2f} to "
+                          "%{customdata[2]:.2f}, n = %{customdata[0]})<extra></extra>",
+        ))
+    fig.add_hline(y=0, line={"color": "grey", "width": 1})
+    fig.update_layout(
+        title="Correlation of GDP growth and real-wage growth, by window end year",
+        xaxis_title="Window end year", yaxis_title="Pearson r", yaxis_range=[-1, 1],
+        legend_title_text="Sub-region", hovermode="x", height=500,
+    )
+    return fig
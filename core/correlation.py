@@ -0,0 +1,179 @@
+# core/correlation.py
+# ───────────────────────────────────────────────────────────────
+# Vectorised correlation engine for GDP growth vs. real-wage growth.
+#
+# Inputs are two aligned country × year matrices (NaN = no data).
+# For every window width, lag and window end at once, each country's
+# values are averaged over the window (running sums along the year
+# axis) and the cross-country Pearson r and OLS fit are taken from
+# weighted moment sums:
+#
+#   n, Σx, Σy, Σx², Σy², Σxy  =  W @ (masked x, y products)
+#
+# where each row of W weights the countries: 0/1 membership for the
+# country groups (all countries, each sub-region), multinomial counts
+# for the bootstrap resamples.  So the whole grid — groups × bootstrap
+# draws × (width, lag, end) — is six matrix products, and the
+# confidence intervals are percentiles over the draws.  Countries are
+# resampled within their group, as a per-group bootstrap would.
+#
+# Results are deterministic for a given seed, so callers can cache
+# them (the page keys them on the data revision, core.refresh).
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+N_BOOT = 1000
+LEVEL = 0.95
+MIN_COUNTRIES = 3          # fewer → r and fit are NaN
+
+
+def window_means(m: np.ndarray, width: int, min_obs: int = 1) -> np.ndarray:
+    """Mean of each row over every run of *width* consecutive columns
+    (column k covers ``k … k+width-1``), skipping NaNs; NaN with fewer
+    than *min_obs* observed values."""
+    seen = ~np.isnan(m)
+    pad = np.zeros((m.shape[0], 1))
+    sums = np.hstack([pad, np.cumsum(np.where(seen, m, 0.0), axis=1)])
+    counts = np.hstack([pad, np.cumsum(seen, axis=1)])
+    s = sums[:, width:] - sums[:, :-width]
+    c = counts[:, width:] - counts[:, :-width]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(c >= min_obs, s / c, np.nan)
+
+
+def fit(w: np.ndarray, x: np.ndarray, y: np.ndarray):
+    """Pearson r, OLS slope and intercept of *y* on *x* per row of the
+    country weights *w* (k × countries) and per column of *x*, *y*
+    (countries × t).  Pairs with a NaN are left out.
+
+    Returns ``(n, r, slope, intercept)``, each k × t.
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x0, y0 = np.where(valid, x, 0.0), np.where(valid, y, 0.0)
+    n = w @ valid
+    sx, sy = w @ x0, w @ y0
+    sxx, syy, sxy = w @ (x0 * x0), w @ (y0 * y0), w @ (x0 * y0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cxx = sxx - sx * sx / n
+        cyy = syy - sy * sy / n
+        cxy = sxy - sx * sy / n
+        r = cxy / np.sqrt(cxx * cyy)
+        slope = cxy / cxx
+        intercept = (sy - slope * sx) / n
+    small = (n < MIN_COUNTRIES) | (cxx <= 0)
+    for a in (r, slope, intercept):
+        a[small] = np.nan
+    return n, r, slope, intercept
+
+
+def _resamples(groups: np.ndarray, n_boot: int, rng) -> np.ndarray:
+    """Bootstrap weights: for each group row of *groups* (0/1, g × c),
+    *n_boot* rows of multinomial counts over its members → (g, b, c)."""
+    out = np.zeros((len(groups), n_boot, groups.shape[1]))
+    for g, members in enumerate(groups.astype(bool)):
+        k = int(members.sum())
+        if k:
+            out[g][:, members] = rng.multinomial(k, np.full(k, 1 / k), size=n_boot)
+    return out
+
+
+def _interval(draws: np.ndarray, level: float):
+    """Percentile interval over axis 1 of *draws*, ignoring NaNs (same
+    as ``np.nanpercentile`` with linear interpolation, vectorised)."""
+    ordered = np.sort(draws, axis=1)                 # NaNs sort last
+    k = (~np.isnan(draws)).sum(axis=1, keepdims=True)
+    out = []
+    for q in ((1 - level) / 2, (1 + level) / 2):
+        pos = np.maximum(k - 1, 0) * q
+        below = np.floor(pos).astype(np.intp)
+        above = np.minimum(below + 1, np.maximum(k - 1, 0))
+        lo = np.take_along_axis(ordered, below, axis=1)
+        hi = np.take_along_axis(ordered, above, axis=1)
+        with np.errstate(invalid="ignore"):
+            value = (lo + (hi - lo) * (pos - below))[:, 0]
+        value[k[:, 0] == 0] = np.nan
+        out.append(value)
+    return out
+
+
+def grid(x: np.ndarray, y: np.ndarray, years: Sequence[int], groups: dict,
+         widths: Sequence[int], lags: Sequence[int] = (0,),
+         n_boot: int = N_BOOT, level: float = LEVEL, seed: int = 0) -> pd.DataFrame:
+    """Correlation of *y* with *x* for every group, window width, lag
+    and window end.
+
+    *x*, *y*: country × year matrices over *years*.  *groups*: name →
+    row positions.  With lag L, *x* is averaged over the window ending
+    L years before the *y* window ("x leads y").
+
+    One row per (group, width, lag, end): n, r, slope, intercept and
+    the bootstrap interval of r and slope at *level*.
+    """
+    years = list(years)
+    blocks_x, blocks_y, keys = [], [], []
+    for width in widths:
+        mx, my = window_means(x, width), window_means(y, width)
+        ends = years[width - 1:]
+        for lag in lags:
+            if lag >= len(ends):
+                continue
+            blocks_x.append(mx[:, :mx.shape[1] - lag])
+            blocks_y.append(my[:, lag:])
+            keys += [(width, lag, end) for end in ends[lag:]]
+    xs, ys = np.hstack(blocks_x), np.hstack(blocks_y)
+
+    names = list(groups)
+    member = np.zeros((len(names), x.shape[0]))
+    for g, name in enumerate(names):
+        member[g, groups[name]] = 1.0
+    n, r, slope, intercept = fit(member, xs, ys)
+
+    # one group at a time keeps the draws at n_boot × t per statistic
+    rng = np.random.default_rng(seed)
+    r_lo, r_hi, s_lo, s_hi = (np.empty_like(r) for _ in range(4))
+    for g in range(len(names)):
+        _, br, bslope, _ = fit(_resamples(member[g:g + 1], n_boot, rng)[0], xs, ys)
+        (r_lo[g], r_hi[g]), (s_lo[g], s_hi[g]) = (
+            [v[0] for v in _interval(draws[None], level)] for draws in (br, bslope))
+
+    index = pd.MultiIndex.from_tuples(keys, names=["width", "lag", "end"])
+    frames = {
+        name: pd.DataFrame({
+            "n": n[g].astype(np.int64), "r": r[g], "r_lo": r_lo[g], "r_hi": r_hi[g],
+            "slope": slope[g], "slope_lo": s_lo[g], "slope_hi": s_hi[g],
+            "intercept": intercept[g],
+        }, index=index)
+        for g, name in enumerate(names)
+    }
+    return pd.concat(frames, names=["group"]).reset_index()
+
+
+def strength(r: float) -> str:
+    """Plain-words description of a correlation coefficient."""
+    size = abs(r)
+    word = ("very weak" if size < 0.1 else "weak" if size < 0.3
+            else "moderate" if size < 0.5 else "strong")
+    return f"{word}, {'negative' if r < 0 else 'positive'}"
+
+
+def fit_band(x, y, points: int = 100, n_boot: int = N_BOOT,
+             level: float = LEVEL, seed: int = 0) -> pd.DataFrame:
+    """OLS line of *y* on *x* with a bootstrap confidence band (what
+    ``sns.regplot`` draws), over *points* x values spanning the data."""
+    x = np.asarray(x, dtype=np.float64)[:, None]
+    y = np.asarray(y, dtype=np.float64)[:, None]
+    _, _, slope, intercept = fit(np.ones((1, len(x))), x, y)
+    rng = np.random.default_rng(seed)
+    boot = _resamples(np.ones((1, len(x))), n_boot, rng)[0]
+    _, _, bslope, bint = fit(boot, x, y)
+
+    xs = np.linspace(np.nanmin(x), np.nanmax(x), points)
+    preds = bint + bslope * xs                   # n_boot × points
+    lo, hi = _interval(preds[None], level)
+    return pd.DataFrame({"x": xs, "fit": intercept[0, 0] + slope[0, 0] * xs,
+                         "lo": lo[0], "hi": hi[0]})
@@ -0,0 +1,82 @@
+# core/countries.py
+# ───────────────────────────────────────────────────────────────
+# Canonical ISO-3 country keys shared by every join.
+#
+# The sources spell countries differently ("Czech Republic" / "Czechia",
+# "Moldova, Republic of" / "Moldova", "·  Bulgaria" …).  The ILO sheets
+# and the World Bank file carry their own ISO-3 column, the geometry has
+# ``iso_a3``; only the OECD CSV is name-only.  Each table therefore gets
+# an ``iso3`` column at load time (see core.data), and all merges are
+# exact joins on that code.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import unicodedata
+from typing import Iterable
+
+import pandas as pd
+
+ISO3 = "iso3"
+
+# Spellings not found in the ILO / World Bank code tables, keyed by
+# their normalised form (see `normalize`).
+ALIASES = {
+    "korea": "KOR",
+    "south korea": "KOR",
+    "turkey": "TUR",
+    "czech republic": "CZE",
+    "czechia": "CZE",
+    "slovakia": "SVK",
+    "moldova": "MDA",
+    "kyrgyzstan": "KGZ",
+    "russia": "RUS",
+    "kosovo": "XKX",
+    "north macedonia": "MKD",
+    "bosnia and herz.": "BIH",
+}
+
+
+def display(name) -> str:
+    """Clean label: NFKC, list bullets stripped, runs of (non-breaking /
+    figure) spaces collapsed."""
+    if not isinstance(name, str):
+        return ""
+    text = unicodedata.normalize("NFKC", name).strip("·• \t")
+    return " ".join(text.split())
+
+
+def normalize(name) -> str:
+    """Lookup form of a country name (`display`, case-folded)."""
+    return display(name).casefold()
+
+
+class CountryIndex:
+    """Name → ISO-3 resolver built from the sources' own code tables."""
+
+    def __init__(self, pairs: Iterable[tuple[str, str]] = ()):
+        self._codes = dict(ALIASES)
+        self.names: dict[str, str] = {}     # ISO-3 → first display name seen
+        for name, code in pairs:
+            if not isinstance(code, str) or not isinstance(name, str):
+                continue
+            self._codes[normalize(name)] = code
+            self.names.setdefault(code, name)
+
+    def code(self, name) -> str | None:
+        return self._codes.get(normalize(name))
+
+    def codes(self, names: pd.Series) -> pd.Series:
+        """ISO-3 code per name (NA where the name is unknown, e.g. the
+        OECD "Non-OECD economies" aggregate)."""
+        uniq = pd.unique(names)
+        lookup = {n: self.code(n) for n in uniq}
+        return names.map(lookup).astype(object)
+
+
+def keyed(df: pd.DataFrame, codes) -> pd.DataFrame:
+    """*df* with an ``iso3`` column in front (a new frame); missing codes
+    stay missing rather than becoming the string "nan"."""
+    out = df.copy()
+    codes = pd.Series(codes, index=df.index, dtype=object)
+    out.insert(0, ISO3, codes.str.strip().str.upper().where(codes.notna()))
+    return out
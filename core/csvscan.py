@@ -0,0 +1,73 @@
+# core/csvscan.py
+# ───────────────────────────────────────────────────────────────
+# Streaming, column-pruned reader for the wide "one column per year"
+# CSVs (World Bank WDI, OECD exports).
+#
+# Column selection (id columns + a year window) is handed to the C
+# parser as `usecols`, so other columns are never converted; the file
+# is read in chunks and row predicates are applied per chunk, so only
+# matching rows are ever held in memory.  That keeps a full WDI bulk
+# dump (every indicator × economy) as cheap as the single-indicator
+# download we bundle.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Iterable, Mapping
+
+import pandas as pd
+
+CHUNKSIZE = 50_000
+
+
+def header_line(path: str | Path, id_cols: list, max_lines: int = 100) -> int:
+    """0-based line number of the header row holding every *id_cols*
+    name (World Bank downloads put a short preamble above it)."""
+    wanted = set(id_cols)
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        for i, row in enumerate(csv.reader(fh)):
+            if wanted <= {c.strip() for c in row}:
+                return i
+            if i >= max_lines:
+                break
+    raise ValueError(f"{path}: no header row with columns {sorted(wanted)}")
+
+
+def _is_year(col: str, years: tuple[int, int] | None) -> bool:
+    col = col.strip()
+    if not col.isdigit():
+        return False
+    return years is None or years[0] <= int(col) <= years[1]
+
+
+def scan(path: str | Path, id_cols: list, years: tuple[int, int] | None = None,
+         where: Mapping[str, Iterable] | None = None,
+         chunksize: int = CHUNKSIZE) -> pd.DataFrame:
+    """Read *id_cols* plus the year columns inside *years* (inclusive,
+    None = all), keeping only rows whose ``where`` columns hold one of
+    the allowed values.
+
+    Year columns come back as float64, named as in the file.
+    """
+    where = {col: set(allowed) for col, allowed in (where or {}).items()}
+    wanted = set(id_cols) | set(where)
+    skip = header_line(path, [*id_cols, *where])
+
+    chunks = pd.read_csv(
+        path, skiprows=skip, chunksize=chunksize,
+        usecols=lambda c: c in wanted or _is_year(c, years),
+        dtype={c: "str" for c in wanted},
+    )
+    kept = []
+    for chunk in chunks:
+        for col, allowed in where.items():
+            chunk = chunk[chunk[col].isin(allowed)]
+        if len(chunk):
+            kept.append(chunk)
+    if not kept:
+        return pd.DataFrame(columns=id_cols)
+    df = pd.concat(kept, ignore_index=True)
+    year_cols = [c for c in df.columns if _is_year(c, years)]
+    df[year_cols] = df[year_cols].astype("float64")
+    return df[list(id_cols) + year_cols]
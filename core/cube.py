@@ -0,0 +1,329 @@
+# core/cube.py
+# ───────────────────────────────────────────────────────────────
+# Precomputed country × year × metric cube.
+#
+# Built once per workbook from the shared source frames:
+#   * one dense float64 array  data[metric, country, year]
+#   * categorical dimension table (Region, Subregion, Income group)
+#   * per-category row-position indexes for those dimensions
+#   * mean rollups for every (metric, dimension, region) combination
+# so page filters and aggregations become index lookups instead of a
+# fresh merge + groupby on every rerun.
+#
+# Countries are the ILO "Real wage growth" rows, keyed by ISO-3; the
+# other sources are attached on their ``iso3`` column (core.countries).
+#
+# When a source file is revised, `WageCube.patched` applies just the
+# changed country-years (core.refresh) instead of a full rebuild.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import copy
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core import data, growth, shared
+from core.countries import ISO3
+
+COUNTRY = "country_name"
+DIMENSIONS = ("Region", "Subregion - detailed", "Income group")
+METRICS = (
+    "real_growth",      # ILO real wage growth (%)
+    "nominal_wage",     # ILO nominal minimum wage (local currency)
+    "nominal_growth",   # YoY growth of nominal_wage (%)
+    "min_to_avg",       # OECD minimum-to-average wage ratio, mean (%)
+    "gdp",              # World Bank GDP, constant 2015 US$
+    "gdp_growth",       # YoY growth of gdp (%)
+)
+# level metric → its year-over-year growth metric
+RATES = {"nominal_wage": "nominal_growth", "gdp": "gdp_growth"}
+
+
+class Patch(NamedTuple):
+    """Revised values of one metric."""
+    cells: pd.DataFrame     # iso3, year, value — one row per changed country-year
+    present: dict           # iso3 → True / False for rows added to / dropped from the source
+
+
+class WageCube:
+    """Read-only cube; see the module comment for the layout.
+
+    Rows are indexed by ISO-3 code; ``dims[COUNTRY]`` holds the display
+    name.
+    """
+
+    def __init__(self, dims: pd.DataFrame, years: Sequence[int],
+                 values: dict, present: dict):
+        metrics = tuple(values)
+        self._setup(dims, years, metrics, np.stack([values[m] for m in metrics]),
+                    np.stack([present[m] for m in metrics]))
+
+    @classmethod
+    def from_arrays(cls, dims: pd.DataFrame, years: Sequence[int], metrics: Sequence[str],
+                    data: np.ndarray, present: np.ndarray,
+                    rollups: dict | None = None) -> "WageCube":
+        """A cube over already stacked ``data[metric, country, year]`` and
+        ``present[metric, country]`` arrays, used as they are (they may
+        be memory-mapped, see core.shared); given *rollups* are not
+        recomputed."""
+        cube = cls.__new__(cls)
+        cube._setup(dims, years, tuple(metrics), data, present, rollups)
+        return cube
+
+    def _setup(self, dims, years, metrics, data, present, rollups=None) -> None:
+        self.dims = dims
+        self.years = list(years)
+        self.metrics = metrics
+        self.data = data
+        self.data.setflags(write=False)
+        self.present = present
+        self._metric_pos = {m: i for i, m in enumerate(self.metrics)}
+        self._year_pos = {y: i for i, y in enumerate(self.years)}
+        self._country_pos = {c: i for i, c in enumerate(dims.index)}
+
+        # dimension -> category code per row / category -> sorted row positions
+        self._codes = {dim: dims[dim].cat.codes.to_numpy() for dim in DIMENSIONS}
+        self.index = {
+            dim: {cat: np.flatnonzero(self._codes[dim] == code)
+                  for code, cat in enumerate(dims[dim].cat.categories)}
+            for dim in DIMENSIONS
+        }
+        if rollups is not None:
+            self._rollups = dict(rollups)
+            return
+        self._rollups = {}
+        for region in [None, *self.index["Region"]]:
+            for dim in DIMENSIONS[1:]:
+                for metric in self.metrics:
+                    self._rollups[metric, dim, region] = self._aggregate(metric, dim, region)
+
+    # -------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------
+    def rows(self, region: str | None = None, subregions: Iterable[str] | None = None,
+             incomes: Iterable[str] | None = None,
+             countries: Iterable[str] | None = None) -> np.ndarray:
+        """Row positions matching every given filter (None = no filter);
+        *countries* are ISO-3 codes."""
+        picks = []
+        if region is not None:
+            picks.append(self.index["Region"].get(region, np.array([], np.intp)))
+        for dim, cats in (("Subregion - detailed", subregions), ("Income group", incomes)):
+            if cats is not None:
+                hit = [self.index[dim][c] for c in cats if c in self.index[dim]]
+                picks.append(np.sort(np.concatenate(hit)) if hit else np.array([], np.intp))
+        if countries is not None:
+            picks.append(np.unique([self._country_pos[c] for c in countries
+                                    if c in self._country_pos]).astype(np.intp))
+        rows = picks[0] if picks else np.arange(len(self.dims))
+        for other in picks[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows.astype(np.intp)
+
+    def values(self, metric: str, years: Sequence[int] | None = None,
+               rows: np.ndarray | None = None) -> np.ndarray:
+        """Raw ``country × year`` block (a view when no years are given)."""
+        block = self.data[self._metric_pos[metric]]
+        if rows is not None:
+            block = block[rows]
+        if years is not None:
+            block = block[:, [self._year_pos[y] for y in years]]
+        return block
+
+    def frame(self, metric: str, years: Sequence[int] | None = None,
+              present_only: bool = True, **filters) -> pd.DataFrame:
+        """Wide ``country × year`` frame for *metric* (countries lacking
+        the metric's source row are dropped unless ``present_only=False``)."""
+        rows = self.rows(**filters)
+        if present_only:
+            rows = rows[self.present[self._metric_pos[metric], rows]]
+        years = self.years if years is None else list(years)
+        return pd.DataFrame(self.values(metric, years, rows),
+                            index=self.dims.index[rows], columns=years)
+
+    def rollup(self, metric: str, by: str, region: str | None = None,
+               years: Sequence[int] | None = None) -> pd.DataFrame:
+        """Mean of *metric* per *by* category and year (precomputed)."""
+        out = self._rollups[metric, by, region]
+        return out if years is None else out[list(years)]
+
+    # -------------------------------------------------------
+    # Incremental updates
+    # -------------------------------------------------------
+    def patched(self, patches: dict) -> "WageCube":
+        """A new cube with *patches* (metric → Patch) applied.
+
+        Growth rates are recomputed for the touched rows only, and each
+        rollup only for the categories and years those rows fall in;
+        everything else is shared with this cube, which stays valid for
+        readers that still hold it.  Countries outside the cube are
+        ignored.
+        """
+        data, present = self.data.copy(), self.present.copy()
+        touched = {}
+        for metric, patch in patches.items():
+            m = self._metric_pos[metric]
+            mask = np.zeros(data.shape[1:], dtype=bool)
+            for code, flag in patch.present.items():
+                row = self._country_pos.get(code)
+                if row is not None:
+                    present[m, row] = flag
+                    data[m, row] = np.nan
+                    mask[row] = True
+            cells = patch.cells[patch.cells[ISO3].isin(self._country_pos)
+                                & patch.cells["year"].isin(self._year_pos)]
+            rows = cells[ISO3].map(self._country_pos).to_numpy(np.intp)
+            cols = cells["year"].map(self._year_pos).to_numpy(np.intp)
+            data[m, rows, cols] = cells["value"].to_numpy(np.float64)
+            mask[rows, cols] = True
+            touched[metric] = mask
+
+            rate = RATES.get(metric)
+            if rate is not None:
+                r = self._metric_pos[rate]
+                rows = np.flatnonzero(mask.any(axis=1))
+                level = pd.DataFrame(data[m, rows], columns=self.years)
+                data[r, rows, 1:] = growth.yoy(level, self.years).to_numpy()
+                present[r, rows] = present[m, rows]
+                rate_mask = mask.copy()
+                rate_mask[:, 1:] |= mask[:, :-1]       # y's rate reads y-1 and y
+                touched[rate] = rate_mask
+
+        cube = copy.copy(self)
+        data.setflags(write=False)
+        cube.data, cube.present = data, present
+        cube._rollups = dict(self._rollups)
+        for key in self._rollups:
+            if key[0] in touched:
+                cube._rollups[key] = cube._update_rollup(key, touched[key[0]])
+        return cube
+
+    def _update_rollup(self, key: tuple, mask: np.ndarray) -> pd.DataFrame:
+        metric, dim, region = key
+        old = self._rollups[key]
+        region_rows = self.rows(region=region)
+        rows = region_rows[mask[region_rows].any(axis=1)]
+        codes = self._codes[dim][rows]
+        names = list(self.index[dim])
+        cats = [names[i] for i in np.unique(codes[codes >= 0])]
+        if not cats:
+            return old
+        years = np.flatnonzero(mask[rows].any(axis=0))     # rollup columns = self.years
+        present = self.present[self._metric_pos[metric]]
+        means = old.to_numpy(copy=True)
+        for cat, pos in zip(cats, old.index.get_indexer(cats)):
+            members = np.intersect1d(self.index[dim][cat], region_rows, assume_unique=True)
+            members = members[present[members]]
+            if pos < 0 or not len(members):
+                # a category appears in / drops out of the rollup
+                return self._aggregate(metric, dim, region)
+            block = self.values(metric, rows=members)[:, years]
+            seen = ~np.isnan(block)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means[pos, years] = np.where(seen, block, 0.0).sum(axis=0) / seen.sum(axis=0)
+        return pd.DataFrame(means, index=old.index, columns=old.columns)
+
+    # -------------------------------------------------------
+    # Build helpers
+    # -------------------------------------------------------
+    def _aggregate(self, metric: str, dim: str, region: str | None) -> pd.DataFrame:
+        # groupby(dim).mean() semantics: NaNs skipped, a category appears
+        # if at least one of its countries has a row in the source.
+        rows = self.rows(region=region)
+        rows = rows[self.present[self._metric_pos[metric], rows]]
+        codes = self._codes[dim][rows]
+        rows, codes = rows[codes >= 0], codes[codes >= 0]
+        vals = self.values(metric, rows=rows)
+        seen = ~np.isnan(vals)
+        onehot = np.zeros((len(self.dims[dim].cat.categories), len(codes)))
+        onehot[codes, np.arange(len(codes))] = 1.0
+        sums = onehot @ np.where(seen, vals, 0.0)
+        counts = onehot @ seen
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / counts
+        cats = np.unique(codes)
+        return pd.DataFrame(means[cats],
+                            index=pd.Index(self.dims[dim].cat.categories[cats], name=dim),
+                            columns=self.years)
+
+
+def _attach(countries: pd.Index, frame: pd.DataFrame, key: str,
+            year_cols: Sequence, years: list):
+    """Align *frame* (matched on its ISO-3 *key*) to the cube's rows and
+    year axis.  Rows without a code (source aggregates) are skipped."""
+    frame = frame[frame[key].notna()]
+    pos = pd.Index(frame[key]).get_indexer(countries)
+    found = pos >= 0
+    year_pos = [years.index(int(c)) for c in year_cols]
+    out = np.full((len(countries), len(years)), np.nan)
+    out[np.ix_(found, year_pos)] = frame[list(year_cols)].to_numpy(dtype=np.float64)[pos[found]]
+    return out, found
+
+
+def build(real: pd.DataFrame, nominal: pd.DataFrame,
+          min_to_avg: pd.DataFrame, gdp: pd.DataFrame) -> WageCube:
+    dims = real.set_index(ISO3)[[COUNTRY, *DIMENSIONS]].copy()
+    for dim in DIMENSIONS:
+        cats = sorted(dims[dim].dropna().unique())
+        dims[dim] = pd.Categorical(dims[dim], categories=cats)
+    countries = dims.index
+
+    sources = {
+        "real_growth": real,
+        "nominal_wage": nominal,
+        "min_to_avg": min_to_avg.query("`Time period.1` == 'Mean'"),
+        "gdp": gdp,
+    }
+    year_cols = {m: [c for c in f.columns if str(c).isdigit()] for m, f in sources.items()}
+    all_years = [int(c) for cols in year_cols.values() for c in cols]
+    years = list(range(min(all_years), max(all_years) + 1))
+
+    values, present = {}, {}
+    for metric, frame in sources.items():
+        values[metric], present[metric] = _attach(countries, frame, ISO3, year_cols[metric], years)
+    for level, rate in RATES.items():
+        yoy = growth.yoy(pd.DataFrame(values[level], columns=years), years).to_numpy()
+        values[rate] = np.hstack([np.full((len(countries), 1), np.nan), yoy])
+        present[rate] = present[level]
+
+    return WageCube(dims, years, {m: values[m] for m in METRICS},
+                    {m: present[m] for m in METRICS})
+
+
+_lock = threading.Lock()
+_cubes: dict[str, WageCube] = {}       # resolved workbook path → cube
+
+
+def get_cube(path: str | Path = data.WAGE_XLSX) -> WageCube:
+    """The cube for the given ILO workbook, built once per process (the
+    bundled one is mapped from core.shared when another process built it)."""
+    key = str(Path(path).resolve())
+    with _lock:
+        cube = _cubes.get(key)
+        if cube is None:
+            # read even when the cube is mapped: core.refresh diffs
+            # against these tables, and core.shared keys on their content
+            wb, min_to_avg, gdp = data.load_workbook(key), data.min_to_avg_ratio(), data.gdp()
+
+            def make():
+                return build(wb.real, wb.nominal, min_to_avg, gdp)
+
+            bundled = key == str(data.WAGE_XLSX.resolve())
+            cube = _cubes[key] = shared.cube(make) if bundled else make()
+        return cube
+
+
+def update(fn: Callable[[str, WageCube], WageCube | None]) -> None:
+    """Replace every built cube by ``fn(path, cube)``; None drops it, to
+    be rebuilt on next use."""
+    with _lock:
+        for path, cube in list(_cubes.items()):
+            new = fn(path, cube)
+            if new is None:
+                del _cubes[path]
+            else:
+                _cubes[path] = new
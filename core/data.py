@@ -0,0 +1,217 @@
+# core/data.py
+# ───────────────────────────────────────────────────────────────
+# Shared data layer: every page reads the ILO workbook and the OECD /
+# World Bank CSVs through here, so each source is parsed once per
+# process (and, via core.store, once per content change on disk).
+# Every table comes back with an ``iso3`` join key (core.countries).
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import hashlib
+import threading
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple
+
+import pandas as pd
+
+from core import countries, csvscan, memory, store
+
+ROOT = Path(__file__).resolve().parent.parent
+WAGE_XLSX = ROOT / "globalwagereport-2024-25data.xlsx"
+MIN_WAGE_CSV = ROOT / "Minimum_to_average_wage_rate.csv"
+GDP_CSV = ROOT / "API_NY.GDP.MKTP.KD_DS2_en_csv_v2_19406.csv"
+
+EUROPE = "Europe and Central Asia"
+YEARS = list(range(2017, 2024))
+
+# Columns we keep from each sheet; everything else (VLOOKUP helpers,
+# "Unnamed: 36" …) is dropped at load time.
+REAL_ID_COLS = ["country_name", "ISO", "Region",
+                "Subregion - broad", "Subregion - detailed", "Income group"]
+REAL_YEAR_COLS = list(range(2000, 2025))
+NOM_ID_COLS = ["countryname", "ccode", "region", "Currency"]
+NOM_YEAR_COLS = YEARS
+MIN_ID_COLS = ["country", "Time period.1"]
+GDP_ID_COLS = ["Country Name", "Country Code", "Indicator Name", "Indicator Code"]
+
+# Row / column predicates pushed into the CSV scans (core.csvscan): the
+# year window the ILO workbook covers, the OECD statistic the pages use,
+# the WDI indicator and the ILO workbook's economies (so a full WDI bulk
+# dump reads the same way, its regional aggregates never parsed).
+WINDOW = (REAL_YEAR_COLS[0], REAL_YEAR_COLS[-1])
+MIN_STATISTIC = "Mean"
+GDP_INDICATOR = "NY.GDP.MKTP.KD"
+# Bump when a parser's output changes, so stale disk caches are rebuilt.
+PARSER_VERSION = 3
+
+
+class WageTables(NamedTuple):
+    real: pd.DataFrame       # "Real wage growth" sheet
+    nominal: pd.DataFrame    # "Nominal wage" sheet
+
+
+def _typed(df: pd.DataFrame, id_cols: list, year_cols: list) -> pd.DataFrame:
+    # Repeated labels (region, income group, currency …) as categoricals;
+    # values stay float64, the precision growth rates and core.refresh's
+    # diff (REL_TOL 1e-12) work at.  float32 would save ~40 KB over all
+    # four tables at a ~6e-8 relative error.
+    out = memory.compact(df[id_cols])
+    out[year_cols] = df[year_cols].astype("float64")
+    return out
+
+
+_lock = threading.Lock()
+
+
+# -------------------------------------------------------
+# Raw parsers (only run on a disk-cache miss, see core.store)
+# -------------------------------------------------------
+def _parse_workbook(path: Path) -> store.Tables:
+    # One ExcelFile handle → openpyxl opens the workbook a single time
+    # for both sheets.
+    with pd.ExcelFile(path) as xls:
+        real = pd.read_excel(xls, sheet_name="Real wage growth")
+        nom = pd.read_excel(xls, sheet_name="Nominal wage")
+    return {
+        "real": _typed(real, REAL_ID_COLS, REAL_YEAR_COLS),
+        "nominal": _typed(nom, NOM_ID_COLS, NOM_YEAR_COLS),
+    }
+
+
+def _parse_min_wage(path: Path) -> store.Tables:
+    df = csvscan.scan(path, MIN_ID_COLS, years=WINDOW,
+                      where={"Time period.1": [MIN_STATISTIC]})
+    return {"min_to_avg": memory.compact(df)}
+
+
+def _parse_gdp(path: Path, codes: Iterable[str] | None = None) -> store.Tables:
+    where = {"Indicator Code": [GDP_INDICATOR]}
+    if codes is not None:
+        where["Country Code"] = codes
+    df = csvscan.scan(path, GDP_ID_COLS, years=WINDOW, where=where)
+    return {"gdp": memory.compact(df)}
+
+
+_PARSERS = {"ilo": _parse_workbook, "oecd": _parse_min_wage, "wb": _parse_gdp}
+DEFAULTS = {"ilo": WAGE_XLSX, "oecd": MIN_WAGE_CSV, "wb": GDP_CSV}
+
+
+def _codes(tables: WageTables) -> frozenset:
+    return frozenset(tables.real["ISO"].dropna()) | frozenset(tables.nominal["ccode"].dropna())
+
+
+def parser(group: str) -> tuple[Callable[[Path], store.Tables], str]:
+    """(parse function, cache version) of *group*.  The World Bank scan
+    keeps the bundled ILO workbook's economies only, so its cache entry
+    is keyed on that country set too."""
+    if group != "wb":
+        return _PARSERS[group], str(PARSER_VERSION)
+    codes = _codes(_read("ilo", str(WAGE_XLSX.resolve())))
+    tag = hashlib.sha1(" ".join(sorted(codes)).encode()).hexdigest()[:8]
+    return partial(_parse_gdp, codes=codes), f"{PARSER_VERSION}-{tag}"
+
+
+# -------------------------------------------------------
+# Cached accessors
+# -------------------------------------------------------
+def keyed_tables(group: str, tables: store.Tables):
+    """Parsed tables of *group* as the accessors return them (with the
+    ``iso3`` key column)."""
+    if group == "ilo":
+        real, nom = tables["real"], tables["nominal"]
+        return WageTables(real=countries.keyed(real, real["ISO"]),
+                          nominal=countries.keyed(nom, nom["ccode"]))
+    (df,) = tables.values()
+    if group == "wb":
+        return countries.keyed(df, df["Country Code"])
+    return countries.keyed(df, country_index().codes(df["country"]))
+
+
+# (group, resolved path) → keyed tables; one entry per source file, so
+# core.refresh can swap a single replaced file (see `reload`).
+_loaded: dict[tuple[str, str], object] = {}
+
+
+def _read(group: str, path: str):
+    key = (group, path)
+    if key not in _loaded:
+        build, version = parser(group)
+        tables = store.load(group, path, build, version=version)
+        _loaded[key] = keyed_tables(group, tables)
+    return _loaded[key]
+
+
+@lru_cache(maxsize=None)
+def country_index() -> countries.CountryIndex:
+    """Name → ISO-3 resolver from the bundled ILO and World Bank code
+    tables (ILO spellings win as display names)."""
+    real = _read("ilo", str(WAGE_XLSX.resolve())).real
+    wb = _read("wb", str(GDP_CSV.resolve()))
+    return countries.CountryIndex([*zip(real["country_name"], real["ISO"]),
+                                   *zip(wb["Country Name"], wb["Country Code"])])
+
+
+def loaded() -> list:
+    """(group, path) of every source read so far in this process."""
+    with _lock:
+        return list(_loaded)
+
+
+def reload(group: str, path: str | Path):
+    """Re-read one source after its file changed: ``(old, new)`` tables,
+    *old* being None if it was never loaded."""
+    path = str(Path(path).resolve())
+    with _lock:
+        old = _loaded.pop((group, path), None)
+        if group in ("ilo", "wb"):
+            country_index.cache_clear()
+        new = _read(group, path)
+        if (group == "ilo" and path == str(WAGE_XLSX.resolve())
+                and old is not None and _codes(old) != _codes(new)):
+            # the World Bank tables hold the old country set: rescan on next use
+            for key in [k for k in _loaded if k[0] == "wb"]:
+                del _loaded[key]
+        return old, new
+
+
+def load_workbook(path: str | Path = WAGE_XLSX) -> WageTables:
+    """Return both wage sheets, parsed once per process and path.
+
+    The frames are shared by every page and session: treat them as
+    read-only and ``.copy()`` before adding columns.
+    """
+    with _lock:
+        return _read("ilo", str(Path(path).resolve()))
+
+
+def min_to_avg_ratio(path: str | Path = MIN_WAGE_CSV) -> pd.DataFrame:
+    """OECD minimum-to-average wage ratio (Mean rows, 2000 onwards)."""
+    with _lock:
+        return _read("oecd", str(Path(path).resolve()))
+
+
+def gdp(path: str | Path = GDP_CSV) -> pd.DataFrame:
+    """World Bank GDP (constant 2015 US$), one row per economy, 2000
+    onwards."""
+    with _lock:
+        return _read("wb", str(Path(path).resolve()))
+
+
+def build_disk_cache() -> dict:
+    """Parse (or re-use) every bundled source; used by ``python -m core.store``."""
+    tables = load_workbook()
+    return {
+        "real wage growth": tables.real,
+        "nominal wage": tables.nominal,
+        "min-to-avg ratio": min_to_avg_ratio(),
+        "gdp": gdp(),
+    }
+
+
+def real_wage_growth(path: str | Path = WAGE_XLSX) -> pd.DataFrame:
+    return load_workbook(path).real
+
+
+def nominal_wage(path: str | Path = WAGE_XLSX) -> pd.DataFrame:
+    return load_workbook(path).nominal
@@ -0,0 +1,108 @@
+# core/figures.py
+# ───────────────────────────────────────────────────────────────
+# Rendered-figure cache for matplotlib charts.
+#
+# Decorate a function that *draws* a chart and returns the Figure;
+# calling it then returns the encoded image bytes instead.  The bytes
+# are kept in a process-wide LRU keyed by
+#   (chart code, data fingerprint of DataFrame/Series args, other args)
+# so a rerun triggered by an unrelated widget never redraws the chart.
+# Pass each chart only the widgets it depends on.  Frames are hashed on
+# every call (no memo by id), so one changed in place gets a new key;
+# draw functions must still treat their arguments as read-only, since
+# the key is taken before drawing.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import functools
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from core import profiling
+
+# Same defaults as st.pyplot, so cached images look identical.
+SAVEFIG_KW = {"dpi": 200, "bbox_inches": "tight"}
+
+
+def fingerprint(obj: pd.DataFrame | pd.Series) -> str:
+    """Content hash of a frame, index and labels included."""
+    h = hashlib.sha1(pd.util.hash_pandas_object(obj, index=True).values)
+    labels = list(obj.columns) if isinstance(obj, pd.DataFrame) else obj.name
+    h.update(repr(labels).encode())
+    return h.hexdigest()
+
+
+def _key(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return fingerprint(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_key(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _key(v)) for k, v in value.items()))
+    return value
+
+
+class FigureCache:
+    """Thread-safe LRU of rendered chart bytes (images, HTML exports)."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key, data: bytes) -> None:
+        with self._lock:
+            self._items[key] = data
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+cache = FigureCache()
+
+
+def render(fig, fmt: str = "png", **savefig_kw) -> bytes:
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, **{**SAVEFIG_KW, **savefig_kw})
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def cached_figure(fmt: str = "png", **savefig_kw):
+    """Decorator: ``draw(*args) -> Figure`` becomes ``draw(*args) -> bytes``."""
+    def decorator(draw):
+        code = draw.__code__
+        code_id = hashlib.sha1(code.co_code + repr(code.co_consts).encode()).hexdigest()
+
+        @functools.wraps(draw)
+        def wrapper(*args, **kwargs):
+            key = (code.co_filename, draw.__qualname__, code_id, fmt,
+                   _key(args), _key(kwargs))
+            data = cache.get(key)
+            if data is None:
+                profiling.mark_miss()
+                data = render(draw(*args, **kwargs), fmt, **savefig_kw)
+                cache.put(key, data)
+            return data
+        return wrapper
+    return decorator
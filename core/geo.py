@@ -0,0 +1,53 @@
+# core/geo.py
+# ───────────────────────────────────────────────────────────────
+# Bundled, pre-simplified Europe geometry (built by
+# scripts/build_geometry.py).  Nothing here touches the network.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+
+import geopandas as gpd
+
+from core import shared
+
+ROOT = Path(__file__).resolve().parent.parent
+GEO_DIR = ROOT / "assets" / "geo"
+
+# Levels of detail, coarsest first; see scripts/build_geometry.py for
+# the simplification tolerance behind each one.
+LODS = ("low", "medium", "high")
+DEFAULT_LOD = "medium"
+
+# ISO-3 codes of the countries drawn on the Europe map (the geometry's
+# ``iso_a3`` property; see core.countries for the data-side key).
+EUROPE = frozenset({
+    'ALB','AND','AUT','BLR','BEL','BIH','BGR','HRV','CYP','CZE','DNK','EST',
+    'FIN','FRA','DEU','GRC','HUN','ISL','IRL','ITA','XKX','LVA','LIE','LTU',
+    'LUX','MLT','MDA','MCO','MNE','NLD','MKD','NOR','POL','PRT','ROU','SMR',
+    'SRB','SVK','SVN','ESP','SWE','CHE','UKR','GBR'
+})
+
+
+def geometry_path(lod: str = DEFAULT_LOD) -> Path:
+    if lod not in LODS:
+        raise ValueError(f"unknown level of detail {lod!r}; expected one of {LODS}")
+    return GEO_DIR / f"europe-{lod}.geojson"
+
+
+@lru_cache(maxsize=None)
+def load_geometry(lod: str = DEFAULT_LOD,
+                  codes: frozenset = EUROPE) -> gpd.GeoDataFrame:
+    """Country polygons (``name``, ``iso_a3``, ``geometry``) for the
+    ISO-3 *codes*.
+
+    The filter is handed to OGR as a ``WHERE`` clause, so rows outside
+    the subset are never materialised.  Other server processes build
+    theirs from this one's coordinates (core.shared).  The result is
+    shared between callers — copy before mutating.
+    """
+    path = geometry_path(lod)
+    quoted = ",".join("'" + c.replace("'", "''") + "'" for c in sorted(codes))
+    return shared.geometry(path, codes,
+                           lambda: gpd.read_file(path, where=f"iso_a3 IN ({quoted})"))
@@ -0,0 +1,72 @@
+# core/growth.py
+# ───────────────────────────────────────────────────────────────
+# Vectorised growth engine.
+#
+# All functions take a wide frame (one row per country, one column per
+# year) plus the ordered year columns to use.  The block is pulled out
+# once as a contiguous float64 country×year matrix and every rate is
+# computed in a single NumPy expression over it — no per-year column
+# inserts.  Results are in percent.
+#
+# Missing values:
+#   yoy          NaN whenever either neighbouring year is missing.
+#   cumulative,  measured between the first and last *observed* years
+#   cagr         inside the window (CAGR uses the actual span between
+#                them); NaN if fewer than two years are observed.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def matrix(df: pd.DataFrame, years: Sequence) -> np.ndarray:
+    """The ``df[years]`` block as a C-contiguous float64 array."""
+    return np.ascontiguousarray(df[list(years)].to_numpy(dtype=np.float64))
+
+
+def _year_numbers(years: Sequence) -> np.ndarray:
+    return np.array([int(y) for y in years], dtype=np.float64)
+
+
+def yoy(df: pd.DataFrame, years: Sequence) -> pd.DataFrame:
+    """Year-over-year growth between consecutive *years* columns.
+
+    Columns are labelled by the later year (``years[1:]``).
+    """
+    m = matrix(df, years)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = (m[:, 1:] / m[:, :-1] - 1) * 100
+    return pd.DataFrame(rates, index=df.index, columns=list(years)[1:])
+
+
+def _endpoints(m: np.ndarray):
+    """Per row: value and column of the first and last non-NaN entry."""
+    seen = ~np.isnan(m)
+    first = seen.argmax(axis=1)
+    last = m.shape[1] - 1 - seen[:, ::-1].argmax(axis=1)
+    rows = np.arange(m.shape[0])
+    enough = seen.sum(axis=1) >= 2
+    return m[rows, first], m[rows, last], first, last, enough
+
+
+def cumulative(df: pd.DataFrame, years: Sequence) -> pd.Series:
+    """Total growth over the window spanned by *years*."""
+    m = matrix(df, years)
+    start, end, _, _, enough = _endpoints(m)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(enough, (end / start - 1) * 100, np.nan)
+    return pd.Series(rate, index=df.index, name="cumulative_growth")
+
+
+def cagr(df: pd.DataFrame, years: Sequence) -> pd.Series:
+    """Compound annual growth rate over the window spanned by *years*."""
+    m = matrix(df, years)
+    start, end, first, last, enough = _endpoints(m)
+    nums = _year_numbers(years)
+    span = nums[last] - nums[first]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(enough, ((end / start) ** (1 / span) - 1) * 100, np.nan)
+    return pd.Series(rate, index=df.index, name="cagr")
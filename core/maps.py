@@ -0,0 +1,230 @@
+# core/maps.py
+# ───────────────────────────────────────────────────────────────
+# Folium helpers for maps whose geometry never changes between reruns
+# but whose colours do.
+#
+# The geometry goes into the base map exactly once (fill + tooltip in
+# one GeoJson layer) and the colours come from a FeatureGroup holding a
+# `FeatureStyles` element, passed as `feature_group_to_add`.  The base
+# map's script is identical for every widget value, so the browser
+# keeps the existing Leaflet map and re-styles the features in place
+# instead of redrawing.  It does not save bandwidth: st_folium puts
+# the whole map script, geometry included, in the component arguments
+# on every rerun (about 57 KB at the low border detail).
+#
+# The plotly choropleth animation (page 2) follows the same idea: the
+# locations and hover labels live in the base trace once, and each
+# year's frame carries only its float32 value array.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import json
+from typing import NamedTuple
+
+import folium
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from branca.colormap import linear
+from branca.element import MacroElement
+from folium.template import Template
+from folium.utilities import get_obj_in_upper_tree
+
+from core import figures, profiling
+
+NO_DATA = {"fillColor": "lightgrey", "fillOpacity": 0.8}
+
+
+class FeatureStyles(MacroElement):
+    """Apply ``styles[feature.properties[key]]`` to every GeoJSON feature
+    already on the map; features without an entry get *default*.
+
+    With a *palette*, ``styles`` may map keys to integer class indexes
+    into it instead of full style dicts (a much smaller payload).
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function () {
+            var styles = {{ this.styles|tojson }};
+            var palette = {{ this.palette|tojson }};
+            var fallback = {{ this.default|tojson }};
+            {{ this._map.get_name() }}.eachLayer(function (layer) {
+                if (!layer.feature || !layer.setStyle) { return; }
+                var style = styles[layer.feature.properties[{{ this.key|tojson }}]];
+                if (typeof style === "number") { style = palette[style]; }
+                layer.setStyle(style || fallback);
+            });
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, styles: dict, key: str = "name", default: dict = NO_DATA,
+                 palette: list | None = None):
+        super().__init__()
+        self._name = "FeatureStyles"
+        self.styles = styles
+        self.key = key
+        self.default = default
+        self.palette = palette or []
+
+    def render(self, **kwargs):
+        self._map = get_obj_in_upper_tree(self, folium.Map)
+        super().render(**kwargs)
+
+
+def style_layer(styles: dict, key: str = "name", default: dict = NO_DATA,
+                palette: list | None = None) -> folium.FeatureGroup:
+    """Wrap `FeatureStyles` for ``st_folium(..., feature_group_to_add=...)``."""
+    fg = folium.FeatureGroup(name="styles", control=False)
+    fg.add_child(FeatureStyles(styles, key=key, default=default, palette=palette))
+    return fg
+
+
+# -------------------------------------------------------
+# Wage-growth map (page 4)
+# -------------------------------------------------------
+GROWTH_FIELD = "Avg_Annual_Growth_Rate"
+OUTLINE = {"color": "black", "weight": 1, "opacity": 0.2}
+
+
+def feature_collection(gdf, fields) -> dict:
+    """GeoJSON dict with only *fields* as properties (NaN → null)."""
+    return json.loads(gdf[list(fields) + ["geometry"]].round(2).to_json(drop_id=True))
+
+
+def growth_colormap(vmin: float, vmax: float):
+    # Spans the full data range so the legend (and therefore the base
+    # map) does not change with the filters.
+    colormap = linear.YlGnBu_09.scale(vmin, vmax).to_step(6)
+    colormap.caption = "Average Annual Real-Wage Growth (2017-2023, %)"
+    return colormap
+
+
+def growth_map(geojson: dict, colormap, fields=("name", GROWTH_FIELD),
+               aliases=("Country", "Avg annual growth (%)")) -> folium.Map:
+    """Base map: tiles, one GeoJson layer (outline + tooltip), legend."""
+    m = folium.Map(location=[54, 15], zoom_start=4, tiles="cartodbpositron")
+    folium.GeoJson(
+        geojson,
+        name="Wage growth",
+        style_function=lambda _: {**NO_DATA, **OUTLINE},
+        tooltip=folium.GeoJsonTooltip(
+            fields=list(fields),
+            aliases=list(aliases),
+            localize=True,
+            sticky=False
+        )
+    ).add_to(m)
+    colormap.add_to(m)
+    return m
+
+
+def growth_styles(frame, colormap, rate_range) -> dict:
+    """Fill style per country whose growth rate lies inside *rate_range*."""
+    shown = frame[frame[GROWTH_FIELD].between(*rate_range)]
+    return {
+        name: {"fillColor": colormap(rate), "fillOpacity": 0.8}
+        for name, rate in zip(shown["name"], shown[GROWTH_FIELD])
+    }
+
+
+
+# -------------------------------------------------------
+# Per-year wage-growth map (page 4, year slider)
+# -------------------------------------------------------
+class YearClasses(NamedTuple):
+    breaks: list      # class edges, shared by every year
+    palette: list     # one style dict per class
+    classes: dict     # year -> {name: class index}
+
+
+def year_classes(frame: pd.DataFrame, years, n_classes: int = 6) -> YearClasses:
+    """Bin every year of *frame* (``name`` column + one column per year)
+    into the same quantile classes, pooled over all years so colours are
+    comparable across the slider and the legend never changes."""
+    values = frame[list(years)].to_numpy(dtype=float)
+    breaks = np.unique(np.nanquantile(values, np.linspace(0, 1, n_classes + 1)))
+    colormap = year_colormap(breaks.tolist())
+    palette = [{"fillColor": colormap.rgb_hex_str((lo + hi) / 2), "fillOpacity": 0.8}
+               for lo, hi in zip(breaks[:-1], breaks[1:])]
+    idx = np.clip(np.searchsorted(breaks, values, side="right") - 1, 0, len(palette) - 1)
+    names = frame["name"].to_numpy()
+    classes = {
+        year: {name: int(c) for name, c, v in zip(names, idx[:, j], values[:, j])
+               if not np.isnan(v)}
+        for j, year in enumerate(years)
+    }
+    return YearClasses(breaks.tolist(), palette, classes)
+
+
+def year_colormap(breaks: list):
+    colormap = linear.YlGnBu_09.scale(breaks[0], breaks[-1]).to_step(index=breaks)
+    colormap.caption = "Real-wage growth in the selected year (%)"
+    return colormap
+
+
+# -------------------------------------------------------
+# Choropleth animation (page 2)
+# -------------------------------------------------------
+def _animate(frame, duration: int) -> list:
+    return [frame, {"frame": {"duration": duration, "redraw": True},
+                    "mode": "immediate", "fromcurrent": True,
+                    "transition": {"duration": duration, "easing": "linear"}}]
+
+
+def ratio_animation(wide: pd.DataFrame, label: str = "country",
+                    palette: str = "Blues", title: str | None = None,
+                    colorbar_title: str | None = None) -> go.Figure:
+    """Year-slider choropleth of *wide* (ISO-3 index, one column per year
+    plus a *label* column).
+
+    Same controls as ``px.choropleth(animation_frame=...)``, but the
+    frames only carry ``z``: payload grows by one float32 array per year
+    instead of one full trace.
+    """
+    years = [c for c in wide.columns if c != label]
+    values = wide[years].to_numpy(dtype=np.float32)
+    trace = go.Choropleth(
+        locations=wide.index.to_numpy(), locationmode="ISO-3",
+        z=values[:, 0], text=wide[label].to_numpy(), coloraxis="coloraxis",
+        hovertemplate="<b>%{text}</b><br>%{z:.1f}<extra></extra>",
+    )
+    frames = [go.Frame(name=str(y), data=[go.Choropleth(z=values[:, i])], traces=[0])
+              for i, y in enumerate(years)]
+
+    fig = go.Figure(data=[trace], frames=frames)
+    fig.update_layout(
+        title=title,
+        coloraxis={"colorscale": palette,
+                   "cmin": float(np.nanmin(values)), "cmax": float(np.nanmax(values)),
+                   "colorbar": {"title": {"text": colorbar_title}}},
+        updatemenus=[{
+            "type": "buttons", "direction": "left", "showactive": False,
+            "x": 0.1, "xanchor": "right", "y": 0, "yanchor": "top", "pad": {"r": 10, "t": 70},
+            "buttons": [
+                {"label": "&#9654;", "method": "animate", "args": _animate(None, 500)},
+                {"label": "&#9724;", "method": "animate", "args": _animate([None], 0)},
+            ],
+        }],
+        sliders=[{
+            "active": 0, "currentvalue": {"prefix": "year="}, "len": 0.9,
+            "x": 0.1, "xanchor": "left", "y": 0, "yanchor": "top", "pad": {"b": 10, "t": 60},
+            "steps": [{"label": str(y), "method": "animate", "args": _animate([str(y)], 0)}
+                      for y in years],
+        }],
+    )
+    return fig
+
+
+def animation_html(wide: pd.DataFrame, **kwargs) -> bytes:
+    """Stand-alone HTML of `ratio_animation`, built once per data and
+    options (shares core.figures' LRU)."""
+    key = ("animation_html", figures.fingerprint(wide), tuple(sorted(kwargs.items())))
+    html = figures.cache.get(key)
+    if html is None:
+        profiling.mark_miss()
+        fig = ratio_animation(wide, **kwargs)
+        html = fig.to_html(full_html=False, include_plotlyjs="cdn").encode()
+        figures.cache.put(key, html)
+    return html
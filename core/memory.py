@@ -0,0 +1,201 @@
+# core/memory.py
+# ───────────────────────────────────────────────────────────────
+# Memory: compact dtypes for shared frames, and an accounting of what
+# the process holds, per cache and per session.
+#
+# `compact` turns repeated labels into categoricals, downcasts integer
+# columns and (where the values are display-precision statistics)
+# float64 into float32.
+#
+# `report` lists, with deep sizes:
+#   core            the shared in-process caches (parsed sources, wage
+#                   cubes, other workbooks' cubes, rendered charts)
+#   shared          segments memory-mapped from core.shared (one copy
+#                   per host, however many server processes map them)
+#   st.cache_data   every entry, as stored (pickled bytes, which each
+#                   hit unpickles into a private copy)
+#   st.cache_resource  every entry (one shared object)
+#   session         per browser session: its session state and the
+#                   media files (st.image PNGs …) it holds
+# Sessions only exist inside a server; the profiling panel
+# (core.profiling) shows this report there.  Outside one,
+#   python -m core.memory
+# warms everything like a server start (core.warmup) and prints the
+# cache part.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from core import shared
+
+CATEGORY_RATIO = 0.5     # labels with at most this share of distinct values → category
+
+
+# -------------------------------------------------------
+# Compact dtypes
+# -------------------------------------------------------
+def compact(df: pd.DataFrame, floats: bool = False, exclude=()) -> pd.DataFrame:
+    """*df* with repeated string labels as categoricals, integers
+    downcast and, with *floats*, float64 as float32 (a new frame;
+    columns in *exclude* are left alone)."""
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if col in exclude:
+            pass
+        elif pd.api.types.is_string_dtype(s.dtype) or s.dtype == object:
+            if s.nunique() <= CATEGORY_RATIO * len(s):
+                s = s.astype("category")
+        elif pd.api.types.is_integer_dtype(s.dtype):
+            s = pd.to_numeric(s, downcast="integer")
+        elif floats and s.dtype == np.float64:
+            s = s.astype(np.float32)
+        out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+# -------------------------------------------------------
+# Deep sizes
+# -------------------------------------------------------
+def _geometry_bytes(s) -> int:
+    import shapely
+    return int(shapely.get_num_coordinates(np.asarray(s)).sum()) * 16
+
+
+def deep_size(obj, _seen: dict | None = None) -> int:
+    """Bytes held by *obj*: frames and arrays by their buffers,
+    containers and this package's objects recursively; anything else
+    by ``sys.getsizeof``.  Shared objects are counted once, arrays
+    mapped from core.shared segments not at all."""
+    # id → object: holding the objects keeps their ids from being reused
+    seen = {} if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen[id(obj)] = obj
+
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        size = int(np.sum(obj.memory_usage(deep=True)))
+        if isinstance(obj, pd.DataFrame) and hasattr(obj, "geometry"):   # GeoDataFrame
+            size += _geometry_bytes(obj.geometry)
+        return size
+    if isinstance(obj, np.ndarray):
+        if shared.is_mapped(obj):        # one copy per host: the "shared" rows
+            return 0
+        base = obj.base if obj.base is not None else obj
+        if id(base) in seen and base is not obj:
+            return 0
+        seen[id(base)] = base
+        return obj.nbytes
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(deep_size(k, seen) + deep_size(v, seen)
+                                        for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(deep_size(v, seen) for v in obj)
+    if type(obj).__module__.startswith("core.") and hasattr(obj, "__dict__"):
+        return sys.getsizeof(obj) + deep_size(vars(obj), seen)
+    return sys.getsizeof(obj)
+
+
+# -------------------------------------------------------
+# Accounting
+# -------------------------------------------------------
+def core_caches() -> list:
+    """(scope, name, entries, bytes) of the shared in-process caches."""
+    from core import cube, data, figures, workbooks
+
+    seen: dict = {}
+    rows = [("core", f"source:{group}", 1, deep_size(tables, seen))
+            for (group, _), tables in sorted(data._loaded.items())]
+    rows += [("core", "cube", len(cube._cubes), deep_size(dict(cube._cubes), seen))]
+    books = dict(workbooks.cache._items)
+    rows += [("core", "workbooks", len(books), deep_size(books, seen))]
+    charts = dict(figures.cache._items)
+    rows += [("core", "figures", len(charts), deep_size(charts, seen))]
+    rows += [("shared", name, 1, nbytes) for name, nbytes in shared.segments()]
+    return rows
+
+
+def streamlit_caches() -> list:
+    """(scope, name, entries, bytes) per st.cache_data /
+    st.cache_resource function; empty if this Streamlit's internals
+    don't look as expected."""
+    try:
+        return _streamlit_caches()
+    except (ImportError, AttributeError, RuntimeError):
+        return []
+
+
+def _streamlit_caches() -> list:
+    from streamlit.runtime.caching import cache_data_api, cache_resource_api
+    from streamlit.runtime.stats import CACHE_MEMORY_FAMILY
+
+    rows = []
+    data_sizes: dict = {}
+    for stat in cache_data_api._data_caches.get_stats().get(CACHE_MEMORY_FAMILY, []):
+        n, b = data_sizes.get(stat.cache_name, (0, 0))
+        data_sizes[stat.cache_name] = (n + 1, b + stat.byte_length)
+    rows += [("st.cache_data", name, n, b) for name, (n, b) in sorted(data_sizes.items())]
+
+    # Streamlit has no public listing of resource entries, and its own
+    # stats only count them; walk its registry (scope → key → cache).
+    scopes = getattr(cache_resource_api._resource_caches, "_function_caches", {})
+    for cache in (c for scope in list(scopes.values()) for c in list(scope.values())):
+        entries = [getattr(e, "value", e) for e in list(cache._mem_cache.values())]
+        rows.append(("st.cache_resource", cache.display_name, len(entries), deep_size(entries)))
+    return sorted(rows, key=lambda r: (r[0], r[1]))
+
+
+def sessions() -> list:
+    """(scope, session id, entries, bytes) per active browser session:
+    session state values plus the media files the session holds; empty
+    outside a server or if its internals don't look as expected."""
+    try:
+        return _sessions()
+    except (ImportError, AttributeError, RuntimeError):
+        return []
+
+
+def _sessions() -> list:
+    from streamlit.runtime import Runtime
+
+    if not Runtime.exists():
+        return []
+    runtime = Runtime.instance()
+    media = runtime.media_file_mgr
+    files = getattr(media, "_files_by_session_and_coord", {})
+    storage = getattr(getattr(media, "_storage", None), "_files_by_id", {})
+    rows = []
+    for info in runtime._session_mgr.list_active_sessions():
+        sid = info.session.id
+        state = info.session.session_state.filtered_state
+        ids = set(files.get(sid, {}).values())
+        media_bytes = sum(len(storage[i].content) for i in ids if i in storage)
+        rows.append(("session", sid, len(state) + len(ids), deep_size(state) + media_bytes))
+    return rows
+
+
+def report(with_sessions: bool = True) -> pd.DataFrame:
+    """scope, name, entries and bytes of every cache (and session)."""
+    rows = core_caches() + streamlit_caches() + (sessions() if with_sessions else [])
+    return pd.DataFrame(rows, columns=["scope", "name", "entries", "bytes"])
+
+
+def main() -> None:
+    from core import warmup
+
+    warmup.run(isolated=False)      # measure the page caches here, nothing serves after
+    table = report(with_sessions=False)
+    table["KiB"] = (table.pop("bytes") / 1024).round(1)
+    with pd.option_context("display.width", 160, "display.max_rows", 200):
+        print(table.to_string(index=False))
+        print(table.groupby("scope")["KiB"].sum().round(1).to_string())
+
+
+if __name__ == "__main__":
+    main()
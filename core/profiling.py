@@ -0,0 +1,264 @@
+# core/profiling.py
+# ───────────────────────────────────────────────────────────────
+# Opt-in per-rerun instrumentation for the pages.
+#
+# Off unless WAGE_PROFILE=1 is set for the server or the page is
+# opened with ?profile=1.  When on, every rerun records, per stage
+# (loaders, preprocessing, chart builders, sending to the browser,
+# st_folium round-trips):
+#   * wall time and call count
+#   * cache hits / misses (for stages wrapping a cache)
+#   * payload bytes (rendered images, figure JSON, map HTML …)
+#   * memory held per cache scope and by this session (core.memory)
+# shows them in a sidebar panel, and appends one JSON line per rerun
+# to .cache/profile.jsonl (or $WAGE_PROFILE_LOG).
+#
+# Summarise a log per page and stage with:
+#   python -m core.profiling [LOG]
+#
+# When profiling is off every hook is a plain pass-through.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+
+from core import store
+
+LOG_PATH = Path(os.environ.get("WAGE_PROFILE_LOG", store.CACHE_DIR / "profile.jsonl"))
+
+_current: ContextVar["Run | None"] = ContextVar("wage_profile_run", default=None)
+_log_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    if os.environ.get("WAGE_PROFILE", "") not in ("", "0"):
+        return True
+    import streamlit as st
+    try:
+        return st.query_params.get("profile") == "1"
+    except Exception:            # bare mode / no script context
+        return False
+
+
+def _size(obj) -> int:
+    """Bytes that *obj* puts on the wire (0 when unknown)."""
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, str):
+        return len(obj.encode())
+    if hasattr(obj, "to_plotly_json"):                       # plotly figure
+        return len(obj.to_json().encode())
+    if hasattr(obj, "get_root"):                             # folium element
+        return len(obj.get_root().render().encode())
+    if hasattr(obj, "memory_usage"):                         # DataFrame / Series
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if isinstance(obj, dict):
+        return len(json.dumps(obj, default=str).encode())
+    return 0
+
+
+class Run:
+    """Timings of one page rerun."""
+
+    def __init__(self, page: str):
+        self.page = page
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self.stages: dict[str, dict] = {}
+        self._open: list[dict] = []      # stack of running stages (for misses)
+
+    def _stage(self, name: str) -> dict:
+        return self.stages.setdefault(
+            name, {"calls": 0, "seconds": 0.0, "hits": 0, "misses": 0, "bytes": 0})
+
+    @contextlib.contextmanager
+    def stage(self, name: str, cached: bool = False):
+        rec = self._stage(name)
+        frame = {"miss": False}
+        self._open.append(frame)
+        t0 = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            rec["seconds"] += time.perf_counter() - t0
+            rec["calls"] += 1
+            self._open.pop()
+            if cached:
+                rec["misses" if frame["miss"] else "hits"] += 1
+
+    def mark_miss(self) -> None:
+        if self._open:
+            self._open[-1]["miss"] = True
+
+    def payload(self, name: str, obj) -> None:
+        self._stage(name)["bytes"] += _size(obj)
+
+    def record(self) -> dict:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return {
+            "ts": round(self.started, 3),
+            "page": self.page,
+            "session": ctx.session_id if ctx else None,
+            "total_s": round(time.perf_counter() - self._t0, 6),
+            "stages": {k: {**v, "seconds": round(v["seconds"], 6)}
+                       for k, v in self.stages.items()},
+        }
+
+
+# -------------------------------------------------------
+# Hooks used by the pages (no-ops unless a Run is active)
+# -------------------------------------------------------
+def start(page: str) -> Run | None:
+    """Begin recording this rerun of *page* (if profiling is on)."""
+    run = Run(page) if enabled() else None
+    _current.set(run)
+    return run
+
+
+def stage(name: str, cached: bool = False):
+    run = _current.get()
+    return run.stage(name, cached) if run else contextlib.nullcontext()
+
+
+def payload(name: str, obj) -> None:
+    run = _current.get()
+    if run:
+        run.payload(name, obj)
+
+
+def mark_miss() -> None:
+    """Called from inside a cache on a miss (see `cached`, core.figures)."""
+    run = _current.get()
+    if run:
+        run.mark_miss()
+
+
+def timed(name: str, cached: bool = False):
+    """Decorator: record each call as stage *name*; bytes/str results
+    count as payload.  ``cached=True`` for functions behind a cache that
+    reports misses via `mark_miss` (e.g. core.figures.cached_figure)."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            run = _current.get()
+            if run is None:
+                return fn(*args, **kwargs)
+            with run.stage(name, cached):
+                result = fn(*args, **kwargs)
+            if isinstance(result, (bytes, str)):
+                run.payload(name, result)
+            return result
+        return wrapper
+    return decorator
+
+
+def cached(name: str, cache):
+    """``@cached("load", st.cache_data)`` — *cache* applied to the
+    function, with the call timed as stage *name* and a miss recorded
+    whenever the body actually runs."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            mark_miss()
+            return fn(*args, **kwargs)
+        return timed(name, cached=True)(cache(body))
+    return decorator
+
+
+def finish() -> dict | None:
+    """End the rerun: sidebar panel + one JSON line in the log."""
+    run = _current.get()
+    if run is None:
+        return None
+    _current.set(None)
+    rec = run.record()
+    rec["memory"] = _memory(rec["session"])
+    try:
+        with _log_lock:
+            LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(LOG_PATH, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(rec) + "\n")
+    except OSError:
+        pass
+    _panel(rec)
+    return rec
+
+
+def _memory(session: str | None) -> dict:
+    """Bytes per cache scope, across all sessions, and this session's."""
+    from core import memory
+    try:
+        table = memory.report()
+    except Exception:            # Streamlit internals moved: skip the accounting
+        return {}
+    per_scope = table.groupby("scope")["bytes"].sum()
+    sessions = table[table["scope"] == "session"]
+    return {
+        **{k: int(v) for k, v in per_scope.items()},
+        "sessions_open": len(sessions),
+        "this_session": int(sessions.loc[sessions["name"] == session, "bytes"].sum()),
+    }
+
+
+def _panel(rec: dict) -> None:
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander("Profiling", expanded=True):
+        st.caption(f"{rec['page']} • {rec['total_s'] * 1e3:.0f} ms this rerun • log: {LOG_PATH}")
+        if rec["stages"]:
+            table = pd.DataFrame.from_dict(rec["stages"], orient="index")
+            table["ms"] = table.pop("seconds") * 1e3
+            table["KB"] = table.pop("bytes") / 1024
+            st.dataframe(table[["calls", "ms", "hits", "misses", "KB"]].round(1))
+        mem = dict(rec.get("memory") or {})
+        if mem:
+            mine, open_ = mem.pop("this_session"), mem.pop("sessions_open")
+            st.caption(f"memory: this session {mine / 1024:.0f} KB of "
+                       f"{mem.pop('session', 0) / 1024:.0f} KB for {open_} sessions • "
+                       + " • ".join(f"{k} {v / 1024:.0f} KB" for k, v in mem.items()))
+
+
+# -------------------------------------------------------
+# Log summary
+# -------------------------------------------------------
+def summarise(path: str | Path = LOG_PATH):
+    """Per page and stage: reruns, p50 / p95 ms, cache hit rate, mean KB."""
+    import pandas as pd
+
+    rows = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            rec = json.loads(line)
+            rows.append({"page": rec["page"], "stage": "(total)", "seconds": rec["total_s"],
+                         "hits": 0, "misses": 0, "bytes": 0})
+            for name, s in rec["stages"].items():
+                rows.append({"page": rec["page"], "stage": name, **s})
+    df = pd.DataFrame(rows)
+    g = df.groupby(["page", "stage"])
+    out = pd.DataFrame({
+        "n": g.size(),
+        "p50_ms": g["seconds"].median() * 1e3,
+        "p95_ms": g["seconds"].quantile(0.95) * 1e3,
+        "hit_rate": g["hits"].sum() / (g["hits"].sum() + g["misses"].sum()),
+        "mean_KB": g["bytes"].mean() / 1024,
+    })
+    return out.sort_values("p95_ms", ascending=False)
+
+
+if __name__ == "__main__":
+    import sys
+
+    import pandas as pd
+
+    with pd.option_context("display.width", 160, "display.max_rows", 200):
+        print(summarise(sys.argv[1] if len(sys.argv) > 1 else LOG_PATH).round(2))
@@ -0,0 +1,232 @@
+# core/refresh.py
+# ───────────────────────────────────────────────────────────────
+# Incremental refresh when a source file is replaced in place (a new
+# ILO Global Wage Report, OECD MIN2AVE extract or WDI drop).
+#
+# `check` finds the sources whose content changed since they were read
+# (core.store.stale: a stat() per file, a hash only if it moved),
+# re-reads just those and diffs old vs new tables by country-year.
+# Only the changed cells are then applied to the cubes
+# (WageCube.patched: growth rates and subregion / income-group means
+# for the affected rows and years), and only the revision counters of
+# the touched metrics move.  Page-level caches take the counters of the
+# metrics they read as an argument (`revision`), so every other cached
+# view, and every chart whose inputs did not change (core.figures
+# keys on data content), stays warm.
+#
+# New or vanished countries in the ILO real-wage sheet, a changed
+# Region / Subregion / Income group, or a different set of year
+# columns change the cube's shape: the affected cubes are then dropped
+# and rebuilt on next use.
+#
+# Report what changed against the on-disk snapshot (and pre-build the
+# Arrow cache for the new files, so running servers only read them
+# back) with:
+#   python -m core.refresh
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import Counter
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from core import cube as wage_cube
+from core import data, store
+from core.countries import ISO3
+from core.cube import COUNTRY, DIMENSIONS, METRICS, RATES
+
+# Seconds between file checks triggered by `revision` / `poll`.
+POLL_SECONDS = float(os.environ.get("WAGE_REFRESH_POLL", 5))
+
+# Re-saving a workbook can move values by an ulp or so; that is not a
+# revision.
+REL_TOL = 1e-12
+
+# source group → (table, cube metric, id columns that fix the cube's shape)
+TABLES = {
+    "ilo": (("real", "real_growth", (COUNTRY, *DIMENSIONS)),
+            ("nominal", "nominal_wage", ())),
+    "oecd": ((None, "min_to_avg", ()),),
+    "wb": ((None, "gdp", ()),),
+}
+
+_lock = threading.Lock()
+_revisions: Counter = Counter()
+_last_poll = 0.0
+
+
+class Changes(NamedTuple):
+    """Differences between two versions of one source table."""
+    metric: str
+    cells: pd.DataFrame     # iso3, year, old, new — one row per changed country-year
+    added: list             # iso3 codes with a new row
+    removed: list           # iso3 codes whose row disappeared
+    structural: bool        # cube rows / dimensions / year axis changed
+
+    @property
+    def empty(self) -> bool:
+        return not self.structural and self.cells.empty and not self.added and not self.removed
+
+    def patch(self) -> wage_cube.Patch:
+        present = {**dict.fromkeys(self.added, True), **dict.fromkeys(self.removed, False)}
+        return wage_cube.Patch(self.cells.rename(columns={"new": "value"}), present)
+
+
+def _year_cols(df: pd.DataFrame) -> list:
+    return [c for c in df.columns if str(c).isdigit()]
+
+
+def diff(metric: str, old: pd.DataFrame, new: pd.DataFrame, dims=()) -> Changes:
+    """Country-year differences between *old* and *new* (both keyed on
+    ``iso3``; rows without a code are ignored).  NaN equals NaN, and
+    values within REL_TOL of each other are equal.
+
+    With *dims*, the table defines the cube's rows: added / removed
+    countries or changed *dims* columns make the change structural.
+    """
+    old = old[old[ISO3].notna()].set_index(ISO3)
+    new = new[new[ISO3].notna()].set_index(ISO3)
+    old_years, new_years = _year_cols(old), _year_cols(new)
+    years = [c for c in new_years if c in set(old_years)]
+    structural = [str(c) for c in old_years] != [str(c) for c in new_years]
+
+    # every country present on either side, NaN where a side lacks it
+    codes = old.index.union(new.index)
+    a = old[years].reindex(codes).to_numpy(np.float64)
+    b = new[years].reindex(codes).to_numpy(np.float64)
+    rows, cols = np.nonzero(~np.isclose(a, b, rtol=REL_TOL, atol=0.0, equal_nan=True))
+    cells = pd.DataFrame({
+        ISO3: codes[rows],
+        "year": np.array([int(years[c]) for c in cols], dtype=np.int64),
+        "old": a[rows, cols],
+        "new": b[rows, cols],
+    })
+    added = list(new.index.difference(old.index))
+    removed = list(old.index.difference(new.index))
+
+    if dims:
+        common = old.index.intersection(new.index)
+        labels = [t.loc[common, list(dims)].astype(str).fillna("").to_numpy() for t in (old, new)]
+        structural |= bool(added or removed) or not np.array_equal(*labels)
+    return Changes(metric, cells, added, removed, structural)
+
+
+def _table(tables, name):
+    return tables if name is None else getattr(tables, name)
+
+
+def changes(group: str, old, new) -> list:
+    """Non-empty `Changes` per table of *group* between two versions."""
+    found = [diff(metric, _table(old, name), _table(new, name), dims)
+             for name, metric, dims in TABLES[group]]
+    return [c for c in found if not c.empty]
+
+
+def _feeds(group: str, path: str, workbook: str) -> bool:
+    # ILO tables belong to the cube of that workbook; the CSVs feed
+    # every cube, but only from their default location.
+    if group == "ilo":
+        return path == workbook
+    return path == str(data.DEFAULTS[group].resolve())
+
+
+def _apply(group: str, path: str, found: list) -> None:
+    if any(c.structural for c in found):
+        wage_cube.update(lambda p, c: None if _feeds(group, path, p) else c)
+        _revisions.update(METRICS)
+        return
+    patches = {c.metric: c.patch() for c in found}
+    wage_cube.update(lambda p, c: c.patched(patches) if _feeds(group, path, p) else c)
+    for metric in patches:
+        _revisions[metric] += 1
+        if metric in RATES:
+            _revisions[RATES[metric]] += 1
+
+
+def check() -> dict:
+    """Refresh every loaded source whose file changed; returns
+    ``{(group, path): [Changes, …]}`` for the ones that did."""
+    with _lock:
+        return _check()
+
+
+def _check() -> dict:
+    report = {}
+    for group, path in data.loaded():
+        if not store.stale(group, path):
+            continue
+        old, new = data.reload(group, path)
+        if old is None:                  # reloaded concurrently: nothing to diff against
+            found = [Changes(m, pd.DataFrame(), [], [], True) for _, m, _ in TABLES[group]]
+        else:
+            found = changes(group, old, new)
+        if found:
+            _apply(group, path, found)
+        report[group, path] = found
+    return report
+
+
+def poll() -> dict:
+    """`check`, at most every POLL_SECONDS and never blocking: while
+    another session refreshes, callers keep the current data."""
+    global _last_poll
+    now = time.monotonic()
+    if now - _last_poll < POLL_SECONDS or not _lock.acquire(blocking=False):
+        return {}
+    try:
+        _last_poll = now
+        return _check()
+    finally:
+        _lock.release()
+
+
+def revision(*metrics: str) -> tuple:
+    """Cache token for views built from *metrics*: pass it as an
+    argument of the page's cached loader so the entry is replaced only
+    when one of those metrics was revised.  Polls for new files."""
+    poll()
+    return tuple(_revisions[m] for m in metrics)
+
+
+# -------------------------------------------------------
+# Command line: diff the bundled sources against the cache
+# -------------------------------------------------------
+def _summary(found: list) -> str:
+    if not found:
+        return "unchanged"
+    parts = []
+    for c in found:
+        text = f"{c.metric}: {len(c.cells)} country-years"
+        if c.added or c.removed:
+            text += f", +{len(c.added)} / -{len(c.removed)} countries"
+        if c.structural:
+            text += " (structural: cubes rebuilt)"
+        parts.append(text)
+    return "; ".join(parts)
+
+
+def main() -> None:
+    # Grab every snapshot first: loading a changed source prunes its
+    # old cache entry (and the OECD keys need the ILO / WB tables).
+    previous = {group: store.latest(group) for group in data.DEFAULTS}
+    for group, path in data.DEFAULTS.items():
+        if previous[group] is None:
+            print(f"{group:<5} no cached snapshot; building one")
+            data.reload(group, path)
+            continue
+        old = data.keyed_tables(group, previous[group])
+        _, new = data.reload(group, path)
+        found = changes(group, old, new)
+        print(f"{group:<5} {_summary(found)}")
+        for c in found:
+            if len(c.cells):
+                print(c.cells.head(20).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+# core/shared.py
+# ───────────────────────────────────────────────────────────────
+# Memory-mapped segments shared by every server process on a host.
+#
+# Behind a load balancer each Streamlit process would otherwise build
+# its own wage cube and border geometry.  Instead the first process
+# that needs one publishes it as a *segment*, a directory of .npy
+# arrays, small Arrow frames (core.store's format) and a JSON header,
+#   <WAGE_SHARED_DIR>/<kind>-<content key>/
+# and every process memory-maps the arrays read-only, so the OS keeps
+# one physical copy however many workers attach.  Nothing is pickled,
+# so attaching never runs code from the shared dir.  Keys hash the
+# inputs, so a new data release gets a new segment; older ones are
+# pruned (processes still mapping them keep working).
+#
+#   cube       data[metric, country, year], present[metric, country]
+#              and each category rollup's values are mapped; the
+#              dimension table is an Arrow frame, country codes, years
+#              and rollup labels are in the header.
+#   geometry   per level of detail, the polygons' coordinates and part
+#              offsets (shapely's ragged layout) are mapped.  GEOS
+#              objects can't live in shared memory, so each process
+#              builds its geometries from them: no GeoJSON parse, but
+#              a private copy.  The properties are an Arrow frame.
+#
+# On by default when pyarrow is installed; WAGE_SHARED=0 turns it off,
+# WAGE_SHARED_DIR moves it (default .cache/shared; a /dev/shm path
+# keeps it off disk).  A refresh (core.refresh) patches a private copy
+# of the cube in each process; the next start maps the new release's
+# segment.
+#
+# Publish ahead of the workers (e.g. in the deploy step) with:
+#   python -m core.shared
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from core import data, store
+
+ENABLED = os.environ.get("WAGE_SHARED", "1") not in ("", "0") and store.pa is not None
+SHARED_DIR = Path(os.environ.get("WAGE_SHARED_DIR", store.CACHE_DIR / "shared"))
+FORMAT = 2               # bump when a segment's layout (or the cube build) changes
+HEADER = "header.json"
+
+_attached: dict[str, int] = {}       # segment name → mapped bytes, in this process
+
+
+def content_key(*parts) -> str:
+    return hashlib.sha256(repr((FORMAT, *parts)).encode()).hexdigest()[:16]
+
+
+def is_mapped(a: np.ndarray) -> bool:
+    """True if *a* is a view of a memory-mapped file."""
+    while a is not None and not isinstance(a, mmap.mmap):
+        a = getattr(a, "base", None)
+    return a is not None
+
+
+# -------------------------------------------------------
+# Segments
+# -------------------------------------------------------
+class Segment(NamedTuple):
+    arrays: dict             # name → ndarray (.npy)
+    frames: dict             # name → DataFrame (.arrow)
+    header: dict             # JSON-able scalars and lists
+
+
+def publish(kind: str, key: str, segment: Segment) -> None:
+    """Write a segment unless it exists (first writer wins)."""
+    target = SHARED_DIR / f"{kind}-{key}"
+    if target.is_dir():
+        return
+    try:
+        SHARED_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=SHARED_DIR, prefix=f".{kind}-"))
+        tmp.chmod(0o755)
+        for name, a in segment.arrays.items():
+            np.save(tmp / f"{name}.npy", np.ascontiguousarray(a), allow_pickle=False)
+        for name, df in segment.frames.items():
+            store._write(df, tmp / f"{name}.arrow")
+        (tmp / HEADER).write_text(json.dumps(segment.header))
+        try:
+            os.replace(tmp, target)
+        except OSError:      # another process published it first
+            shutil.rmtree(tmp, ignore_errors=True)
+        _prune(kind, keep=target)
+    except OSError:          # read-only checkout: the caller keeps its own copy
+        pass
+
+
+def attach(kind: str, key: str) -> Segment | None:
+    """A published segment, its arrays mapped read-only; None if it
+    isn't there."""
+    target = SHARED_DIR / f"{kind}-{key}"
+    try:
+        header = json.loads((target / HEADER).read_text())
+        arrays = {p.stem: np.asarray(np.load(p, mmap_mode="r", allow_pickle=False))
+                  for p in sorted(target.glob("*.npy"))}
+        frames = {p.stem: store._read(p) for p in sorted(target.glob("*.arrow"))}
+    except (OSError, ValueError, store.pa.ArrowException):
+        return None
+    _attached[target.name] = sum(a.nbytes for a in arrays.values())
+    return Segment(arrays, frames, header)
+
+
+def _get(kind: str, key: str, make: Callable[[], Segment]) -> Segment:
+    hit = attach(kind, key)
+    if hit is None:
+        made = make()
+        publish(kind, key, made)
+        hit = attach(kind, key) or made
+    return hit
+
+
+def _prune(kind: str, keep: Path) -> None:
+    for old in SHARED_DIR.glob(f"{kind}-*"):
+        if old != keep and old.is_dir():
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def segments() -> list:
+    """(segment name, mapped bytes) of every segment this process attached."""
+    return sorted(_attached.items())
+
+
+# -------------------------------------------------------
+# Wage cube
+# -------------------------------------------------------
+def cube_segment(cube) -> Segment:
+    keys = list(cube._rollups)
+    arrays = {"data": cube.data, "present": cube.present,
+              **{f"rollup{i}": cube._rollups[k].to_numpy() for i, k in enumerate(keys)}}
+    rollups = [{"key": list(k), "index": list(cube._rollups[k].index),
+                "columns": [int(y) for y in cube._rollups[k].columns]} for k in keys]
+    header = {"index": {"name": cube.dims.index.name, "codes": list(cube.dims.index)},
+              "years": [int(y) for y in cube.years], "metrics": list(cube.metrics),
+              "rollups": rollups}
+    return Segment(arrays, {"dims": cube.dims.reset_index(drop=True)}, header)
+
+
+def cube_from(segment: Segment):
+    from core.cube import WageCube
+
+    arrays, header = segment.arrays, segment.header
+    dims = segment.frames["dims"]
+    dims.index = pd.Index(header["index"]["codes"], dtype=object, name=header["index"]["name"])
+    rollups = {}
+    for i, r in enumerate(header["rollups"]):
+        metric, dim, region = r["key"]
+        labels = pd.Index(r["index"], dtype=dims[dim].cat.categories.dtype, name=dim)
+        rollups[metric, dim, region] = pd.DataFrame(arrays[f"rollup{i}"], index=labels,
+                                                    columns=r["columns"], copy=False)
+    return WageCube.from_arrays(dims, header["years"], tuple(header["metrics"]),
+                                arrays["data"], arrays["present"], rollups)
+
+
+def cube(build: Callable[[], object]):
+    """The cube of the bundled sources as loaded by core.data: mapped if
+    a process published it, else ``build()`` and published."""
+    snaps = [store.snapshot(g, p.resolve()) for g, p in sorted(data.DEFAULTS.items())]
+    if not ENABLED or None in snaps:
+        return build()
+    key = content_key(*(s.digest for s in snaps), data.PARSER_VERSION)
+    return cube_from(_get("cube", key, lambda: cube_segment(build())))
+
+
+# -------------------------------------------------------
+# Geometry
+# -------------------------------------------------------
+def _geometry_segment(gdf) -> Segment:
+    import shapely
+
+    geoms = gdf.geometry.to_numpy()
+    kind, coords, offsets = shapely.to_ragged_array(geoms)
+    arrays = {"coords": coords, **{f"offsets{i}": o for i, o in enumerate(offsets)},
+              # the ragged layout promotes Polygons to MultiPolygons; undo on attach
+              "single": shapely.get_type_id(geoms) != int(kind)}
+    props = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+    return Segment(arrays, {"props": props},
+                   {"type": int(kind), "crs": gdf.crs and gdf.crs.to_string(),
+                    "name": gdf.geometry.name, "offsets": len(offsets)})
+
+
+def _geometry_from(segment: Segment):
+    import geopandas as gpd
+    import shapely
+
+    arrays, header = segment.arrays, segment.header
+    offsets = tuple(arrays[f"offsets{i}"] for i in range(header["offsets"]))
+    geoms = shapely.from_ragged_array(shapely.GeometryType(header["type"]),
+                                      arrays["coords"], offsets)
+    single = arrays["single"]
+    geoms[single] = shapely.get_geometry(geoms[single], 0)
+    out = gpd.GeoDataFrame(segment.frames["props"], geometry=geoms, crs=header["crs"])
+    return out.rename_geometry(header["name"]) if header["name"] != "geometry" else out
+
+
+def geometry(path: Path, codes, read: Callable[[], object]):
+    """The GeoDataFrame ``read()`` returns for the GeoJSON at *path*
+    restricted to *codes*, built from a mapped segment when one exists."""
+    if not ENABLED:
+        return read()
+    key = content_key(store.file_digest(path), sorted(codes))
+    return _geometry_from(_get(f"geometry-{path.stem}", key, lambda: _geometry_segment(read())))
+
+
+if __name__ == "__main__":
+    from core import cube as wage_cube
+    from core import geo, shared     # the module those use, not this __main__ copy
+
+    wage_cube.get_cube()
+    for lod in geo.LODS:
+        geo.load_geometry(lod)
+    for name, nbytes in shared.segments():
+        print(f"{name:<40} {nbytes / 1024:>9.1f} KiB")
+    print(f"shared: {shared.SHARED_DIR}")
@@ -0,0 +1,174 @@
+# core/store.py
+# ───────────────────────────────────────────────────────────────
+# On-disk columnar cache for the raw sources.
+#
+# Each source file is hashed; its parsed tables are written once as
+# uncompressed Arrow IPC (Feather v2) files under
+# .cache/<group>-<digest>[-v<parser version>]/<table>.arrow and read
+# back on later starts: one sequential read and a column conversion
+# instead of openpyxl or a CSV parse.  A changed source (or parser)
+# gets a new directory, so the stale one is simply never read again
+# (and is pruned on the next build).
+#
+# Every load() records the content hash and stat of the file it read,
+# so `stale` can tell cheaply whether a source was replaced since
+# (used by core.refresh).
+#
+# Build everything ahead of time with:   python -m core.store
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+except ImportError:          # no pyarrow → parse the sources every time
+    pa = None
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = Path(os.environ.get("WAGE_CACHE_DIR", ROOT / ".cache"))
+
+Tables = Dict[str, pd.DataFrame]
+
+
+class Snapshot(NamedTuple):
+    """What load() last read from a source file."""
+    digest: str
+    mtime_ns: int
+    size: int
+
+
+_snapshots: dict[tuple[str, str], Snapshot] = {}
+
+
+def file_digest(path: str | Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+# -------------------------------------------------------
+# Arrow (de)serialisation
+# -------------------------------------------------------
+def _write(df: pd.DataFrame, path: Path) -> None:
+    # Arrow wants string column names; remember which ones were ints
+    # (the ILO year columns) so the round-trip is lossless.
+    int_cols = [c for c in df.columns if isinstance(c, int)]
+    table = pa.Table.from_pandas(df.rename(columns=str), preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta[b"int_columns"] = json.dumps(int_cols).encode()
+    feather.write_feather(table.replace_schema_metadata(meta), path,
+                          compression="uncompressed")
+
+
+def _read(path: Path) -> pd.DataFrame:
+    # to_pandas() copies every column anyway (nulls back to NaN,
+    # dictionaries to categoricals), so the file is read, not mapped.
+    table = feather.read_table(path, memory_map=False)
+    int_cols = json.loads((table.schema.metadata or {}).get(b"int_columns", b"[]"))
+    df = table.to_pandas()
+    return df.rename(columns={str(c): c for c in int_cols})
+
+
+# -------------------------------------------------------
+# Public API
+# -------------------------------------------------------
+def load(group: str, source: str | Path,
+         build: Callable[[Path], Tables], version: int | str = 0) -> Tables:
+    """Return the tables parsed from *source*, via the on-disk cache.
+
+    *build* parses the raw file and is only called when no cache entry
+    exists for the file's current content hash and parser *version*
+    (anything else *build* depends on goes into *version* as well).
+    """
+    source = Path(source)
+    stat = source.stat()                 # before hashing: a write mid-hash shows up as stale
+    digest = file_digest(source)
+    _snapshots[group, str(source)] = Snapshot(digest, stat.st_mtime_ns, stat.st_size)
+    if pa is None:
+        return build(source)
+
+    if version:
+        digest = f"{digest}-v{version}"
+    target = CACHE_DIR / f"{group}-{digest}"
+    if target.is_dir():
+        return {p.stem: _read(p) for p in sorted(target.glob("*.arrow"))}
+
+    tables = build(source)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=CACHE_DIR, prefix=f".{group}-"))
+        tmp.chmod(0o755)
+        for name, df in tables.items():
+            _write(df, tmp / f"{name}.arrow")
+        try:
+            os.replace(tmp, target)
+        except OSError:      # another process published it first
+            shutil.rmtree(tmp, ignore_errors=True)
+        _prune(group, keep=target)
+    except OSError:          # read-only checkout: serve the parsed frames
+        pass
+    return tables
+
+
+def stale(group: str, source: str | Path) -> bool:
+    """True when *source* no longer holds the content load() last read
+    from it.  Costs a stat() unless the file's mtime or size moved."""
+    key = (group, str(Path(source)))
+    snap = _snapshots.get(key)
+    if snap is None:
+        return False
+    try:
+        stat = os.stat(key[1])
+    except OSError:          # mid-replace or removed: keep serving what we have
+        return False
+    if (stat.st_mtime_ns, stat.st_size) == (snap.mtime_ns, snap.size):
+        return False
+    digest = file_digest(key[1])
+    if digest == snap.digest:            # touched, not changed
+        _snapshots[key] = Snapshot(digest, stat.st_mtime_ns, stat.st_size)
+        return False
+    return True
+
+
+def snapshot(group: str, source: str | Path) -> Snapshot | None:
+    """What load() last read from *source* in this process (None if
+    it never read it)."""
+    return _snapshots.get((group, str(Path(source))))
+
+
+def latest(group: str) -> Tables | None:
+    """Tables of the newest cache entry for *group*, whatever source
+    content it came from (the previous snapshot, before a rebuild)."""
+    if pa is None:
+        return None
+    dirs = [d for d in CACHE_DIR.glob(f"{group}-*") if d.is_dir()]
+    if not dirs:
+        return None
+    newest = max(dirs, key=lambda d: d.stat().st_mtime)
+    return {p.stem: _read(p) for p in sorted(newest.glob("*.arrow"))}
+
+
+def _prune(group: str, keep: Path) -> None:
+    for old in CACHE_DIR.glob(f"{group}-*"):
+        if old != keep and old.is_dir():
+            shutil.rmtree(old, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    from core import data
+
+    for name, df in data.build_disk_cache().items():
+        print(f"{name:<20} {df.shape[0]:>5} rows × {df.shape[1]:>3} cols")
+    print(f"cache: {CACHE_DIR}")
@@ -0,0 +1,205 @@
+# core/transforms.py
+# ───────────────────────────────────────────────────────────────
+# Pure data transforms behind the pages: no Streamlit calls, so the
+# same code runs in the app, the benchmarks and batch jobs.
+# Inputs (the shared cube / source frames) are never mutated.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from core import correlation, countries, memory
+from core.countries import ISO3
+from core.cube import COUNTRY, WageCube
+from core.data import EUROPE, YEARS
+
+SUBREGION = "Subregion - detailed"
+INCOME = "Income group"
+
+
+# -------------------------------------------------------
+# Page 1 – evolution of minimum wages
+# -------------------------------------------------------
+def evolution_summary(cube: WageCube) -> dict:
+    # Europe & Central Asia sub-region / income-group means are
+    # precomputed cube rollups; only the year windows are chosen here.
+    real_years = list(YEARS)
+    nom_years  = list(YEARS)
+
+    # ---- 1) Nominal growth by sub-region
+    nom_sub_avg = cube.rollup("nominal_growth", SUBREGION, EUROPE, nom_years[1:]).sort_index()
+
+    # ---- 2) Real growth by sub-region
+    real_sub_avg = cube.rollup("real_growth", SUBREGION, EUROPE, real_years)
+
+    # ---- 3) Nominal vs real by income group
+    nom_income_avg  = cube.rollup("nominal_growth", INCOME, EUROPE, nom_years[1:]) \
+                          .mean(axis=1)                 # 2018-23 average
+    real_income_avg = cube.rollup("real_growth", INCOME, EUROPE, real_years) \
+                          .mean(axis=1)
+
+    return {
+        "nom_sub_avg":   nom_sub_avg,
+        "real_sub_avg":  real_sub_avg,
+        "nom_income":    nom_income_avg,
+        "real_income":   real_income_avg,
+        "nom_years":     nom_years,
+        "real_years":    real_years,
+    }
+
+
+# -------------------------------------------------------
+# Page 2 – minimum vs. actual wage levels
+# -------------------------------------------------------
+class RatioBase(NamedTuple):
+    """Mean min-to-average ratio, built once and shared read-only."""
+    wide: pd.DataFrame   # index: country as spelled by the OECD; iso3 + one str column per year
+    long: pd.DataFrame   # iso3, country, year, ratio
+
+
+def ratio_base(min_df: pd.DataFrame, years=YEARS) -> RatioBase:
+    cols = [str(y) for y in years]
+    wide = (min_df.query("`Time period.1` == 'Mean'")
+                  .set_index("country")[[ISO3, *cols]])
+    long = (wide.reset_index()
+                .melt(id_vars=[ISO3, "country"], value_vars=cols,
+                      var_name="year", value_name="ratio"))
+    return RatioBase(wide, long)
+
+
+def ratio_by_code(wide: pd.DataFrame) -> pd.DataFrame:
+    """View of `RatioBase.wide` for the map: coded countries only, ISO-3
+    index, a clean ``country`` label and the year columns."""
+    coded = wide[wide[ISO3].notna()]
+    out = coded.set_index(ISO3)
+    out.insert(0, "country", coded.index.map(countries.display).to_numpy())
+    return out
+
+
+SLOPE_SORTS = ("Alphabetical", "2017 ratio", "2023 ratio", "Change (Δ)")
+
+
+def ratio_change(wide: pd.DataFrame) -> pd.DataFrame:
+    """2017 and 2023 ratios plus their difference ``Δ`` (complete rows)."""
+    df = wide[["2017", "2023"]].dropna()
+    df["Δ"] = df["2023"] - df["2017"]
+    return df
+
+
+def slope_view(change: pd.DataFrame, sort_by: str, top_n: int) -> pd.DataFrame:
+    if sort_by == "Alphabetical":
+        df_plot = change.sort_index()
+    elif sort_by == "2017 ratio":
+        df_plot = change.sort_values("2017", ascending=False)
+    elif sort_by == "2023 ratio":
+        df_plot = change.sort_values("2023", ascending=False)
+    else:  # Change
+        df_plot = change.sort_values("Δ", ascending=False)
+    return df_plot.head(top_n)
+
+
+def trajectory_view(wide: pd.DataFrame, selected) -> pd.DataFrame:
+    """Rows → years (int), columns → the *selected* countries."""
+    df_plot = wide.loc[list(selected), [c for c in wide.columns if c.isdigit()]].transpose()
+    df_plot.index = df_plot.index.astype(int)   # nicer x-axis ticks
+    return df_plot
+
+
+# -------------------------------------------------------
+# Page 3 – economic growth connection
+# -------------------------------------------------------
+def gdp_vs_real_wage(cube: WageCube) -> pd.DataFrame:
+    # Average real-wage and GDP growth per European country; only
+    # countries the World Bank file covers are kept.
+    data = pd.concat(
+        {
+            "real_wage_growth_avg": cube.frame("real_growth", YEARS, region=EUROPE).mean(axis=1),
+            "gdp_growth_avg": cube.frame("gdp_growth", YEARS, region=EUROPE).mean(axis=1),
+        },
+        axis=1, join="inner",
+    ).dropna(subset=["real_wage_growth_avg", "gdp_growth_avg"])
+
+    data.insert(0, COUNTRY, cube.dims.loc[data.index, COUNTRY])
+    return data.reset_index().sort_values(COUNTRY)
+
+
+ALL_COUNTRIES = "All countries"
+WINDOWS = range(1, len(YEARS) + 1)       # rolling window widths (years)
+LAGS = range(0, 4)                       # GDP leading wages by … years
+
+
+def gdp_wage_correlations(cube: WageCube, widths=WINDOWS, lags=LAGS,
+                          n_boot: int = correlation.N_BOOT) -> pd.DataFrame:
+    """GDP-growth vs real-wage-growth correlations across European
+    countries, for every window width / lag / window end over the
+    cube's years, for all countries and per sub-region, with bootstrap
+    intervals (see core.correlation).  Statistics are float32: they are
+    shown to two decimals."""
+    rows = cube.rows(region=EUROPE)
+    codes = cube.dims[SUBREGION].to_numpy()[rows]
+    groups = {ALL_COUNTRIES: np.arange(len(rows))}
+    groups.update({sub: np.flatnonzero(codes == sub)
+                   for sub in sorted(pd.unique(codes[pd.notna(codes)]))})
+    return memory.compact(correlation.grid(
+        cube.values("gdp_growth", rows=rows), cube.values("real_growth", rows=rows),
+        cube.years, groups, widths, lags, n_boot=n_boot,
+    ), floats=True)
+
+
+class RealWageSeries:
+    """Query layer behind page 3's line chart: European real-wage
+    growth pre-pivoted to a country × year array, with row positions
+    per sub-region and per country, so a widget selection is an index
+    lookup rather than a filter over a long frame."""
+
+    def __init__(self, cube: WageCube, years=YEARS):
+        rows = cube.rows(region=EUROPE)
+        values = cube.values("real_growth", years, rows)
+        has_data = ~np.isnan(values).all(axis=1)
+        order = np.argsort(cube.dims[COUNTRY].to_numpy()[rows][has_data], kind="stable")
+        rows = rows[has_data][order]                   # alphabetical, with data only
+
+        self.years = list(years)
+        self.values = values[has_data][order]
+        self.names = cube.dims[COUNTRY].to_numpy()[rows]
+        subs = cube.dims[SUBREGION].to_numpy()[rows]
+        self.subregions = sorted(pd.unique(subs[pd.notna(subs)]))
+        self._by_subregion = {sub: np.flatnonzero(subs == sub) for sub in self.subregions}
+        self._by_name = {name: i for i, name in enumerate(self.names)}
+
+    def countries(self, subregions) -> list:
+        """Country names in *subregions*, alphabetical."""
+        return list(self.names[self._positions(subregions)])
+
+    def _positions(self, subregions) -> np.ndarray:
+        hit = [self._by_subregion[s] for s in subregions if s in self._by_subregion]
+        return np.sort(np.concatenate(hit)) if hit else np.array([], np.intp)
+
+    def select(self, countries) -> pd.DataFrame:
+        """Year × country table for *countries* (unknown names skipped)."""
+        pos = [self._by_name[c] for c in countries if c in self._by_name]
+        return pd.DataFrame(self.values[pos].T,
+                            index=pd.Index(self.years, name="Year"),
+                            columns=pd.Index(self.names[pos], name=COUNTRY))
+
+
+# -------------------------------------------------------
+# Page 4 – geographical disparities
+# -------------------------------------------------------
+def avg_annual_growth(cube: WageCube) -> pd.DataFrame:
+    df = cube.frame("real_growth", YEARS).dropna(subset=[YEARS[0], YEARS[-1]])
+    df.insert(0, COUNTRY, cube.dims.loc[df.index, COUNTRY])
+    df = df.reset_index()
+    df["Total_Growth_Rate"] = ((df[YEARS[-1]] - df[YEARS[0]]) / df[YEARS[0]]) * 100
+    df["Avg_Annual_Growth_Rate"] = df["Total_Growth_Rate"] / (len(YEARS) - 1)
+    return df
+
+
+def yearly_real_growth(cube: WageCube, years=YEARS) -> pd.DataFrame:
+    """Real-wage growth per country and year (iso3, country_name, years)."""
+    df = cube.frame("real_growth", years)
+    df.insert(0, COUNTRY, cube.dims.loc[df.index, COUNTRY])
+    return df.reset_index()
@@ -0,0 +1,125 @@
+# core/views.py
+# ───────────────────────────────────────────────────────────────
+# The derived results the pages render from, built once per process
+# and revision and shared read-only by every session.
+#
+# Each builder takes the core.refresh revision of the metrics it reads
+# (METRICS) as its only data key, plus the level of detail for the map
+# builders, so a revised sheet gets new entries and the old ones age
+# out of the small LRU.  Pages call them from their st.cache_resource
+# loaders; core.warmup calls `build` before the server takes traffic,
+# so the first visit of a page finds the correlation grid, the map
+# GeoJSON and the rest already built.  Charts (core.figures) are not
+# built here: they depend on widget values and are drawn on first use.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+from functools import lru_cache
+
+from core import correlation, geo, maps, refresh, transforms
+from core import cube as wage_cube
+from core import data
+from core.data import YEARS
+
+# view group → metrics whose revision keys it (core.refresh.revision)
+METRICS = {
+    "ratio": ("min_to_avg",),
+    "growth": ("real_growth",),
+    "gdp_wage": ("real_growth", "gdp_growth"),
+}
+YEAR_COLS = [str(y) for y in YEARS]
+
+# Old revisions only linger until a few newer ones replace them.
+_views = lru_cache(maxsize=4)
+
+
+def revision(group: str) -> tuple:
+    """Current cache token for the views in *group* (see METRICS)."""
+    return refresh.revision(*METRICS[group])
+
+
+# -------------------------------------------------------
+# Page 2 – minimum vs. actual wage levels
+# -------------------------------------------------------
+@_views
+def ratio_base(revision) -> transforms.RatioBase:
+    return transforms.ratio_base(data.min_to_avg_ratio())
+
+
+# -------------------------------------------------------
+# Page 3 – GDP growth vs. real wages
+# -------------------------------------------------------
+@_views
+def gdp_vs_real_wage(revision):
+    return transforms.gdp_vs_real_wage(wage_cube.get_cube())
+
+
+@_views
+def gdp_wage_correlations(revision):
+    """Every window / lag / sub-region with bootstrap intervals."""
+    return transforms.gdp_wage_correlations(wage_cube.get_cube())
+
+
+@_views
+def fit_band(revision):
+    frame = gdp_vs_real_wage(revision)
+    return correlation.fit_band(frame["gdp_growth_avg"], frame["real_wage_growth_avg"])
+
+
+@_views
+def real_wage_series(revision) -> transforms.RealWageSeries:
+    return transforms.RealWageSeries(wage_cube.get_cube())
+
+
+# -------------------------------------------------------
+# Page 4 – geographical disparities
+# -------------------------------------------------------
+@_views
+def avg_annual_growth(revision):
+    return transforms.avg_annual_growth(wage_cube.get_cube())
+
+
+@_views
+def yearly_real_growth(revision):
+    return transforms.yearly_real_growth(wage_cube.get_cube()).rename(columns=str)
+
+
+@lru_cache(maxsize=4 * len(geo.LODS))
+def growth_frame(lod: str, revision):
+    """Country polygons with the average and yearly growth columns."""
+    # Exact join on ISO-3 codes (core.countries), not on spelled-out names.
+    avg, yearly = avg_annual_growth(revision), yearly_real_growth(revision)
+    return (
+        geo.load_geometry(lod)
+           .join(avg.set_index("iso3")[[maps.GROWTH_FIELD]], on="iso_a3")
+           .join(yearly.set_index("iso3")[YEAR_COLS], on="iso_a3")
+    )
+
+
+@lru_cache(maxsize=4 * len(geo.LODS))
+def growth_geojson(lod: str, revision) -> dict:
+    """GeoJSON for both map views' tooltips, per level of detail."""
+    return maps.feature_collection(growth_frame(lod, revision),
+                                   ["name", maps.GROWTH_FIELD, *YEAR_COLS])
+
+
+@_views
+def year_classes(revision) -> maps.YearClasses:
+    # the country set is the same at every level of detail
+    return maps.year_classes(growth_frame(geo.DEFAULT_LOD, revision), YEAR_COLS)
+
+
+# -------------------------------------------------------
+# Warm-up
+# -------------------------------------------------------
+def build() -> None:
+    """Build every view for the current revisions (core.warmup)."""
+    ratio_base(revision("ratio"))
+    gdp_rev = revision("gdp_wage")
+    gdp_wage_correlations(gdp_rev)
+    fit_band(gdp_rev)
+    growth_rev = revision("growth")
+    real_wage_series(growth_rev)
+    for lod in geo.LODS:
+        growth_geojson(lod, growth_rev)
+    year_classes(growth_rev)
@@ -0,0 +1,277 @@
+# core/warmup.py
+# ───────────────────────────────────────────────────────────────
+# Start-up warm-up: load and preprocess the sources before the server
+# takes traffic, so the first visitor after a deploy pays for no
+# parse, cube build, derived page data or library import.
+#
+#   python -m core.warmup                  # warm up, print what it cost
+#   python -m core.warmup --serve [--server.port 8501 …]
+#
+# 1. sources  the ILO workbook and the OECD / World Bank CSVs are
+#             parsed at the same time in a process pool (openpyxl and
+#             the CSV scans hold the GIL); each worker publishes its
+#             Arrow cache (core.store), so on a warm .cache/ this is
+#             only the content hashes.
+# 2. shared   in threads: the keyed tables are read from the Arrow
+#             cache, the border geometry of every level of detail is
+#             read and the wage cube is built (both mapped instead
+#             when another server process on the host published them,
+#             core.shared);
+#             then the pages' derived data (core.views: correlation
+#             grid, fit band, ratio base, map GeoJSON and year classes)
+#             is built from those, and the libraries the pages render
+#             with are imported.
+# 3. pages    Home and every page run once headlessly (streamlit.testing
+#             AppTest) in a child process, so the test harness's mock
+#             runtime never touches the server's Streamlit state.  That
+#             catches a page that fails before any visitor sees it.
+#             Whatever it renders stays in the child: the charts
+#             (core.figures) are drawn on each page's first visit, and
+#             the pages' st.cache_resource loaders fill from core.views.
+#
+# --serve starts Streamlit (any other options are passed on to
+# `streamlit run`) only once the warm-up is done, so the server's
+# /_stcore/health endpoint doubles as the readiness probe.  In-process
+# callers can use `ready()` / `wait()`; `status()` has the timings.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import argparse
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from core import data, store
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGE_TIMEOUT = 300           # seconds per headless page run
+
+_ready = threading.Event()
+_status: dict = {"state": "cold", "steps": {}, "errors": []}
+
+
+def ready() -> bool:
+    """True once the warm-up finished (with or without errors)."""
+    return _ready.is_set()
+
+
+def wait(timeout: float | None = None) -> bool:
+    """Block until the warm-up finished; False on timeout."""
+    return _ready.wait(timeout)
+
+
+def status() -> dict:
+    """``state`` (cold / warming / ready), seconds per ``steps`` and
+    any ``errors``."""
+    return {**_status, "steps": dict(_status["steps"]), "errors": list(_status["errors"])}
+
+
+def _timed(name: str, fn, *args):
+    t0 = time.perf_counter()
+    try:
+        return fn(*args)
+    except Exception as e:           # a failed step leaves that cache cold, nothing more
+        _status["errors"].append(f"{name}: {type(e).__name__}: {e}")
+    finally:
+        _status["steps"][name] = time.perf_counter() - t0
+
+
+# -------------------------------------------------------
+# 1. Sources
+# -------------------------------------------------------
+def _parse(group: str, path: str) -> float:
+    t0 = time.perf_counter()
+    build, version = data.parser(group)
+    store.load(group, path, build, version=version)
+    return time.perf_counter() - t0
+
+
+def _collect(group: str, future) -> None:
+    try:
+        _status["steps"][f"parse:{group}"] = future.result()
+    except Exception as e:
+        _status["errors"].append(f"parse:{group}: {type(e).__name__}: {e}")
+
+
+def parse_sources(jobs: int) -> None:
+    """Parse every bundled source into the Arrow cache, in parallel
+    (one after the other with *jobs* = 1)."""
+    sources = {g: str(p.resolve()) for g, p in data.DEFAULTS.items()}
+    if store.pa is None:         # no disk cache to hand results over: stage 2 parses
+        return
+    if jobs <= 1:
+        for group, path in sources.items():      # the workbook comes before the World Bank scan
+            _timed(f"parse:{group}", _parse, group, path)
+        return
+    with ProcessPoolExecutor(min(jobs, len(sources))) as pool:
+        futures = {g: pool.submit(_parse, g, p) for g, p in sources.items() if g != "wb"}
+        _collect("ilo", futures.pop("ilo"))
+        # the World Bank scan keeps the workbook's economies, so it reads the workbook's cache
+        futures["wb"] = pool.submit(_parse, "wb", sources["wb"])
+        for group, future in futures.items():
+            _collect(group, future)
+
+
+# -------------------------------------------------------
+# 2. Shared, in-process structures
+# -------------------------------------------------------
+def _tables() -> None:
+    data.load_workbook()
+    data.gdp()
+    data.min_to_avg_ratio()
+
+
+def _geometry() -> None:
+    from core import geo
+    for lod in geo.LODS:
+        geo.load_geometry(lod)
+
+
+# What the pages render with (matplotlib via core.charts, folium and
+# plotly via core.maps); imported here so no first visit pays for it.
+# Not streamlit_folium: a component registers with the server only when
+# first imported inside a script run.
+LIBRARIES = ("core.charts", "core.maps", "plotly.express")
+
+
+def _libraries() -> None:
+    for name in LIBRARIES:
+        importlib.import_module(name)
+
+
+def load_shared(jobs: int) -> None:
+    from core import cube, views
+
+    with ThreadPoolExecutor(max(1, min(jobs, 2))) as pool:
+        tables = pool.submit(_timed, "tables", _tables)
+        geometry = pool.submit(_timed, "geometry", _geometry)
+        tables.result()
+        pool.submit(_timed, "cube", cube.get_cube).result()
+        geometry.result()
+    _timed("views", views.build)
+    _timed("libraries", _libraries)
+
+
+# -------------------------------------------------------
+# 3. Pages
+# -------------------------------------------------------
+def pages() -> list:
+    return [ROOT / "Home.py", *sorted((ROOT / "pages").glob("*.py"))]
+
+
+def _run_page(path: Path) -> None:
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(path), default_timeout=PAGE_TIMEOUT).run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def _no_context_notice(record) -> bool:
+    return "missing ScriptRunContext" not in record.getMessage()
+
+
+@contextmanager
+def headless():
+    """Context for AppTest page runs (also used by
+    scripts/build_snapshot.py).  Run pages one at a time: each headless
+    run swaps in its own mock runtime, so never in a process that
+    serves."""
+    from streamlit.runtime.scriptrunner_utils import script_run_context
+
+    # Headless runs call Streamlit from threads without a script
+    # context; its "bare mode" notices are expected here.
+    logger = logging.getLogger(script_run_context.__name__)
+    logger.addFilter(_no_context_notice)
+    try:
+        yield
+    finally:
+        logger.removeFilter(_no_context_notice)
+
+
+def _page_runs() -> None:
+    with headless():
+        for path in pages():
+            _timed(f"page:{path.stem}", _run_page, path)
+
+
+def _child_page_runs() -> dict:
+    _status["steps"].clear()         # report only this child's runs to the parent
+    _status["errors"].clear()
+    _page_runs()
+    return status()
+
+
+def run_pages(isolated: bool = True) -> None:
+    """Run Home and every page once headlessly: in a child process by
+    default, in this one (its page caches then warm) if not *isolated*."""
+    if not isolated:
+        _page_runs()
+        return
+    with ProcessPoolExecutor(1) as pool:
+        try:
+            report = pool.submit(_child_page_runs).result()
+        except Exception as e:
+            _status["errors"].append(f"pages: {type(e).__name__}: {e}")
+            return
+    _status["steps"].update(report["steps"])
+    _status["errors"].extend(report["errors"])
+
+
+def run(jobs: int = os.cpu_count() or 1, with_pages: bool = True,
+        isolated: bool = True) -> dict:
+    """Warm the sources and the shared views, then check the pages;
+    returns `status()`.  See `run_pages` for *isolated*."""
+    _status["state"] = "warming"
+    t0 = time.perf_counter()
+    _timed("sources", parse_sources, jobs)
+    _timed("shared", load_shared, jobs)
+    if with_pages:
+        run_pages(isolated)
+    _status["steps"]["total"] = time.perf_counter() - t0
+    _status["state"] = "ready"
+    _ready.set()
+    return status()
+
+
+def serve(streamlit_args: list) -> None:
+    """Start the Streamlit server in this process (after `run`), which
+    keeps what steps 1-2 loaded and built; no headless page ran here."""
+    from streamlit.web import cli
+
+    cli.main(["run", str(ROOT / "Home.py"), *streamlit_args], prog_name="streamlit")
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Warm the data sources and the pages' shared views",
+                                 epilog="Unknown options are passed on to `streamlit run`.")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                    help="worker processes for the source parse (1 = parse in-process)")
+    ap.add_argument("--no-pages", dest="pages", action="store_false",
+                    help="skip the headless page runs")
+    ap.add_argument("--serve", action="store_true", help="then start the server in this process")
+    args, rest = ap.parse_known_args(argv)
+    if rest and not args.serve:
+        ap.error(f"unrecognized arguments: {' '.join(rest)} (server options need --serve)")
+
+    report = run(args.jobs, args.pages)
+    for name, seconds in report["steps"].items():
+        print(f"{name:<40} {seconds * 1e3:>8.0f} ms")
+    for error in report["errors"]:
+        print("warm-up error:", error, file=sys.stderr)
+    if args.serve:
+        serve(rest)
+
+
+if __name__ == "__main__":
+    # `python -m core.warmup` runs this file as __main__, a second copy of
+    # the module.  Warm up through the importable one, so that
+    # `core.warmup.ready()` in the server it starts sees the result.
+    from core import warmup
+    warmup.main()
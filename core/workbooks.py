@@ -0,0 +1,146 @@
+# core/workbooks.py
+# ───────────────────────────────────────────────────────────────
+# Workbooks named on page 1's path box.
+#
+# A workbook is identified by a `Handle`: resolved path, mtime and
+# size, i.e. one stat().  Pages pass the handle downstream instead of
+# frames, so chart and figure caches key on three small values and
+# never hash a frame; a file replaced in place gets a new handle.
+#
+#   bundled workbook   the shared cube (core.cube), pinned and kept
+#                      current by core.refresh
+#   any other path     its own cube in a bounded LRU: at most
+#                      WAGE_WORKBOOKS entries (default 4) and
+#                      WAGE_WORKBOOKS_MB of deep size (default 256),
+#                      each dropped after WAGE_WORKBOOKS_TTL seconds
+#                      unused (default 1800)
+# so comparing many report vintages holds a few cubes, not one per
+# file ever opened.  Each path's Arrow cache is its own
+# ``workbook-<path hash>`` group (core.store), so rebuilding one
+# workbook only prunes that workbook's stale entries.
+# ───────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple
+
+from core import cube as wage_cube
+from core import data, memory, refresh, store
+
+MAX_ENTRIES = int(os.environ.get("WAGE_WORKBOOKS", 4))
+MAX_BYTES = int(float(os.environ.get("WAGE_WORKBOOKS_MB", 256)) * 2**20)
+TTL_SECONDS = float(os.environ.get("WAGE_WORKBOOKS_TTL", 1800))
+
+GROUP = "workbook"       # core.store group prefix of the non-bundled workbooks
+
+
+class Handle(NamedTuple):
+    """Identity of a workbook file as last seen on disk."""
+    path: str            # resolved
+    mtime_ns: int
+    size: int
+
+    @property
+    def bundled(self) -> bool:
+        return self.path == str(data.WAGE_XLSX.resolve())
+
+    @property
+    def group(self) -> str:
+        """core.store group of this path's Arrow cache."""
+        return f"{GROUP}-{hashlib.sha1(self.path.encode()).hexdigest()[:12]}"
+
+
+def open_handle(path: str | Path) -> Handle:
+    """Handle of the workbook at *path* (OSError if it can't be read)."""
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    return Handle(str(resolved), stat.st_mtime_ns, stat.st_size)
+
+
+class WorkbookCache:
+    """LRU of cubes by handle, bounded by entries, deep size and idle
+    time.  The newest entry is kept even if it alone is over budget."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES,
+                 ttl: float = TTL_SECONDS):
+        self.max_entries, self.max_bytes, self.ttl = max_entries, max_bytes, ttl
+        self._items: OrderedDict[Handle, tuple] = OrderedDict()   # → (cube, bytes, last use)
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, handle: Handle):
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            hit = self._items.get(handle)
+            if hit is None:
+                return None
+            self._items[handle] = (hit[0], hit[1], now)
+            self._items.move_to_end(handle)
+            return hit[0]
+
+    def put(self, handle: Handle, cube) -> None:
+        now = time.monotonic()
+        size = memory.deep_size(cube)
+        with self._lock:
+            # an older state of the same file is never asked for again
+            for old in [h for h in self._items if h.path == handle.path]:
+                self._drop(old)
+            self._items[handle] = (cube, size, now)
+            self._expire(now)
+            while len(self._items) > 1 and (len(self._items) > self.max_entries
+                                            or self.nbytes > self.max_bytes):
+                self._drop(next(iter(self._items)))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(size for _, size, _ in self._items.values())
+
+    def _expire(self, now: float) -> None:
+        for handle, (_, _, used) in list(self._items.items()):
+            if now - used > self.ttl:
+                self._drop(handle)
+
+    def _drop(self, handle: Handle) -> None:
+        del self._items[handle]
+        self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+cache = WorkbookCache()
+_build_lock = threading.Lock()
+
+
+def _build(handle: Handle):
+    tables = store.load(handle.group, handle.path, data._parse_workbook,
+                        version=data.PARSER_VERSION)
+    wb = data.keyed_tables("ilo", tables)
+    return wage_cube.build(wb.real, wb.nominal, data.min_to_avg_ratio(), data.gdp())
+
+
+def get_cube(handle: Handle):
+    """The wage cube for *handle* (see the module notes)."""
+    if handle.bundled:
+        snap = store.snapshot("ilo", handle.path)
+        if snap is not None and (snap.mtime_ns, snap.size) != handle[1:]:
+            refresh.check()          # replaced since the last poll: patch before use
+        return wage_cube.get_cube(handle.path)
+    cube = cache.get(handle)
+    if cube is None:
+        with _build_lock:            # one parse per workbook, however many sessions ask
+            cube = cache.get(handle)
+            if cube is None:
+                cube = _build(handle)
+                cache.put(handle, cube)
+    return cube
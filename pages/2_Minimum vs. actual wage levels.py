@@ -1,74 +1,47 @@
 # streamlit_app.py
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.colors as mcolors
-import plotly.express as px
+
+from core import charts, figures, maps, profiling, transforms, views
 
 # heatmap
 st.set_page_config(page_title="Minimum-to-Average Wage Map", layout="centered")
-
-@st.cache_data
-def load_data():
-    YEARS = [str(y) for y in range(2017, 2024)]
-    df = (
-        pd.read_csv("Minimum_to_average_wage_rate.csv")
-          .query("`Time period.1` == 'Mean'")
-          .set_index("country")[YEARS]
-    )
-    return YEARS, df
-
-YEARS, df = load_data()
+profiling.start("2_min_vs_actual")
+
+# One base (wide + long) for every section below.  It is shared across
+# reruns and sessions without pickling; each section takes a view, and
+# pandas copy-on-write keeps those views from ever touching the base.
+# Rebuilt only when the OECD ratios are revised (core.refresh); built
+# before the server starts (core.views).
+@profiling.cached("load", st.cache_resource)
+def load_data(revision):
+    return views.ratio_base(revision)
+
+base = load_data(views.revision("ratio"))
+YEARS = [str(y) for y in range(2017, 2024)]
+df = base.wide[YEARS]
 
 scheme = st.radio(
     "Choose colour scale",
-    ("Sequential (YlGnBu)", "Diverging (RdBu_r, centred at 50)")
+    charts.HEATMAP_SCHEMES
 )
 
-fig, ax = plt.subplots(figsize=(10, 7))
-if scheme.startswith("Sequential"):
-    im = ax.imshow(df.values, aspect="auto", cmap="YlGnBu")
-else:
-    norm = mcolors.TwoSlopeNorm(
-        vmin=df.values.min(), vcenter=50, vmax=df.values.max()
-    )
-    im = ax.imshow(df.values, aspect="auto", cmap="RdBu_r", norm=norm)
-
-ax.set_xticks(range(len(YEARS)), YEARS)
-ax.set_yticks(range(len(df.index)), df.index)
-ax.set_title("Minimum-to-average wage ratio (%) • 2017-2023")
+@profiling.timed("chart:heatmap", cached=True)
+@figures.cached_figure()
+def heatmap(df, scheme):
+    return charts.heatmap(df, scheme)
 
-cbar = fig.colorbar(im, ax=ax)
-cbar.set_label("ratio %")
-
-plt.tight_layout()
-
-st.pyplot(fig)
+st.image(heatmap(df, scheme))
 
 
 
 # slopegraph
 
-import pandas as pd
-import matplotlib.pyplot as plt
-
-@st.cache_data
-def load_data():
-    df = (
-        pd.read_csv("Minimum_to_average_wage_rate.csv")
-          .query("`Time period.1` == 'Mean'")
-          .set_index("country")[["2017", "2023"]]
-          .dropna()
-    )
-    df["Δ"] = df["2023"] - df["2017"]
-    return df
-
-df = load_data()
+df = transforms.ratio_change(base.wide)
 
 st.sidebar.header("Options")
 sort_by = st.sidebar.radio(
     "Sort countries by …",
-    ("Alphabetical", "2017 ratio", "2023 ratio", "Change (Δ)"),
+    transforms.SLOPE_SORTS,
     index=3
 )
 top_n = st.sidebar.slider(
@@ -78,38 +51,14 @@ top_n = st.sidebar.slider(
     value=min(25, len(df))
 )
 
+df_plot = transforms.slope_view(df, sort_by, top_n)
 
-if sort_by == "Alphabetical":
-    df_plot = df.sort_index()
-elif sort_by == "2017 ratio":
-    df_plot = df.sort_values("2017", ascending=False)
-elif sort_by == "2023 ratio":
-    df_plot = df.sort_values("2023", ascending=False)
-else:  # Change
-    df_plot = df.sort_values("Δ", ascending=False)
-
-df_plot = df_plot.head(top_n)
-
-fig, ax = plt.subplots(figsize=(8, 10))
+@profiling.timed("chart:slopegraph", cached=True)
+@figures.cached_figure()
+def slopegraph(df_plot, top_n):
+    return charts.slopegraph(df_plot, top_n)
 
-x0, x1 = 0, 1
-for country, row in df_plot.iterrows():
-    ax.plot([x0, x1], [row["2017"], row["2023"]],
-            linewidth=1.2,
-            color="tab:blue" if row["Δ"] >= 0 else "tab:red")
-    ax.text(x0 - 0.03, row["2017"], country,
-            ha="right", va="center", fontsize=8)
-
-
-ax.set_xticks([x0, x1], ["2017", "2023"])
-ax.set_ylabel("Minimum-to-average wage ratio (%)")
-ax.set_title(f"Change in minimum-/average-wage ratio, 2017 → 2023\n(top {top_n} countries)")
-for spine in ("top", "right", "bottom"):
-    ax.spines[spine].set_visible(False)
-ax.tick_params(left=False)
-plt.tight_layout()
-
-st.pyplot(fig)
+st.image(slopegraph(df_plot, top_n))
 
 with st.expander("Show underlying data"):
     st.dataframe(df_plot[["2017", "2023", "Δ"]])
@@ -117,17 +66,7 @@ with st.expander("Show underlying data"):
 
 
 # Scattered plot
-@st.cache_data
-def load_data():
-    YEARS = [str(y) for y in range(2017, 2024)]
-    df = (
-        pd.read_csv("Minimum_to_average_wage_rate.csv")
-          .query("`Time period.1` == 'Mean'")
-          .set_index("country")[YEARS]
-    )
-    return df
-
-data = load_data()
+data = base.wide[YEARS]
 all_countries = sorted(data.index.unique())
 
 st.sidebar.header("Select exactly four countries")
@@ -139,28 +78,17 @@ selected = st.sidebar.multiselect(
 
 if len(selected) != 4:
     st.warning("Please select exactly **four** countries.")
+    profiling.finish()
     st.stop()
 
-YEARS = [str(y) for y in range(2017, 2024)]
-df_plot = (
-    data.loc[selected, YEARS]
-        .transpose()          # rows → years, columns → countries
-)
-df_plot.index = df_plot.index.astype(int)   # nicer x-axis ticks
+df_plot = transforms.trajectory_view(data, selected)
 
-fig, ax = plt.subplots(figsize=(7, 5))
+@profiling.timed("chart:trajectories", cached=True)
+@figures.cached_figure()
+def trajectories(df_plot):
+    return charts.trajectories(df_plot)
 
-for country in df_plot.columns:
-    ax.plot(df_plot.index, df_plot[country],
-            marker="o", label=country)
-
-ax.set_xlabel("Year")
-ax.set_ylabel("Minimum-to-average wage ratio (%)")
-ax.set_title("Trajectory of wage-floor ratio (2017-2023)")
-ax.legend()
-plt.tight_layout()
-
-st.pyplot(fig)
+st.image(trajectories(df_plot))
 
 with st.expander("Show data table"):
     st.dataframe(df_plot)
@@ -168,18 +96,7 @@ with st.expander("Show data table"):
 
 # wage_map_app.py
 
-@st.cache_data
-def load_data():
-    YEARS = [str(y) for y in range(2017, 2024)]
-    df = (
-        pd.read_csv("Minimum_to_average_wage_rate.csv")
-          .query("`Time period.1` == 'Mean'")
-          .melt(id_vars="country", value_vars=YEARS,
-                var_name="year", value_name="ratio")
-    )
-    return df
-
-df = load_data()
+df = transforms.ratio_by_code(base.wide)
 
 st.sidebar.header("Options")
 palette = st.sidebar.selectbox(
@@ -188,25 +105,25 @@ palette = st.sidebar.selectbox(
     index=0
 )
 
-fig = px.choropleth(
-    df,
-    locations="country",
-    locationmode="country names",
-    color="ratio",
-    animation_frame="year",
-    range_color=[df["ratio"].min(), df["ratio"].max()],
-    color_continuous_scale=palette,
-    title="Minimum-to-average wage ratio (%) • 2017-2023"
+# Locations and hover labels ship once; every year frame is just its
+# float32 ratio array (see core.maps.ratio_animation).
+map_opts = dict(
+    palette=palette,
+    title="Minimum-to-average wage ratio (%) • 2017-2023",
+    colorbar_title="ratio %",
 )
-fig.update_layout(coloraxis_colorbar_title="ratio %")
+with profiling.stage("chart:ratio_animation"):
+    fig = maps.ratio_animation(df, **map_opts)
 
-st.plotly_chart(fig, use_container_width=True)
+with profiling.stage("send:ratio_animation"):
+    st.plotly_chart(fig, use_container_width=True)
+profiling.payload("send:ratio_animation", fig)
 
 with st.expander("Download the animation as HTML"):
-    html_bytes = fig.to_html(full_html=False, include_plotlyjs="cdn").encode()
+    # Built only when the button is clicked, then cached per palette.
     st.download_button(
         "Download interactive map",
-        data=html_bytes,
+        data=lambda: maps.animation_html(df, **map_opts),
         file_name="wage_ratio_animation.html",
         mime="text/html"
     )
@@ -231,4 +148,6 @@ st.markdown(
 - **Compression, not reversal.**  
   No country with a high ratio in 2017 shows a sustained fall; changes are flat or upward. The global picture is one of gradual compression of the lower tail of the wage distribution rather than any rollback at the top.
     """
-)
\ No newline at end of file
+)
+
+profiling.finish()
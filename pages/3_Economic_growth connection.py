@@ -11,45 +11,34 @@ st.set_page_config(
 # ───────────────────────────────────────────────────────────────
 # 1. Imports & data loading
 # ───────────────────────────────────────────────────────────────
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-@st.cache_data
-def load_data(
-    wage_path: str = "globalwagereport-2024-25data.xlsx",
-    gdp_path: str  = "API_NY.GDP.MKTP.KD_DS2_en_csv_v2_19406.csv"
-):
-    # 1-A  Real wage growth
-    real_df = pd.read_excel(wage_path, sheet_name="Real wage growth")
-    real_eu = real_df[real_df["Region"] == "Europe and Central Asia"].copy()
-    real_years = list(range(2017, 2024))
-    real_eu["real_wage_growth_avg"] = real_eu[real_years].mean(axis=1)
-    wage_avg = real_eu[["country_name", "real_wage_growth_avg"]]
-
-    # 1-B  GDP growth
-    gdp_raw = pd.read_csv(gdp_path, skiprows=4)
-    columns_needed = ["Country Name"] + [str(y) for y in range(2016, 2024)]
-    gdp = gdp_raw[columns_needed].copy()
-
-    for yr in range(2017, 2024):
-        gdp[f"{yr}_growth"] = (gdp[str(yr)] / gdp[str(yr-1)] - 1) * 100
-
-    growth_cols = [f"{yr}_growth" for yr in range(2017, 2024)]
-    gdp["gdp_growth_avg"] = gdp[growth_cols].mean(axis=1, skipna=True)
-    gdp_avg = gdp[["Country Name", "gdp_growth_avg"]]
-
-    # 1-C  Merge & clean
-    data = wage_avg.merge(
-        gdp_avg,
-        left_on="country_name",
-        right_on="Country Name",
-        how="inner"
-    ).dropna(subset=["real_wage_growth_avg", "gdp_growth_avg"])
-
-    return data.sort_values("country_name")
-
-data = load_data()
+from core import charts, correlation, figures, profiling, transforms, views
+from core.data import YEARS
+
+profiling.start("3_economic_growth")
+
+@profiling.cached("load", st.cache_resource)
+def load_data(revision):
+    return views.gdp_vs_real_wage(revision)
+
+@profiling.cached("correlations", st.cache_resource)
+def load_correlations(revision):
+    # Every window / lag / sub-region with bootstrap intervals, in one
+    # pass (core.correlation); the widgets below only slice it.
+    return views.gdp_wage_correlations(revision)
+
+@profiling.cached("fit_band", st.cache_resource)
+def load_fit_band(revision):
+    return views.fit_band(revision)
+
+# Cache entries are keyed by the revision of the metrics they read, so
+# only a revision of those (core.refresh) recomputes them.  They are
+# built before the server starts (core.views) and shared read-only by
+# every session (no per-rerun unpickled copy); everything below only
+# filters them.
+REVISION = views.revision("gdp_wage")
+data = load_data(REVISION)
+corrs = load_correlations(REVISION)
+band = load_fit_band(REVISION)
 
 # ───────────────────────────────────────────────────────────────
 # 2. Sidebar controls (optional)
@@ -64,59 +53,68 @@ highlight_country = st.sidebar.selectbox(
 # ───────────────────────────────────────────────────────────────
 # 3. Scatter-plot with regression line
 # ───────────────────────────────────────────────────────────────
-fig, ax = plt.subplots(figsize=(8, 6))
-sns.regplot(
-    data=data,
-    x="gdp_growth_avg",
-    y="real_wage_growth_avg",
-    scatter_kws={"s": 60, "alpha": 0.8},
-    line_kws={"color": "red", "linewidth": 1.5},
-    ax=ax
-)
-
-# optional annotation
-if highlight_country != "None":
-    row = data[data["country_name"] == highlight_country].iloc[0]
-    ax.scatter(
-        row["gdp_growth_avg"],
-        row["real_wage_growth_avg"],
-        s=120,
-        edgecolor="black",
-        facecolor="yellow",
-        zorder=5
-    )
-    ax.text(
-        row["gdp_growth_avg"],
-        row["real_wage_growth_avg"],
-        f"  {highlight_country}",
-        va="center"
-    )
+# The regression band is precomputed (load_fit_band), so the chart is
+# drawn once per highlight and served from core.figures afterwards.
+@profiling.timed("chart:regplot", cached=True)
+@figures.cached_figure()
+def scatter(data, highlight_country, band):
+    return charts.gdp_vs_wage(data, highlight_country, band)
 
-ax.set_title("Relationship between GDP Growth and Real Wage Growth\nEurope, 2017-2023")
-ax.set_xlabel("Average GDP Growth Rate (%, 2017-2023)")
-ax.set_ylabel("Average Real Wage Growth Rate (%, 2017-2023)")
-ax.grid(True)
-plt.tight_layout()
-
-st.pyplot(fig)
+st.image(scatter(data, highlight_country, band))
 
 # ───────────────────────────────────────────────────────────────
 # 4. Correlation coefficient & data table
 # ───────────────────────────────────────────────────────────────
-corr = data["gdp_growth_avg"].corr(data["real_wage_growth_avg"])
-st.markdown(f"**Correlation coefficient:** {corr:.2f}")
+# Seven-year averages = the full-width window ending in the last year.
+overall = corrs[
+    (corrs["group"] == transforms.ALL_COUNTRIES) & (corrs["width"] == len(YEARS))
+    & (corrs["lag"] == 0) & (corrs["end"] == YEARS[-1])
+].iloc[0]
+corr = overall["r"]
+st.markdown(
+    f"**Correlation coefficient:** {corr:.2f} "
+    f"(95% bootstrap CI {overall['r_lo']:.2f} to {overall['r_hi']:.2f}, "
+    f"{overall['n']} countries)"
+)
 
 with st.expander("Show underlying data"):
     st.dataframe(data[["country_name", "gdp_growth_avg", "real_wage_growth_avg"]])
 
+# ───────────────────────────────────────────────────────────────
+# 4b. Rolling, lagged and per-sub-region correlations
+# ───────────────────────────────────────────────────────────────
+st.subheader("Correlation over time")
+groups = list(corrs["group"].unique())
+col1, col2 = st.columns(2)
+width = col1.slider("Window (years)", min_value=min(transforms.WINDOWS),
+                    max_value=max(transforms.WINDOWS), value=3)
+lag = col2.select_slider("GDP growth leads wages by (years)", options=list(transforms.LAGS), value=0)
+shown = st.multiselect("Sub-regions", groups, default=[transforms.ALL_COUNTRIES])
+
+view = corrs[(corrs["width"] == width) & (corrs["lag"] == lag) & corrs["group"].isin(shown)]
+with profiling.stage("chart:rolling"):
+    fig = charts.rolling_correlation(view)
+with profiling.stage("send:rolling"):
+    st.plotly_chart(fig, use_container_width=True)
+profiling.payload("send:rolling", fig)
+
+with st.expander("By sub-region and lag (full 2017-2023 window)"):
+    # wages over 2017-2023 vs GDP over the same span shifted back by the lag
+    full = corrs[(corrs["width"] == len(YEARS)) & (corrs["end"] == YEARS[-1])]
+    st.dataframe(
+        full.pivot(index="group", columns="lag", values="r").add_prefix("r, lag ")
+            .join(full[full["lag"] == 0].set_index("group")[["r_lo", "r_hi", "slope", "n"]])
+            .round(2)
+    )
+
 # ───────────────────────────────────────────────────────────────
 # 5. Findings summary (text section)
 # ───────────────────────────────────────────────────────────────
 st.markdown(
-    """
+    f"""
 ### Findings: GDP Growth vs. Real Wage Growth (Europe, 2017 – 2023)
 
-- **Correlation coefficient:** **−0.17** – a weak, negative relationship between average GDP growth and real-wage growth across European countries.  
+- **Correlation coefficient:** **{corr:.2f}** – a {correlation.strength(corr)} relationship between average GDP growth and real-wage growth across European countries.  
 - **Interpretation:** Faster economic expansion did **not** translate into proportionally higher real wages; if anything, countries with stronger GDP growth tended to post slightly lower real-wage gains.  
 - **Implication:** Macroeconomic growth alone is insufficient to guarantee wage improvements for workers. Inflation, labour-market conditions, government wage policies, and sectoral dynamics likely mediate the link between GDP and pay.  
 - **Caveats:**  
@@ -136,63 +134,45 @@ Further research could explore non-linear relationships, sector-specific trends,
 # ───────────────────────────────────────────────────────────────
 # 1. Imports & data loading
 # ───────────────────────────────────────────────────────────────
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-
+# Pre-pivoted country × year arrays with sub-region / country indexes,
+# shared by every session (core.transforms.RealWageSeries).
+@profiling.cached("load:real_wage_series", st.cache_resource)
+def load_real_wage_series(revision):
+    return views.real_wage_series(revision)
 
-@st.cache_data
-def load_real_wage_data(xlsx_path="globalwagereport-2024-25data.xlsx"):
-    real_df = pd.read_excel(xlsx_path, sheet_name="Real wage growth")
-    real_eu = real_df[real_df["Region"] == "Europe and Central Asia"].copy()
-    melted = real_eu.melt(
-        id_vars=["country_name", "Income group", "Subregion - detailed"],
-        value_vars=[2017, 2018, 2019, 2020, 2021, 2022, 2023],
-        var_name="Year",
-        value_name="Real_Wage_Growth"
-    ).dropna(subset=["Real_Wage_Growth"])
-    melted["Year"] = melted["Year"].astype(int)
-    return melted
-
-df = load_real_wage_data()
+series = load_real_wage_series(views.revision("growth"))
 
 # ── sidebar filters ────────────────────────────────────────────
 st.sidebar.header("Filters")
-subregions = sorted(df["Subregion - detailed"].unique())
-selected_sub = st.sidebar.multiselect("Sub-region(s)", subregions, default=subregions)
-df_filtered = df[df["Subregion - detailed"].isin(selected_sub)]
+selected_sub = st.sidebar.multiselect("Sub-region(s)", series.subregions, default=series.subregions)
 
-countries = sorted(df_filtered["country_name"].unique())
+countries = series.countries(selected_sub)
 selected_countries = st.sidebar.multiselect("Country selection", countries)
 
 # If nothing chosen, default to the first ten for convenience
 if not selected_countries:
     selected_countries = countries[:10]
 
-df_filtered = df_filtered[df_filtered["country_name"].isin(selected_countries)]
-if df_filtered.empty:
+with profiling.stage("query:line"):
+    table = series.select(selected_countries)
+if table.empty:
     st.warning("No data for the chosen filters.")
+    profiling.finish()
     st.stop()
 
 # ── line chart ─────────────────────────────────────────────────
-fig = px.line(
-    df_filtered,
-    x="Year",
-    y="Real_Wage_Growth",
-    color="country_name",
-    labels={"Real_Wage_Growth": "Real Wage Growth (%)"},
-    title="Real Wage Growth in Europe (2017 – 2023)",
-    color_discrete_sequence=px.colors.qualitative.Safe
-)
-fig.update_layout(hovermode="x unified", legend_title_text="Country", height=600)
+with profiling.stage("chart:line"):
+    fig = charts.real_wage_lines(table)
 
-st.plotly_chart(fig, use_container_width=True)
+with profiling.stage("send:line"):
+    st.plotly_chart(fig, use_container_width=True)
+profiling.payload("send:line", fig)
 
 # ── data table ─────────────────────────────────────────────────
-with st.expander("Show data table"):
-    st.dataframe(
-        df_filtered.pivot(index="Year", columns="country_name", values="Real_Wage_Growth")
-    )
-
-
+# Tracks its open state, so the table is only sent while it is open.
+table_box = st.expander("Show data table", key="line_table", on_change="rerun")
+if table_box.open:
+    with table_box:
+        st.dataframe(table)
 
+profiling.finish()
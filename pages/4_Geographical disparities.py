@@ -1,13 +1,6 @@
 # europe_wage_map_app.py
 # ───────────────────────────────────────────────────────────────
 # 0. PAGE CONFIG  – must be first Streamlit command
-import pandas as pd
-import folium
-import geopandas as gpd
-import requests
-import zipfile
-import io
-import os
 import streamlit as st
 st.set_page_config(
     page_title="Average Annual Wage-Growth Map • Europe (2017-2023)",
@@ -17,92 +10,103 @@ st.set_page_config(
 # ───────────────────────────────────────────────────────────────
 # 1. IMPORTS & DATA LOADERS
 # ───────────────────────────────────────────────────────────────
-import pandas as pd
-import geopandas as gpd
-import folium
 from streamlit_folium import st_folium
 
-@st.cache_data
-def load_wage_data(xlsx_path="globalwagereport-2024-25data.xlsx"):
-    df = pd.read_excel(xlsx_path, sheet_name="Real wage growth")
-    cols = ["country_name", 2017, 2018, 2019, 2020, 2021, 2022, 2023]
-    df = df[cols].dropna(subset=[2017, 2023]).copy()
-    df["Total_Growth_Rate"] = ((df[2023] - df[2017]) / df[2017]) * 100
-    df["Avg_Annual_Growth_Rate"] = df["Total_Growth_Rate"] / 6
-    return df
-
-@st.cache_data
-def load_geojson():
-    url = "https://raw.githubusercontent.com/johan/world.geo.json/master/countries.geo.json"
-    return gpd.read_file(url)
-
-wage_df = load_wage_data()
-world   = load_geojson()
-
-europe_set = {
-    'Albania','Andorra','Austria','Belarus','Belgium','Bosnia and Herzegovina',
-    'Bulgaria','Croatia','Cyprus','Czech Republic','Denmark','Estonia','Finland',
-    'France','Germany','Greece','Hungary','Iceland','Ireland','Italy','Kosovo',
-    'Latvia','Liechtenstein','Lithuania','Luxembourg','Malta','Moldova','Monaco',
-    'Montenegro','Netherlands','North Macedonia','Norway','Poland','Portugal',
-    'Romania','San Marino','Serbia','Slovakia','Slovenia','Spain','Sweden',
-    'Switzerland','Ukraine','United Kingdom'
-}
-europe = world[world["name"].isin(europe_set)].copy()
-
-merged = europe.merge(wage_df, left_on="name", right_on="country_name", how="left")
+from core import geo, maps, profiling, views
+from core.views import YEAR_COLS
+
+profiling.start("4_geographical")
+
+# Everything below is keyed by the real-wage revision (and the level of
+# detail) alone: recomputed only when that sheet is revised
+# (core.refresh).  Built before the server starts (core.views) and
+# shared read-only by every session.
+REVISION = views.revision("growth")
+
+
+@profiling.cached("merge", st.cache_resource)
+def load_merged(lod, revision):
+    return views.growth_frame(lod, revision)
+
+
+@profiling.cached("geojson", st.cache_resource)
+def build_geojson(lod, revision):
+    # Serialised once per level of detail and shared by every rerun
+    # and session; both map views' tooltips read from it.
+    return views.growth_geojson(lod, revision)
+
+
+@profiling.cached("year_classes", st.cache_resource)
+def build_year_classes(revision):
+    # Class breaks, palette and every year's class per country, computed
+    # once; the year slider just picks one of the precomputed arrays.
+    return views.year_classes(revision)
+
+
+# Border detail only changes vertex count; the country set is fixed.
+lod = st.sidebar.select_slider("Border detail", options=geo.LODS, value=geo.DEFAULT_LOD)
+merged = load_merged(lod, REVISION)
+geojson = build_geojson(lod, REVISION)
 
 # ───────────────────────────────────────────────────────────────
 # 2. SIDEBAR FILTERS
 # ───────────────────────────────────────────────────────────────
 st.sidebar.header("Filters")
-min_rate, max_rate = float(merged["Avg_Annual_Growth_Rate"].min()), float(merged["Avg_Annual_Growth_Rate"].max())
-rate_range = st.sidebar.slider(
-    "Avg. annual wage-growth range (%)",
-    min_value=round(min_rate,1), max_value=round(max_rate,1),
-    value=(round(min_rate,1), round(max_rate,1))
-)
-merged["filter_flag"] = merged["Avg_Annual_Growth_Rate"].between(*rate_range)
+view = st.sidebar.radio("Map view", ("Average 2017-2023", "Single year"))
+single_year = view == "Single year"
+
+if single_year:
+    year = st.sidebar.select_slider("Year", options=YEAR_COLS, value=YEAR_COLS[-1])
+else:
+    min_rate, max_rate = float(merged["Avg_Annual_Growth_Rate"].min()), float(merged["Avg_Annual_Growth_Rate"].max())
+    rate_range = st.sidebar.slider(
+        "Avg. annual wage-growth range (%)",
+        min_value=round(min_rate,1), max_value=round(max_rate,1),
+        value=(round(min_rate,1), round(max_rate,1))
+    )
 
 # ───────────────────────────────────────────────────────────────
 # 3. BUILD FOLIUM MAP
 # ───────────────────────────────────────────────────────────────
-m = folium.Map(location=[54, 15], zoom_start=4, tiles="cartodbpositron")
-
-folium.Choropleth(
-    geo_data=merged,
-    data=merged[merged["filter_flag"]],
-    columns=["name", "Avg_Annual_Growth_Rate"],
-    key_on="feature.properties.name",
-    fill_color="YlGnBu",
-    fill_opacity=0.8,
-    line_opacity=0.2,
-    nan_fill_color="lightgrey",
-    legend_name="Average Annual Real-Wage Growth (2017-2023, %)",
-    name="Wage growth"
-).add_to(m)
-
-folium.GeoJson(
-    merged,
-    style_function=lambda _: {"fillOpacity": 0, "color": "transparent"},
-    tooltip=folium.GeoJsonTooltip(
-        fields=["name", "Avg_Annual_Growth_Rate"],
-        aliases=["Country", "Avg annual growth (%)"],
-        localize=True,
-        sticky=False
-    )
-).add_to(m)
+# The base map (tiles, geometry, tooltip, legend) is identical for every
+# slider position, so the browser keeps the Leaflet map and only
+# re-styles it from the per-country styles (in the single-year view, a
+# class index per country into a shared palette).  The map script is
+# still sent with every rerun.
+with profiling.stage("map:build"):
+    if single_year:
+        classes = build_year_classes(REVISION)
+        m = maps.growth_map(geojson, maps.year_colormap(classes.breaks),
+                            fields=["name", *YEAR_COLS],
+                            aliases=["Country", *(f"{y} (%)" for y in YEAR_COLS)])
+        styles, palette = classes.classes[year], classes.palette
+    else:
+        colormap = maps.growth_colormap(min_rate, max_rate)
+        m = maps.growth_map(geojson, colormap)
+        styles, palette = maps.growth_styles(merged, colormap, rate_range), None
 
 # ───────────────────────────────────────────────────────────────
 # 4. DISPLAY MAP & DATA TABLE
 # ───────────────────────────────────────────────────────────────
-st_folium(m, width=800, height=600)
+# Round-trip to the browser component; the payload counted is the base
+# map plus the style layer, both of which st_folium sends on every rerun.
+style_layer = maps.style_layer(styles, palette=palette)
+with profiling.stage("send:st_folium"):
+    st_folium(
+        m, width=800, height=600, key="wage_map",
+        feature_group_to_add=style_layer,
+        returned_objects=[],
+    )
+profiling.payload("send:st_folium", m)
+profiling.payload("send:st_folium", styles)
 
 with st.expander("Show data table"):
+    value_col, label = ((year, f"Real-Wage Growth {year} (%)") if single_year
+                        else ("Avg_Annual_Growth_Rate", "Avg Annual Growth (%)"))
     st.dataframe(
-        merged[["name", "Avg_Annual_Growth_Rate"]]
-          .rename(columns={"name": "Country", "Avg_Annual_Growth_Rate": "Avg Annual Growth (%)"})
-          .sort_values("Avg Annual Growth (%)", ascending=False),
+        merged[["name", value_col]]
+          .rename(columns={"name": "Country", value_col: label})
+          .sort_values(label, ascending=False),
         use_container_width=True
     )
 # ───────────────────────────────────────────────────────────────
@@ -129,3 +133,5 @@ st.markdown(
 Regional differences suggest that wage outcomes are shaped not only by overall economic expansion but also by labour-market institutions, policy choices, and the pace of post-pandemic recovery. Faster growth in the East signals continuing convergence, while the South’s sluggishness points to the need for further structural reforms.
     """
 )
+
+profiling.finish()
@@ -0,0 +1,97 @@
+# scripts/build_geometry.py
+# ───────────────────────────────────────────────────────────────
+# Rebuild assets/geo/europe-{low,medium,high}.geojson from a world
+# countries file (any format GDAL reads, local path or URL).
+#
+#   python scripts/build_geometry.py [SOURCE] [--name-field NAME]
+#
+# SOURCE defaults to Natural Earth's 1:110m admin-0 countries (public
+# domain), which the bundled assets were built from; name and ISO-3
+# columns are auto-detected.  Borders are simplified as a coverage,
+# so neighbouring countries keep sharing the exact same edge at every
+# level of detail (no gaps or slivers).
+# ───────────────────────────────────────────────────────────────
+import argparse
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import shapely
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.geo import EUROPE, GEO_DIR, LODS  # noqa: E402
+
+DEFAULT_SOURCE = "https://naciscdn.org/naturalearth/110m/cultural/ne_110m_admin_0_countries.zip"
+
+# Tolerance in degrees per level of detail (0 = keep source vertices).
+# At 1:110m these keep roughly 30%, 60% and all of the source vertices.
+TOLERANCE = {"low": 1.0, "medium": 0.4, "high": 0.0}
+PRECISION = 4            # decimal places kept in the GeoJSON output
+
+# Rest of the ILO "Europe and Central Asia" region (ISO-3), kept so the
+# asset also covers pages that look beyond the EU-centred `EUROPE` set.
+EXTRA = {
+    'RUS','TUR','GEO','ARM','AZE','KAZ','KGZ','TJK','TKM','UZB','ISR'
+}
+
+# Source spellings → the names used by the pages.
+ALIASES = {
+    "Czechia": "Czech Republic",
+    "Bosnia and Herz.": "Bosnia and Herzegovina",
+    "Republic of Serbia": "Serbia",
+    "Macedonia": "North Macedonia",
+    "Republic of Moldova": "Moldova",
+    "Russia": "Russian Federation",
+    "Turkey": "Türkiye",
+    "Kyrgyzstan": "Kyrgyzstan Republic",
+}
+# Natural Earth ships "-99" as iso_a3 for these.
+ISO_FIXES = {"Kosovo": "XKX", "France": "FRA", "Norway": "NOR"}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Rebuild assets/geo/europe-{low,medium,high}.geojson from a world countries file")
+    ap.add_argument("source", nargs="?", default=DEFAULT_SOURCE)
+    ap.add_argument("--name-field", default=None,
+                    help="column holding country names (auto-detected)")
+    ap.add_argument("--iso-field", default=None,
+                    help="column holding ISO-3 codes (auto-detected)")
+    args = ap.parse_args(argv)
+
+    world = gpd.read_file(args.source).to_crs(4326)
+    name_field = args.name_field or next(
+        c for c in ("name", "NAME", "ADMIN") if c in world.columns)
+    iso_field = args.iso_field or next(
+        (c for c in ("iso_a3", "ISO_A3", "ADM0_A3", "id") if c in world.columns), None)
+
+    out = gpd.GeoDataFrame({
+        "name": world[name_field].replace(ALIASES),
+        "iso_a3": world[iso_field] if iso_field else None,
+        "geometry": world.geometry.make_valid(),
+    }, crs=4326)
+    out["iso_a3"] = out["name"].map(ISO_FIXES).fillna(out["iso_a3"])
+    out = out[out["iso_a3"].isin(EUROPE | EXTRA)]
+    out = out.sort_values("name").reset_index(drop=True)
+
+    missing = sorted((EUROPE | EXTRA) - set(out["iso_a3"]))
+    if missing:
+        print(f"not in source (too small at this scale?): {', '.join(missing)}")
+
+    GEO_DIR.mkdir(parents=True, exist_ok=True)
+    for lod in LODS:
+        layer = out.copy()
+        if TOLERANCE[lod]:
+            layer["geometry"] = shapely.coverage_simplify(
+                layer.geometry.values, TOLERANCE[lod])
+        layer["geometry"] = shapely.set_precision(layer.geometry.values, 10 ** -PRECISION)
+        path = GEO_DIR / f"europe-{lod}.geojson"
+        layer.to_file(path, driver="GeoJSON", engine="pyogrio",
+                      layer_options={"COORDINATE_PRECISION": PRECISION, "RFC7946": "YES"})
+        n = int(shapely.get_num_coordinates(layer.geometry.values).sum())
+        print(f"{path.relative_to(GEO_DIR.parent.parent)}: {len(layer)} countries, "
+              f"{n} vertices, {path.stat().st_size / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+# scripts/build_snapshot.py
+# ───────────────────────────────────────────────────────────────
+# Static snapshot of the dashboard for read-only traffic.
+#
+#   python scripts/build_snapshot.py [--out snapshot] [--live-url http://localhost:8501]
+#   python -m http.server --directory snapshot 8000
+#
+# Home and every page run headlessly (streamlit.testing AppTest, as in
+# core.warmup): once in their default view, and once per value of each
+# widget in VARY, varied on its own from the default.  Text, charts and
+# tables therefore come from the pages themselves.  Every run is saved
+# as
+#   <page>[--<state>].json   its elements: markdown, images, tables,
+#                            plotly figures, maps and widget values
+#   <page>[--<state>].html   the same, ready for the browser
+# next to assets/ (chart PNGs and folium maps, named by content hash),
+# manifest.json and index.html (Home).  Markdown and plotly figures are
+# drawn in the browser, with marked / plotly.js from their CDNs (as the
+# exported HTML charts are).  Each file links to the other snapshots,
+# and to the live app (--live-url) for any other selection.
+#
+# The snapshot is built in a temporary directory that replaces --out
+# when done, so a static server never serves half of one.  Rebuild it
+# after a data release (core.refresh).
+# ───────────────────────────────────────────────────────────────
+import argparse
+import hashlib
+import html
+import json
+import mimetypes
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from core import warmup  # noqa: E402
+
+# page → widgets to vary: (label, settings applied first).  Every other
+# value of the widget gets its own snapshot (every value, when there
+# are settings to apply first).
+VARY = {
+    "page2": [("Choose colour scale", {}), ("Sort countries by …", {}), ("Colour palette", {})],
+    "page3": [("Window (years)", {}), ("GDP growth leads wages by (years)", {})],
+    "page4": [("Border detail", {}), ("Year", {"Map view": "Single year"})],
+}
+WIDGETS = {"radio", "selectbox", "multiselect", "slider", "select_slider",
+           "text_input", "number_input", "checkbox"}
+MARKED_JS = "https://cdn.jsdelivr.net/npm/marked@12/marked.min.js"
+
+
+def slug(text) -> str:
+    return re.sub(r"[^0-9A-Za-z]+", "-", str(text)).strip("-").lower()
+
+
+# -------------------------------------------------------
+# Pages
+# -------------------------------------------------------
+def page_scripts() -> dict:
+    """page id → script, in navigation order (home, page1, …)."""
+    return {("home" if i == 0 else f"page{i}"): path for i, path in enumerate(warmup.pages())}
+
+
+def url_name(path: Path) -> str:
+    """The page's URL path on the live server ("" for Home)."""
+    from streamlit.source_util import page_icon_and_name
+    return "" if path == warmup.ROOT / "Home.py" else page_icon_and_name(path)[1]
+
+
+# -------------------------------------------------------
+# Headless runs
+# -------------------------------------------------------
+class Recorder:
+    """What the runs hand the browser by reference: media files
+    (st.image) by id, and the folium maps given to st_folium."""
+
+    def __init__(self):
+        self.media: dict = {}
+        self.maps: list = []
+
+
+@contextmanager
+def recording():
+    import streamlit_folium
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    rec = Recorder()
+    load_and_get_id = MemoryMediaFileStorage.load_and_get_id
+    st_folium = streamlit_folium.st_folium
+
+    def keep_media(self, *args, **kwargs):
+        file_id = load_and_get_id(self, *args, **kwargs)
+        rec.media[file_id] = self._files_by_id[file_id]
+        return file_id
+
+    def keep_map(fig, *args, feature_group_to_add=None, **kwargs):
+        rec.maps.append((fig, feature_group_to_add))
+        return st_folium(fig, *args, feature_group_to_add=feature_group_to_add, **kwargs)
+
+    # the pages import st_folium on every run, so they pick this one up
+    MemoryMediaFileStorage.load_and_get_id = keep_media
+    streamlit_folium.st_folium = keep_map
+    try:
+        yield rec
+    finally:
+        MemoryMediaFileStorage.load_and_get_id = load_and_get_id
+        streamlit_folium.st_folium = st_folium
+
+
+def _nodes(node):
+    for child in getattr(node, "children", {}).values():
+        yield child
+        yield from _nodes(child)
+
+
+def find_widget(at, label: str):
+    for node in (*_nodes(at.main), *_nodes(at.sidebar)):
+        if node.type in WIDGETS and node.label == label:
+            return node
+    raise LookupError(f"no widget labelled {label!r}")
+
+
+def widget_values(widget) -> list:
+    if widget.type == "slider":
+        p = widget.proto
+        return list(range(int(p.min), int(p.max) + 1, int(p.step or 1)))
+    return list(widget.options)
+
+
+def _run(at, rec: Recorder):
+    rec.maps.clear()
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return at
+
+
+def run_page(path: Path, settings: dict, rec: Recorder):
+    """AppTest of *path* after applying *settings* (label → value) in
+    order, with every stateful expander open so its content is sent."""
+    from streamlit.testing.v1 import AppTest
+
+    at = _run(AppTest.from_file(str(path), default_timeout=warmup.PAGE_TIMEOUT), rec)
+    for label, value in settings.items():
+        find_widget(at, label).set_value(value)
+        _run(at, rec)
+    closed = [node.proto.id.split("-", 2)[2] for node in _nodes(at.main)
+              if node.type == "expander" and node.proto.id.startswith("$$ID-")
+              and not node.children]
+    if closed:
+        for key in closed:
+            at.session_state[key] = True
+        _run(at, rec)
+    return at
+
+
+# -------------------------------------------------------
+# Elements → JSON
+# -------------------------------------------------------
+HEADINGS = {"title": "# ", "header": "## ", "subheader": "### ", "markdown": "", "caption": ""}
+
+
+class Snapshot:
+    """Output directory: assets are written once per content hash."""
+
+    def __init__(self, out: Path):
+        self.out = out
+        (out / "assets").mkdir(parents=True, exist_ok=True)
+
+    def asset(self, content: bytes, ext: str) -> str:
+        name = f"assets/{hashlib.sha1(content).hexdigest()[:16]}{ext}"
+        path = self.out / name
+        if not path.exists():
+            path.write_bytes(content)
+        return name
+
+
+def _table(df: pd.DataFrame) -> dict:
+    split = json.loads(df.to_json(orient="split", date_format="iso"))
+    return {"type": "table", "index_name": df.index.name, **split}
+
+
+def _map(snap: Snapshot, fig, group) -> dict:
+    if group is not None:
+        fig.add_child(group)          # baked in: there is no browser round-trip
+    return {"type": "map", "src": snap.asset(fig.get_root().render().encode(), ".html")}
+
+
+def elements(node, snap: Snapshot, rec: Recorder, maps) -> list:
+    out = []
+    for child in node.children.values():
+        kind = child.type
+        if kind in HEADINGS:
+            out.append({"type": "markdown", "body": HEADINGS[kind] + child.value,
+                        "caption": kind == "caption"})
+        elif kind in ("warning", "error", "info", "success"):
+            out.append({"type": "alert", "kind": kind, "body": child.value})
+        elif kind == "image":
+            for img in child.proto.imgs:
+                media = rec.media[Path(img.url).stem]
+                ext = mimetypes.guess_extension(media.mimetype) or ""
+                out.append({"type": "image", "src": snap.asset(media.content, ext),
+                            "caption": img.caption})
+        elif kind == "dataframe":
+            out.append(_table(child.value))
+        elif kind == "plotly_chart":
+            out.append({"type": "plotly", "figure": json.loads(child.proto.spec),
+                        "config": json.loads(child.proto.config or "{}")})
+        elif kind == "component_instance" and "folium" in child.proto.component_name:
+            out.append(_map(snap, *next(maps)))
+        elif kind == "expander":
+            out.append({"type": "expander", "label": child.label,
+                        "children": elements(child, snap, rec, maps)})
+        elif kind in WIDGETS:
+            value = child.value
+            out.append({"type": "widget", "label": child.label,
+                        "value": list(value) if isinstance(value, tuple) else value})
+        elif hasattr(child, "children"):          # columns and other containers
+            out += elements(child, snap, rec, maps)
+        # anything else (download buttons …) has no static form
+    return out
+
+
+def document(at, snap: Snapshot, rec: Recorder) -> dict:
+    maps = iter(list(rec.maps))
+    return {"main": elements(at.main, snap, rec, maps),
+            "sidebar": elements(at.sidebar, snap, rec, maps)}
+
+
+# -------------------------------------------------------
+# JSON → HTML
+# -------------------------------------------------------
+CSS = """
+body { margin: 0; font-family: "Source Sans Pro", system-ui, sans-serif; color: #31333f; }
+.bar { display: flex; gap: 1rem; align-items: center; padding: .6rem 1rem;
+       border-bottom: 1px solid #e6e6e6; flex-wrap: wrap; }
+.bar a { color: inherit; text-decoration: none; }
+.bar a.current { font-weight: 600; }
+.bar .live { margin-left: auto; color: #ff4b4b; }
+.layout { display: flex; }
+aside { width: 18rem; flex: none; padding: 1rem; background: #f0f2f6; min-height: 100vh; }
+main { flex: 1; max-width: 46rem; padding: 1rem 2rem; }
+main img { max-width: 100%; }
+.widget { margin: .4rem 0; }
+.widget .value { font-weight: 600; }
+.variants a { display: inline-block; margin: 0 .4rem .2rem 0; }
+.variants a.current { font-weight: 600; color: inherit; }
+.alert { padding: .8rem 1rem; border-radius: .5rem; background: #fffce7; }
+.caption { color: #808495; font-size: .9rem; }
+table { border-collapse: collapse; font-size: .85rem; }
+th, td { padding: .2rem .5rem; border-bottom: 1px solid #e6e6e6; text-align: right; }
+iframe { width: 100%; height: 600px; border: 0; }
+details { margin: 1rem 0; border: 1px solid #e6e6e6; border-radius: .5rem; padding: .5rem 1rem; }
+.note { color: #808495; font-size: .8rem; }
+"""
+
+SCRIPT = """
+document.querySelectorAll(".md").forEach(el => { el.innerHTML = marked.parse(el.textContent); });
+document.querySelectorAll(".plotly").forEach(el => {
+  const fig = JSON.parse(document.getElementById(el.dataset.figure).textContent);
+  Plotly.newPlot(el, fig);
+});
+"""
+
+
+def _json_script(obj) -> str:
+    return json.dumps(obj).replace("</", "<\\/")
+
+
+def _html_table(el: dict) -> str:
+    df = pd.DataFrame(el["data"], index=pd.Index(el["index"], name=el["index_name"]),
+                      columns=el["columns"])
+    return df.to_html(border=0, na_rep="", float_format=lambda v: f"{v:,.2f}")
+
+
+def render(items: list, figures: list) -> str:
+    parts = []
+    for el in items:
+        kind = el["type"]
+        if kind == "markdown":
+            cls = "md caption" if el["caption"] else "md"
+            parts.append(f'<div class="{cls}">{html.escape(el["body"])}</div>')
+        elif kind == "alert":
+            parts.append(f'<div class="alert md">{html.escape(el["body"])}</div>')
+        elif kind == "image":
+            caption = f'<p class="caption">{html.escape(el["caption"])}</p>' if el["caption"] else ""
+            parts.append(f'<img src="{el["src"]}" alt="">{caption}')
+        elif kind == "table":
+            parts.append(_html_table(el))
+        elif kind == "plotly":
+            name = f"figure{len(figures)}"
+            figures.append((name, {**el["figure"], "config": {"responsive": True, **el["config"]}}))
+            parts.append(f'<div class="plotly" data-figure="{name}"></div>')
+        elif kind == "map":
+            parts.append(f'<iframe src="{el["src"]}" loading="lazy"></iframe>')
+        elif kind == "expander":
+            parts.append(f'<details><summary>{html.escape(el["label"])}</summary>'
+                         f'{render(el["children"], figures)}</details>')
+        elif kind == "widget":
+            value = el["value"]
+            shown = ", ".join(map(str, value)) if isinstance(value, list) else str(value)
+            parts.append(f'<div class="widget">{html.escape(el["label"])}: '
+                         f'<span class="value">{html.escape(shown)}</span></div>')
+    return "\n".join(parts)
+
+
+def page_html(doc: dict, page: str, manifest: dict) -> str:
+    info = manifest["pages"][page]
+    nav = " ".join(
+        f'<a href="{p["states"]["default"]["html"]}"{" class=current" if pid == page else ""}>'
+        f'{html.escape(p["title"])}</a>'
+        for pid, p in manifest["pages"].items())
+    variants = []
+    for label, states in info["variants"].items():
+        links = " ".join(
+            f'<a href="{info["states"][s]["html"]}"{" class=current" if s == doc["state"] else ""}>'
+            f'{html.escape(str(value))}</a>' for value, s in states)
+        variants.append(f'<div class="variants">{html.escape(label)}:<br>{links}</div>')
+    if variants:
+        variants.insert(0, f'<p><a href="{info["states"]["default"]["html"]}">Default view</a></p>')
+
+    figures: list = []
+    main = render(doc["main"], figures)
+    sidebar = render(doc["sidebar"], figures)
+    scripts = [f'<script src="{MARKED_JS}"></script>']
+    if figures:
+        from plotly.offline import get_plotlyjs_version
+        scripts.append(f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>')
+    scripts += [f'<script type="application/json" id="{name}">{_json_script(fig)}</script>'
+                for name, fig in figures]
+    scripts.append(f"<script>{SCRIPT}</script>")
+    return f"""<!doctype html>
+<html lang="en"><head><meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(info["title"])}</title><style>{CSS}</style></head>
+<body>
+<header class="bar">{nav}<a class="live" href="{html.escape(info["live"])}">Explore in the live app ↗</a></header>
+<div class="layout">
+<aside>{sidebar}
+{"".join(variants)}
+<p class="note">Static snapshot, built {manifest["built"]}.</p></aside>
+<main>{main}</main>
+</div>
+{"".join(scripts)}
+</body></html>
+"""
+
+
+# -------------------------------------------------------
+# Build
+# -------------------------------------------------------
+def plan(scripts: dict, rec: Recorder) -> dict:
+    """page → {state: settings}, plus the variant links per page."""
+    states, variants = {}, {}
+    for page, path in scripts.items():
+        states[page] = {"default": {}}
+        variants[page] = {}
+        for label, settings in VARY.get(page, []):
+            widget = find_widget(run_page(path, settings, rec), label)
+            links = []
+            for value in widget_values(widget):
+                if not settings and str(value) == str(widget.value):     # options are labels
+                    links.append((value, "default"))
+                    continue
+                name = f"{slug(label)}-{slug(value)}"
+                states[page][name] = {**settings, label: value}
+                links.append((value, name))
+            variants[page][label] = links
+    return {"states": states, "variants": variants}
+
+
+def build(out: Path, live_url: str) -> dict:
+    scripts = page_scripts()
+    tmp = Path(tempfile.mkdtemp(dir=out.parent, prefix=f".{out.name}-"))
+    try:
+        snap = Snapshot(tmp)
+        with warmup.headless(), recording() as rec:
+            todo = plan(scripts, rec)
+            manifest = {"built": time.strftime("%Y-%m-%d %H:%M"), "live_url": live_url, "pages": {}}
+            for page, path in scripts.items():
+                manifest["pages"][page] = {
+                    "title": "Home" if page == "home" else url_name(path).replace("_", " "),
+                    "live": f"{live_url.rstrip('/')}/{url_name(path)}",
+                    "states": {s: {"html": f"{page}.html" if s == "default" else f"{page}--{s}.html",
+                                   "settings": settings}
+                               for s, settings in todo["states"][page].items()},
+                    "variants": todo["variants"][page],
+                }
+            docs = {}
+            for page, path in scripts.items():
+                for state, entry in manifest["pages"][page]["states"].items():
+                    t0 = time.perf_counter()
+                    at = run_page(path, entry["settings"], rec)
+                    entry["json"] = entry["html"].replace(".html", ".json")
+                    docs[page, state] = {"page": page, "state": state, "settings": entry["settings"],
+                                         **document(at, snap, rec)}
+                    print(f"{entry['html']:<55} {(time.perf_counter() - t0) * 1e3:>8.0f} ms", flush=True)
+
+        for (page, state), doc in docs.items():
+            entry = manifest["pages"][page]["states"][state]
+            (tmp / entry["json"]).write_text(json.dumps(doc, default=str))
+            (tmp / entry["html"]).write_text(page_html(doc, page, manifest))
+        shutil.copyfile(tmp / "home.html", tmp / "index.html")
+        (tmp / "manifest.json").write_text(json.dumps(manifest, indent=1, default=str))
+        tmp.chmod(0o755)
+
+        old = out.with_name(f".{out.name}-old")
+        shutil.rmtree(old, ignore_errors=True)
+        if out.exists():
+            os.replace(out, old)
+        os.replace(tmp, out)
+        shutil.rmtree(old, ignore_errors=True)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return manifest
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Pre-render the pages' common views as static HTML/JSON")
+    ap.add_argument("--out", type=Path, default=ROOT / "snapshot")
+    ap.add_argument("--live-url", default="http://localhost:8501",
+                    help="live Streamlit app the snapshot links to for other selections")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    manifest = build(args.out.resolve(), args.live_url)
+    n = sum(len(p["states"]) for p in manifest["pages"].values())
+    print(f"wrote {n} views into {args.out} in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
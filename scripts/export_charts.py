@@ -0,0 +1,297 @@
+# scripts/export_charts.py
+# ───────────────────────────────────────────────────────────────
+# Headless batch export of every dashboard chart and table — no
+# Streamlit server involved.
+#
+#   python scripts/export_charts.py [--out exports] [--formats png svg html csv]
+#                                   [--jobs N] [--only heatmap page3] [--force]
+#
+# Uses the same loaders (core.data / core.cube), transforms and chart
+# builders (core.charts, core.maps) as the pages, and expands every
+# selection the pages offer (colour schemes, sort orders, countries,
+# sub-regions, palettes, map years) into one job per variant.
+#
+# Each job's inputs (data fingerprints + arguments + chart code) are
+# hashed; <out>/manifest.json remembers the hash behind every file, so
+# outputs whose inputs did not change are skipped.  The rest are
+# rendered in parallel across a process pool.
+#
+# matplotlib charts → PNG / SVG, plotly and folium → HTML, tables → CSV.
+# ───────────────────────────────────────────────────────────────
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from core import charts, correlation, figures, geo, maps, transforms  # noqa: E402
+from core import cube as wage_cube  # noqa: E402
+from core import data as wage_data  # noqa: E402
+from core.data import YEARS  # noqa: E402
+
+FORMATS = {"mpl": ("png", "svg"), "plotly": ("html",), "folium": ("html",), "csv": ("csv",)}
+
+# Any change to the chart / map code invalidates every output.
+CODE_VERSION = hashlib.sha1(b"".join(
+    Path(m.__file__).read_bytes() for m in (charts, maps, sys.modules[__name__])
+)).hexdigest()[:12]
+
+
+class Job(NamedTuple):
+    name: str          # output path under --out, without extension
+    kind: str          # key of FORMATS
+    build: object      # callable returning a figure / map / DataFrame
+    args: tuple = ()
+
+
+def slug(text: str) -> str:
+    return re.sub(r"[^0-9A-Za-z]+", "-", str(text)).strip("-").lower()
+
+
+def _digest(value) -> str:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return figures.fingerprint(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_digest(v) for v in value) + "]"
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{k}:{_digest(v)}" for k, v in sorted(value.items())) + "}"
+    return repr(value)
+
+
+def job_key(job: Job) -> str:
+    h = hashlib.sha1(CODE_VERSION.encode())
+    h.update(getattr(job.build, "__qualname__", repr(job.build)).encode())
+    h.update(_digest(job.args).encode())
+    return h.hexdigest()
+
+
+# -------------------------------------------------------
+# Builders that are not plain core.charts functions
+# -------------------------------------------------------
+def _table(df):
+    return df
+
+
+def _folium_map(geojson, colormap_args, fields, aliases, styles, palette):
+    if palette is None:
+        colormap = maps.growth_colormap(*colormap_args)
+    else:
+        colormap = maps.year_colormap(colormap_args)
+    m = maps.growth_map(geojson, colormap, fields=fields, aliases=aliases)
+    m.add_child(maps.style_layer(styles, palette=palette))   # baked in for a static file
+    return m
+
+
+# -------------------------------------------------------
+# Variants per page
+# -------------------------------------------------------
+def page1_jobs(cube) -> list:
+    d = transforms.evolution_summary(cube)
+    income = pd.DataFrame({"nominal": d["nom_income"], "real": d["real_income"]})
+    return [
+        Job("page1/nominal-growth-by-subregion", "mpl", charts.nominal_growth, (d["nom_sub_avg"], d["nom_years"])),
+        Job("page1/real-growth-by-subregion", "mpl", charts.real_growth, (d["real_sub_avg"], d["real_years"])),
+        Job("page1/growth-by-income-group", "mpl", charts.income_group, (d["nom_income"], d["real_income"])),
+        Job("page1/nominal-growth-by-subregion", "csv", _table, (d["nom_sub_avg"],)),
+        Job("page1/real-growth-by-subregion", "csv", _table, (d["real_sub_avg"],)),
+        Job("page1/growth-by-income-group", "csv", _table, (income,)),
+    ]
+
+
+def page2_jobs() -> list:
+    base = transforms.ratio_base(wage_data.min_to_avg_ratio())
+    years = [str(y) for y in YEARS]
+    wide = base.wide[years]
+    change = transforms.ratio_change(base.wide)
+    jobs = [Job("page2/ratio", "csv", _table, (base.wide,))]
+    for scheme in charts.HEATMAP_SCHEMES:
+        jobs.append(Job(f"page2/heatmap-{slug(scheme.split()[0])}", "mpl", charts.heatmap, (wide, scheme)))
+    for sort_by in transforms.SLOPE_SORTS:
+        for top_n in sorted({min(25, len(change)), len(change)}):
+            view = transforms.slope_view(change, sort_by, top_n)
+            name = f"page2/slopegraph-{slug(sort_by)}-top{top_n}"
+            jobs += [Job(name, "mpl", charts.slopegraph, (view, top_n)),
+                     Job(name, "csv", _table, (view[["2017", "2023", "Δ"]],))]
+    groups = [["Germany", "Spain", "Poland", "France"]] + [[c] for c in sorted(wide.index)]
+    for selected in groups:
+        view = transforms.trajectory_view(wide, selected)
+        name = f"page2/trajectories-{slug('-'.join(selected))}"
+        jobs += [Job(name, "mpl", charts.trajectories, (view,)),
+                 Job(name, "csv", _table, (view,))]
+    by_code = transforms.ratio_by_code(base.wide)
+    for palette in ("Blues", "Viridis", "Cividis", "Plasma", "Turbo"):
+        jobs.append(Job(f"page2/ratio-animation-{slug(palette)}", "plotly", _ratio_animation,
+                        (by_code, palette)))
+    return jobs
+
+
+def _ratio_animation(by_code, palette):
+    return maps.ratio_animation(by_code, palette=palette,
+                                title="Minimum-to-average wage ratio (%) • 2017-2023",
+                                colorbar_title="ratio %")
+
+
+def page3_jobs(cube) -> list:
+    data = transforms.gdp_vs_real_wage(cube)
+    band = correlation.fit_band(data["gdp_growth_avg"], data["real_wage_growth_avg"])
+    jobs = [Job("page3/gdp-vs-real-wage", "csv", _table, (data,))]
+    for country in ["None", *data["country_name"]]:
+        suffix = "" if country == "None" else f"-{slug(country)}"
+        jobs.append(Job(f"page3/gdp-vs-real-wage{suffix}", "mpl", charts.gdp_vs_wage,
+                        (data, country, band)))
+
+    corrs = transforms.gdp_wage_correlations(cube)
+    jobs.append(Job("page3/correlations", "csv", _table, (corrs,)))
+    for width in transforms.WINDOWS:
+        for lag in transforms.LAGS:
+            view = corrs[(corrs["width"] == width) & (corrs["lag"] == lag)]
+            jobs.append(Job(f"page3/correlation-window{width}-lag{lag}", "plotly",
+                            charts.rolling_correlation, (view,)))
+
+    series = transforms.RealWageSeries(cube)
+    selections = {f"subregion-{slug(s)}": series.countries([s]) for s in series.subregions}
+    selections.update({f"country-{slug(c)}": [c] for c in series.names})
+    for name, selected in selections.items():
+        table = series.select(selected)
+        jobs += [Job(f"page3/real-wage-growth-{name}", "plotly", charts.real_wage_lines, (table,)),
+                 Job(f"page3/real-wage-growth-{name}", "csv", _table, (table,))]
+    return jobs
+
+
+def page4_jobs(cube, lod: str) -> list:
+    year_cols = [str(y) for y in YEARS]
+    avg = transforms.avg_annual_growth(cube)
+    yearly = transforms.yearly_real_growth(cube).rename(columns=str)
+    merged = (
+        geo.load_geometry(lod)
+           .join(avg.set_index("iso3")[[maps.GROWTH_FIELD]], on="iso_a3")
+           .join(yearly.set_index("iso3")[year_cols], on="iso_a3")
+    )
+    geojson = maps.feature_collection(merged, ["name", maps.GROWTH_FIELD, *year_cols])
+    table = pd.DataFrame(merged.drop(columns="geometry"))
+    jobs = [Job("page4/wage-growth", "csv", _table, (table,))]
+
+    rates = merged[maps.GROWTH_FIELD]
+    rng = (float(rates.min()), float(rates.max()))
+    styles = maps.growth_styles(merged, maps.growth_colormap(*rng), rng)
+    jobs.append(Job("page4/map-average-2017-2023", "folium", _folium_map,
+                    (geojson, rng, ["name", maps.GROWTH_FIELD],
+                     ["Country", "Avg annual growth (%)"], styles, None)))
+
+    classes = maps.year_classes(merged, year_cols)
+    for year in year_cols:
+        jobs.append(Job(f"page4/map-{year}", "folium", _folium_map,
+                        (geojson, classes.breaks, ["name", *year_cols],
+                         ["Country", *(f"{y} (%)" for y in year_cols)],
+                         classes.classes[year], classes.palette)))
+    return jobs
+
+
+def all_jobs(lod: str) -> list:
+    cube = wage_cube.get_cube()
+    return page1_jobs(cube) + page2_jobs() + page3_jobs(cube) + page4_jobs(cube, lod)
+
+
+# -------------------------------------------------------
+# Rendering (runs in the worker processes)
+# -------------------------------------------------------
+def outputs(job: Job, out: Path, formats) -> list:
+    return [out / f"{job.name}.{ext}" for ext in FORMATS[job.kind] if ext in formats]
+
+
+def render(job: Job, paths: list) -> list:
+    import matplotlib.pyplot as plt
+
+    obj = job.build(*job.args)
+    for path in paths:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        if job.kind == "mpl":
+            obj.savefig(tmp, format=path.suffix[1:], **figures.SAVEFIG_KW)
+        elif job.kind == "plotly":
+            obj.write_html(tmp, include_plotlyjs="cdn")
+        elif job.kind == "folium":
+            obj.save(str(tmp))
+        else:
+            obj.to_csv(tmp)
+        os.replace(tmp, path)
+    if job.kind == "mpl":
+        plt.close(obj)
+    return [str(p) for p in paths]
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export every dashboard chart and table")
+    ap.add_argument("--out", type=Path, default=ROOT / "exports")
+    ap.add_argument("--formats", nargs="+", default=["png", "svg", "html", "csv"],
+                    choices=["png", "svg", "html", "csv"])
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                    help="worker processes (1 = render in this process)")
+    ap.add_argument("--only", nargs="+", metavar="TEXT",
+                    help="only outputs whose name contains one of these")
+    ap.add_argument("--lod", default=geo.DEFAULT_LOD, choices=geo.LODS)
+    ap.add_argument("--force", action="store_true", help="ignore the manifest")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    manifest_path = args.out / "manifest.json"
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    todo, skipped = [], 0
+    for job in all_jobs(args.lod):
+        if args.only and not any(o in job.name for o in args.only):
+            continue
+        paths = outputs(job, args.out, args.formats)
+        if not paths:
+            continue
+        key = job_key(job)
+        rel = [p.relative_to(args.out).as_posix() for p in paths]
+        if not args.force and all(manifest.get(r) == key and p.exists()
+                                  for r, p in zip(rel, paths)):
+            skipped += 1
+            continue
+        todo.append((job, paths, rel, key))
+    print(f"{len(todo)} to render, {skipped} unchanged "
+          f"({time.perf_counter() - t0:.1f}s to plan)", flush=True)
+
+    done = 0
+    try:
+        if args.jobs > 1 and len(todo) > 1:
+            with ProcessPoolExecutor(args.jobs, initializer=_init_worker) as pool:
+                results = pool.map(render, [j for j, *_ in todo], [p for _, p, *_ in todo],
+                                   chunksize=max(1, len(todo) // (args.jobs * 4)))
+                for (_, _, rel, key), _ in zip(todo, results):
+                    manifest.update(dict.fromkeys(rel, key))
+                    done += 1
+        else:
+            _init_worker()
+            for job, paths, rel, key in todo:
+                render(job, paths)
+                manifest.update(dict.fromkeys(rel, key))
+                done += 1
+    finally:
+        if done:
+            args.out.mkdir(parents=True, exist_ok=True)
+            tmp = manifest_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+            os.replace(tmp, manifest_path)
+
+    print(f"rendered {done} jobs into {args.out} in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# scripts/import_report.py
+# ───────────────────────────────────────────────────────────────
+# Import-time report: what each Streamlit page costs to import before
+# it draws anything.
+#
+#   python scripts/import_report.py [--top 8] [--json report.json]
+#
+# Every page's module-level imports are replayed in a fresh
+# interpreter under `python -X importtime`, so numbers are cold-start
+# costs (the first page a process renders).  Pages share one process
+# under `streamlit run`, so later pages only pay for what is new.
+# ───────────────────────────────────────────────────────────────
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = [ROOT / "Home.py"] + sorted((ROOT / "pages").glob("*.py"))
+
+RSS_PROBE = "\nimport resource; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+
+
+def page_imports(path: Path) -> str:
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    nodes = [n for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(n) for n in nodes)
+
+
+def measure(path: Path) -> dict:
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", page_imports(path) + RSS_PROBE],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    # stderr lines: "import time:   self [us] | cumulative | imported package"
+    top_level, total_us = {}, 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        if not name.startswith("  "):          # not imported by another module
+            top_level[name.strip()] = int(cum_us)
+    return {
+        "page": path.relative_to(ROOT).as_posix(),
+        "import_ms": round(total_us / 1000, 1),
+        "max_rss_mb": round(int(proc.stdout.split()[-1]) / 1024, 1),
+        "modules": {k: round(v / 1000, 1) for k, v in
+                    sorted(top_level.items(), key=lambda kv: -kv[1])},
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Per-page import-time report")
+    ap.add_argument("--top", type=int, default=8, help="heaviest modules to list per page")
+    ap.add_argument("--json", type=Path, help="also write the full report here")
+    args = ap.parse_args(argv)
+
+    report = [measure(p) for p in PAGES]
+    for r in report:
+        print(f"{r['page']:<50} {r['import_ms']:>8.1f} ms  {r['max_rss_mb']:>7.1f} MB RSS")
+        for name, ms in list(r["modules"].items())[:args.top]:
+            print(f"    {name:<40} {ms:>8.1f} ms")
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+# tests/conftest.py
+# Make the repo root importable (``core``) however pytest is started.
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,23 @@
+# tests/test_warmup.py
+# ───────────────────────────────────────────────────────────────
+# Readiness of `python -m core.warmup` as seen by importers.
+# ───────────────────────────────────────────────────────────────
+import runpy
+import sys
+import threading
+
+from core import warmup
+
+
+def test_main_module_marks_the_imported_module_ready(monkeypatch):
+    monkeypatch.setattr(warmup, "_ready", threading.Event())
+    monkeypatch.setattr(warmup, "_status", {"state": "cold", "steps": {}, "errors": []})
+    monkeypatch.setattr(warmup, "parse_sources", lambda jobs: None)
+    monkeypatch.setattr(warmup, "load_shared", lambda jobs: None)
+    monkeypatch.setattr(sys, "argv", ["core.warmup", "--no-pages", "--jobs", "1"])
+
+    runpy.run_path(warmup.__file__, run_name="__main__")     # as `python -m core.warmup`
+
+    import core.warmup
+    assert core.warmup.ready()
+    assert core.warmup.status()["state"] == "ready"
@@ -0,0 +1,56 @@
+# tests/test_workbooks.py
+# ───────────────────────────────────────────────────────────────
+# Arrow caches of workbooks opened from page 1 (core.workbooks).
+# ───────────────────────────────────────────────────────────────
+import shutil
+
+import pytest
+
+from core import data, store, workbooks
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(workbooks, "cache", workbooks.WorkbookCache())
+    return tmp_path / "cache"
+
+
+def _copy(tmp_path, name: str, tail: bytes = b""):
+    """A copy of the bundled workbook; *tail* changes its content hash
+    (the zip reader ignores trailing bytes)."""
+    path = tmp_path / name
+    shutil.copyfile(data.WAGE_XLSX, path)
+    with open(path, "ab") as fh:
+        fh.write(tail)
+    return path
+
+
+def _entries(cache_dir, handle) -> list:
+    return sorted(p.name for p in cache_dir.glob(f"{handle.group}-*") if p.is_dir())
+
+
+def test_two_workbooks_keep_both_caches(tmp_path, cache_dir):
+    a, b = _copy(tmp_path, "a.xlsx"), _copy(tmp_path, "b.xlsx", b"\0")
+    handles = [workbooks.open_handle(p) for p in (a, b)]
+    for handle in (*handles, handles[0]):
+        workbooks.get_cube(handle)
+
+    assert handles[0].group != handles[1].group
+    assert all(len(_entries(cache_dir, h)) == 1 for h in handles)
+
+
+def test_replaced_workbook_prunes_only_its_own_entry(tmp_path, cache_dir):
+    a, b = _copy(tmp_path, "a.xlsx"), _copy(tmp_path, "b.xlsx")
+    workbooks.get_cube(workbooks.open_handle(a))
+    workbooks.get_cube(workbooks.open_handle(b))
+    before = _entries(cache_dir, workbooks.open_handle(a))
+
+    with open(a, "ab") as fh:            # new content in place
+        fh.write(b"\0")
+    replaced = workbooks.open_handle(a)
+    workbooks.get_cube(replaced)
+
+    after = _entries(cache_dir, replaced)
+    assert len(after) == 1 and after != before
+    assert len(_entries(cache_dir, workbooks.open_handle(b))) == 1